@@ -0,0 +1,251 @@
+"""
+Load benchmark comparing the WSGI and ASGI serving modes.
+
+Serves the app in a separate process, once with Werkzeug's threaded
+server (what ``app.py`` runs) and once as ASGI through ``asgi.py``, and
+drives it from an asyncio load generator at several concurrency levels.
+Every request opens a connection, so both servers do the same work per
+request. The ASGI mode runs under uvicorn when it is installed and
+otherwise under the small asyncio HTTP/1.1 server defined here. The page
+cache and compression are off by default so every request renders its
+template in the server.
+
+Usage:
+    python benchmarks/bench_asgi_load.py [--requests N] [--levels 1,8,32]
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from http import HTTPStatus
+from typing import Any, Dict, List, Sequence, Tuple
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from werkzeug.serving import LISTEN_QUEUE, make_server  # noqa: E402
+
+from app import create_app  # noqa: E402
+from asgi import create_asgi_app  # noqa: E402
+
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
+# Requests cycle through these paths
+PATHS = ('/', '/tutorials', '/api/resources?category=documentation', '/about')
+
+
+async def handle_connection(
+    app: Any, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Serve one HTTP/1.1 request with an ASGI application."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+    method, target, version = request_line.split(' ')
+    path, _, query = target.partition('?')
+    headers = [
+        (name.strip().lower().encode('latin-1'),
+         value.strip().encode('latin-1'))
+        for name, _, value in (
+            line.partition(':') for line in header_lines if line
+        )
+    ]
+    length = int(dict(headers).get(b'content-length', b'0'))
+    body = await reader.readexactly(length) if length else b''
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': version.split('/')[1],
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode('latin-1'),
+        'root_path': '',
+        'query_string': query.encode('latin-1'),
+        'headers': headers,
+        'server': writer.get_extra_info('sockname')[:2],
+        'client': writer.get_extra_info('peername')[:2],
+    }
+    done = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal body
+        if body is not None:
+            message = {'type': 'http.request', 'body': body}
+            body = None
+            return message
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            lines = [f'HTTP/1.1 {status} {HTTPStatus(status).phrase}']
+            lines += [
+                f"{name.decode('latin-1')}: {value.decode('latin-1')}"
+                for name, value in message['headers']
+            ]
+            lines.append('Connection: close\r\n\r\n')
+            writer.write('\r\n'.join(lines).encode('latin-1'))
+        else:
+            writer.write(message.get('body', b''))
+            await writer.drain()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        done.set()
+        writer.close()
+
+
+def serve_wsgi(config: Dict[str, Any], ports: Any) -> None:
+    """Serve the app with Werkzeug's threaded server."""
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, create_app(config), threaded=True)
+    ports.put(server.port)
+    server.serve_forever()
+
+
+def serve_asgi(config: Dict[str, Any], ports: Any) -> None:
+    """Serve the ASGI app with uvicorn or the server above."""
+    app = create_asgi_app(config)
+
+    async def main() -> None:
+        if uvicorn is not None:
+            server = uvicorn.Server(
+                uvicorn.Config(
+                    app, host='127.0.0.1', port=0, log_level='warning'
+                )
+            )
+            serving = asyncio.ensure_future(server.serve())
+            while not server.started:
+                await asyncio.sleep(0.01)
+            sockets = server.servers[0].sockets
+            ports.put(sockets[0].getsockname()[1])
+            await serving
+            return
+
+        server = await asyncio.start_server(
+            lambda reader, writer: handle_connection(app, reader, writer),
+            # The listen backlog of Werkzeug's server
+            '127.0.0.1', 0, backlog=LISTEN_QUEUE,
+        )
+        ports.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+async def fetch(port: int, path: str) -> float:
+    """
+    Request a path and read the whole response.
+
+    Args:
+        port: Server port on localhost.
+        path: Path to request.
+
+    Returns:
+        Seconds from connecting to the end of the response.
+    """
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+        'Connection: close\r\n\r\n'.encode('ascii')
+    )
+    response = await reader.read()
+    writer.close()
+    if response[9:12] != b'200':
+        raise RuntimeError(f'{path}: {response[:40]!r}')
+    return time.perf_counter() - start
+
+
+async def load(port: int, concurrency: int, requests: int) -> Tuple[
+    float, List[float]
+]:
+    """
+    Send requests from ``concurrency`` clients until ``requests`` are done.
+
+    Returns:
+        Elapsed seconds and the latency of each request.
+    """
+    latencies: List[float] = []
+    issued = 0
+
+    async def client() -> None:
+        nonlocal issued
+        while issued < requests:
+            path = PATHS[issued % len(PATHS)]
+            issued += 1
+            latencies.append(await fetch(port, path))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--levels', default='1,8,32,128')
+    parser.add_argument('--threads', type=int, default=0,
+                        help='ASGI_THREADS (default: based on the CPU count)')
+    parser.add_argument('--page-cache', action='store_true',
+                        help='Keep the page cache on')
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(',')]
+
+    config = {
+        'PAGE_CACHE_SIZE': 256 if args.page_cache else 0,
+        'COMPRESSION': False,
+        'PREWARM_TEMPLATES': True,
+        'ASGI_THREADS': args.threads,
+    }
+    servers = {'WSGI': serve_wsgi, 'ASGI': serve_asgi}
+    asgi_server = 'uvicorn' if uvicorn is not None else 'asyncio'
+    print(f"{args.requests} requests per level; ASGI under {asgi_server}")
+    print(f"  {'mode':<6}{'clients':>8}{'req/s':>10}{'p50 ms':>9}"
+          f"{'p99 ms':>9}{'max ms':>9}")
+    context = multiprocessing.get_context('spawn')
+    for mode, serve in servers.items():
+        ports = context.Queue()
+        process = context.Process(
+            target=serve, args=(config, ports), daemon=True
+        )
+        process.start()
+        try:
+            port = ports.get(timeout=30)
+            # Warm up the server and the catalog
+            asyncio.run(load(port, 4, 4 * len(PATHS)))
+            for concurrency in levels:
+                elapsed, latencies = asyncio.run(
+                    load(port, concurrency, args.requests)
+                )
+                print(
+                    f"  {mode:<6}{concurrency:>8}"
+                    f"{len(latencies) / elapsed:>10.0f}"
+                    f"{statistics.median(latencies) * 1000:>9.2f}"
+                    f"{percentile(latencies, 0.99) * 1000:>9.2f}"
+                    f"{max(latencies) * 1000:>9.2f}"
+                )
+        finally:
+            process.terminate()
+            process.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Cold-start benchmark for template compilation.
+
+Starts a fresh interpreter per run, creates the app and requests every
+page once, as a newly started worker would. Compares no bytecode cache,
+an empty and a populated ``TEMPLATE_BYTECODE_CACHE`` directory, with
+and without ``PREWARM_TEMPLATES``. The page cache is off so each first
+request renders its template.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+
+def measure_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Time create_app and the first request to each page in this process.
+
+    Args:
+        config: Configuration overrides passed to ``create_app``.
+
+    Returns:
+        ``create_app`` time and per-page first-request times, in ms.
+    """
+    start = time.perf_counter()
+    from app import create_app
+
+    app = create_app({'PAGE_CACHE_SIZE': 0, **config})
+    ready = time.perf_counter()
+
+    client = app.test_client()
+    paths = sorted(
+        rule.rule for rule in app.url_map.iter_rules()
+        if rule.endpoint != 'static' and not rule.arguments
+    )
+    requests = {}
+    for path in paths:
+        before = time.perf_counter()
+        assert client.get(path).status_code == 200, path
+        requests[path] = (time.perf_counter() - before) * 1000
+    return {'create_app': (ready - start) * 1000, 'requests': requests}
+
+
+def run_worker(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run ``measure_worker`` in a fresh interpreter.
+
+    Args:
+        config: Configuration overrides passed to ``create_app``.
+
+    Returns:
+        The child's measurements.
+    """
+    output = subprocess.run(
+        [sys.executable, __file__, '--worker', json.dumps(config)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(measure_worker(json.loads(args.worker))))
+        return
+
+    cache_dir = tempfile.mkdtemp(prefix='jinja-bench-')
+    cached = {
+        'TEMPLATE_BYTECODE_CACHE': True,
+        'TEMPLATE_BYTECODE_CACHE_DIR': cache_dir,
+    }
+    scenarios = {
+        'no bytecode cache': ({'TEMPLATE_BYTECODE_CACHE': False}, False),
+        'no cache + prewarm': (
+            {'TEMPLATE_BYTECODE_CACHE': False, 'PREWARM_TEMPLATES': True},
+            False,
+        ),
+        'empty bytecode cache': (cached, True),
+        'populated bytecode cache': (cached, False),
+        'populated cache + prewarm': (
+            {**cached, 'PREWARM_TEMPLATES': True}, False,
+        ),
+    }
+
+    print(f"Median of {args.runs} fresh processes (ms)")
+    print(f"  {'scenario':<28}{'create_app':>11}{'1st page':>10}"
+          f"{'slowest':>9}{'all pages':>11}{'ready+all':>11}")
+    try:
+        run_worker(cached)  # populate the cache
+        for name, (config, clear) in scenarios.items():
+            rows: List[List[float]] = []
+            for _ in range(args.runs):
+                if clear:
+                    shutil.rmtree(cache_dir)
+                    os.makedirs(cache_dir)
+                result = run_worker(config)
+                times = list(result['requests'].values())
+                rows.append([
+                    result['create_app'], result['requests']['/'],
+                    max(times), sum(times),
+                    result['create_app'] + sum(times),
+                ])
+            medians = [statistics.median(column) for column in zip(*rows)]
+            print(f"  {name:<28}" + ''.join(
+                f"{value:>{width}.1f}"
+                for value, width in zip(medians, (11, 10, 9, 11, 11))
+            ))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark for runtime response compression.
+
+Requests the home page, the tutorials page and the stylesheet through
+the WSGI app with the page cache on, and compares response size and time
+without compression, with compression redone on every request (a
+compressed body cache of size 0) and with compressed bodies reused.
+
+Usage:
+    python benchmarks/bench_compression.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from werkzeug.test import EnvironBuilder  # noqa: E402
+
+from app import create_app  # noqa: E402
+from content_encoding import available_encodings  # noqa: E402
+
+PATHS = ('/', '/tutorials', '/static/css/style.css')
+
+
+def request(app: Any, path: str, encoding: str) -> Tuple[float, int]:
+    """
+    Call the WSGI app directly.
+
+    Args:
+        app: Flask application.
+        path: Path to request.
+        encoding: ``Accept-Encoding`` value ("" for none).
+
+    Returns:
+        Seconds taken and body size.
+    """
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    environ = EnvironBuilder(path=path, headers=headers).get_environ()
+    start = time.perf_counter()
+    body = b''.join(app(environ, lambda status, headers, exc=None: None))
+    return time.perf_counter() - start, len(body)
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setups: Dict[str, Tuple[Dict[str, Any], List[str]]] = {
+        'uncompressed': ({'COMPRESSION': False}, ['']),
+        'no reuse': (
+            {'COMPRESSION_CACHE_BYTES': 0}, list(available_encodings())
+        ),
+        'reused': ({}, list(available_encodings())),
+    }
+    print(f"Median of {args.repeat} requests, page cache on")
+    print(f"  {'path':<24}{'setup':<14}{'encoding':<10}{'bytes':>8}"
+          f"{'ms':>8}")
+    for path in PATHS:
+        for name, (config, encodings) in setups.items():
+            app = create_app({'PAGE_CACHE_SIZE': 64, **config})
+            for encoding in encodings:
+                request(app, path, encoding)
+                timings = []
+                for _ in range(args.repeat):
+                    elapsed, size = request(app, path, encoding)
+                    timings.append(elapsed)
+                print(f"  {path:<24}{name:<14}{encoding or '-':<10}"
+                      f"{size:>8,}{statistics.median(timings) * 1000:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
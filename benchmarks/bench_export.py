@@ -0,0 +1,89 @@
+"""
+Benchmark for the streaming NDJSON export.
+
+Exports ``--entries`` synthetic resources (100k by default) and compares
+streaming them, plain and gzip-compressed, with building one JSON
+document in memory. Reports time, output size and peak memory traced by
+``tracemalloc`` (the synthetic catalog itself is allocated beforehand
+and not counted). Memory is traced in a separate run, as tracing slows
+the export down.
+
+Usage:
+    python benchmarks/bench_export.py [--entries N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, Tuple
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from catalog import Resource  # noqa: E402
+from export import export_stream, iter_resources  # noqa: E402
+
+
+def measure(func: Callable[[], Iterable[bytes]]) -> Tuple[float, int, int]:
+    """
+    Consume an export twice: once timed, once with memory tracing.
+
+    Args:
+        func: Function returning the export's chunks.
+
+    Returns:
+        Time in ms, output size and peak traced memory in bytes.
+    """
+    start = time.perf_counter()
+    size = sum(map(len, func()))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    sum(map(len, func()))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=100_000)
+    args = parser.parse_args()
+
+    resources = {'courses': [
+        Resource(
+            title=f'Resource {n}',
+            description=f'Synthetic resource number {n}',
+            url=f'https://example.com/resources/{n}',
+            cost='Free',
+            platform='YouTube',
+            level='Beginner',
+        )
+        for n in range(args.entries)
+    ]}
+
+    def in_memory() -> Any:
+        """Build the whole export as one JSON document."""
+        return [json.dumps(list(iter_resources(resources))).encode()]
+
+    cases = {
+        'one JSON document': in_memory,
+        'NDJSON stream': lambda: export_stream(iter_resources(resources)),
+        'NDJSON stream, gzip': lambda: export_stream(
+            iter_resources(resources), compress=True
+        ),
+    }
+    print(f"Exporting {args.entries:,} resources")
+    print(f"  {'method':<22}{'ms':>9}{'size (KB)':>12}{'peak (KB)':>12}")
+    for name, func in cases.items():
+        elapsed, size, peak = measure(func)
+        print(f"  {name:<22}{elapsed:>9.0f}{size / 1024:>12,.0f}"
+              f"{peak / 1024:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark for the /search full-text index.
+
+Times building the index from scratch, re-indexing after one markdown
+guide changes, and queries on the warm index: BM25 ranking alone, a full
+search with snippets, and a request through the WSGI app.
+
+Usage:
+    python benchmarks/bench_fulltext.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from app import create_app  # noqa: E402
+from fulltext import SiteSearch  # noqa: E402
+from search import tokenize  # noqa: E402
+
+QUERIES = (
+    'copilot',
+    'custom instructions',
+    'mcp server',
+    'pytest fixtures',
+    'beginner course coursera',
+    'security review checklist',
+)
+
+
+def median_ms(func: Callable[[], Any], repeat: int) -> float:
+    """Median time of ``func`` in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    app = create_app({'PAGE_CACHE_SIZE': 0})
+    client = app.test_client()
+    site_search = SiteSearch(app, refresh_interval=3600)
+    app.extensions['site_search'] = site_search
+
+    start = time.perf_counter()
+    site_search.refresh()
+    build = (time.perf_counter() - start) * 1000
+    print(f"Indexed {len(site_search.index)} documents, "
+          f"{len(site_search.index.postings):,} terms in {build:.1f} ms")
+
+    guide = site_search.sources()[-1].paths[0]
+    stat = guide.stat()
+
+    def touch() -> None:
+        """Mark one guide as changed and re-index."""
+        os.utime(guide, ns=(stat.st_atime_ns, time.time_ns()))
+        site_search.refresh()
+
+    try:
+        print(f"Re-index after one guide changes: "
+              f"{median_ms(touch, 20):.2f} ms")
+    finally:
+        os.utime(guide, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        site_search.refresh()
+
+    print(f"Median of {args.repeat} queries on the warm index (ms)")
+    print(f"  {'query':<28}{'hits':>6}{'rank':>8}{'search':>9}"
+          f"{'request':>10}")
+    for query in QUERIES:
+        terms = tokenize(query)
+        hits = len(site_search.index.rank(terms, limit=10_000))
+        timings = (
+            median_ms(lambda: site_search.index.rank(terms), args.repeat),
+            median_ms(lambda: site_search.search(query), args.repeat),
+            median_ms(
+                lambda: client.get('/search', query_string={'q': query}),
+                args.repeat // 5,
+            ),
+        )
+        print(f"  {query:<28}{hits:>6}" + ''.join(
+            f"{value:>{width}.3f}"
+            for value, width in zip(timings, (8, 9, 10))
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for rewriting links in rendered pages.
+
+Compares the single-pass ``LinkRewriter`` used by ``build.py`` with the
+previous implementation, which made nine ``str.replace`` passes over each
+document. Large inputs are made by repeating the rendered pages.
+
+Usage:
+    python benchmarks/bench_link_rewriter.py [--repeat N] [--copies N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from typing import Callable, Dict
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from app import create_app  # noqa: E402
+from build import LinkRewriter, discover_routes, render_view  # noqa: E402
+
+
+def legacy_update_asset_paths(html: str, base_url: str) -> str:
+    """
+    Rewrite links the way ``update_asset_paths`` used to.
+
+    Args:
+        html: HTML content to update.
+        base_url: Base URL for the site.
+
+    Returns:
+        Updated HTML content.
+    """
+    html = html.replace('href="/static/', f'href="{base_url}static/')
+    html = html.replace('src="/static/', f'src="{base_url}static/')
+    html = html.replace('href="/"', f'href="{base_url}"')
+    html = html.replace(
+        'href="/resources"', f'href="{base_url}resources.html"'
+    )
+    html = html.replace('href="/examples"', f'href="{base_url}examples.html"')
+    html = html.replace('href="/about"', f'href="{base_url}about.html"')
+    html = html.replace('href="/author"', f'href="{base_url}author.html"')
+    html = html.replace(
+        'href="/tutorials"', f'href="{base_url}tutorials.html"'
+    )
+    html = html.replace(
+        'href="/copilot-integration"',
+        f'href="{base_url}copilot-integration.html"',
+    )
+    return html
+
+
+def render_corpus(copies: int) -> str:
+    """
+    Render every route and repeat the pages into one large document.
+
+    Args:
+        copies: Number of times to repeat the rendered pages.
+
+    Returns:
+        Concatenated HTML.
+    """
+    app = create_app()
+    pages = [render_view(app, route)[0] for route, _ in discover_routes(app)]
+    return ''.join(pages) * copies
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--copies', type=int, default=50)
+    parser.add_argument('--base-url', default='/gh-copilot-raisa/')
+    args = parser.parse_args()
+
+    html = render_corpus(args.copies)
+    rewriter = LinkRewriter.from_app(create_app(), args.base_url)
+    candidates: Dict[str, Callable[[], str]] = {
+        'legacy (9 x str.replace)': lambda: legacy_update_asset_paths(
+            html, args.base_url
+        ),
+        'LinkRewriter (1 pass)': lambda: rewriter.rewrite(html),
+    }
+
+    print(f"Input: {len(html) / 1024 / 1024:.1f} MiB, "
+          f"best of {args.repeat} runs")
+    for name, func in candidates.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"  {name:<26} {best * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Memory benchmark for the prefork launcher.
+
+Forks worker processes the way ``src/prefork.py`` does and reports their
+RSS, shared and private memory after they have served traffic, for three
+setups: every worker building its own app after the fork, the app
+preloaded in the parent, and the app preloaded and frozen with
+``gc.freeze()``. Each worker requests every page and then runs a full
+garbage collection, as a long-running worker eventually would. Each
+setup runs in a fresh interpreter. Linux only (reads
+``/proc/<pid>/smaps_rollup``).
+
+Usage:
+    python benchmarks/bench_prefork_memory.py [--workers N] [--requests N]
+"""
+
+import argparse
+import gc
+import os
+import signal
+import subprocess
+import sys
+from typing import List
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from app import create_app  # noqa: E402
+from prefork import (  # noqa: E402
+    MemoryUsage,
+    preload_app,
+    read_memory,
+    warm_app,
+)
+
+MODES = {
+    'separate': 'each worker builds the app',
+    'preload': 'preloaded, no gc.freeze()',
+    'freeze': 'preloaded and frozen',
+}
+MB = 1024 * 1024
+
+
+def serve_traffic(app, requests: int) -> None:
+    """Request every page ``requests`` times, then collect garbage."""
+    client = app.test_client()
+    paths = warm_app(app)
+    for _ in range(requests):
+        for path in paths:
+            client.get(path, buffered=True).close()
+    gc.collect()
+
+
+def run_mode(mode: str, workers: int, requests: int) -> None:
+    """Fork the workers of one setup and print their memory."""
+    app = None
+    if mode == 'preload':
+        app = create_app({'PAGE_CACHE_SIZE': 0})
+        warm_app(app)
+    elif mode == 'freeze':
+        app = preload_app({'PAGE_CACHE_SIZE': 0})
+
+    pids: List[int] = []
+    ready_r, ready_w = os.pipe()
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            gc.enable()
+            worker_app = app or create_app({'PAGE_CACHE_SIZE': 0})
+            serve_traffic(worker_app, requests)
+            os.write(ready_w, b'.')
+            signal.pause()
+            os._exit(0)
+        pids.append(pid)
+    for _ in range(workers):
+        os.read(ready_r, 1)
+
+    usages: List[MemoryUsage] = [read_memory(pid) for pid in pids]
+    parent = read_memory(os.getpid())
+    for pid in pids:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+
+    average = {
+        name: sum(getattr(usage, name) for usage in usages) / len(usages) / MB
+        for name in ('rss', 'shared', 'private')
+    }
+    total_pss = (sum(usage.pss for usage in usages) + parent.pss) / MB
+    print(f"  {MODES[mode]:<28}{average['rss']:>8.1f}{average['shared']:>9.1f}"
+          f"{average['private']:>9.1f}{total_pss:>11.1f}")
+
+
+def main() -> None:
+    """Run each setup in a fresh interpreter and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.workers, args.requests)
+        return
+
+    print(f"{args.workers} workers, every page requested {args.requests} "
+          "times per worker (MB)")
+    print(f"  {'setup':<28}{'rss':>8}{'shared':>9}{'private':>9}"
+          f"{'total pss':>11}")
+    for mode in MODES:
+        subprocess.run(
+            [sys.executable, __file__, '--mode', mode,
+             '--workers', str(args.workers), '--requests', str(args.requests)],
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Startup benchmark: import, app construction and first response.
+
+Starts a fresh interpreter per run, as a short-lived worker would, and
+times importing ``app``, calling ``create_app()`` and serving the first
+request. ``--path`` picks the page requested first; ``--config`` passes
+JSON configuration overrides to ``create_app``.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--path /resources]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+SRC = os.path.join(ROOT, 'src')
+
+STAGES = ('import', 'create_app', 'first request', 'total')
+
+
+def measure_startup(path: str, config: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Time the startup stages in this (fresh) process.
+
+    Args:
+        path: Page requested first.
+        config: Configuration overrides passed to ``create_app``.
+
+    Returns:
+        Milliseconds spent in each of ``STAGES``.
+    """
+    start = time.perf_counter()
+    sys.path.insert(0, SRC)
+    from app import create_app
+
+    imported = time.perf_counter()
+    app = create_app(config)
+    created = time.perf_counter()
+
+    # Call the WSGI app directly; the test client has startup costs of
+    # its own that a real server does not
+    from werkzeug.test import EnvironBuilder
+
+    statuses = []
+    body = b''.join(app(
+        EnvironBuilder(path=path).get_environ(),
+        lambda status, headers, exc_info=None: statuses.append(status),
+    ))
+    served = time.perf_counter()
+    if not statuses[0].startswith('200') or not body:
+        raise SystemExit(f"{path} answered {statuses[0]}")
+    return {
+        'import': (imported - start) * 1000,
+        'create_app': (created - imported) * 1000,
+        'first request': (served - created) * 1000,
+        'total': (served - start) * 1000,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the median of each stage."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--config', default='{}')
+    parser.add_argument('--worker', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    config = json.loads(args.config)
+
+    if args.worker:
+        print(json.dumps(measure_startup(args.path, config)))
+        return
+
+    command = [sys.executable, __file__, '--worker', '--path', args.path,
+               '--config', args.config]
+    runs: List[Dict[str, float]] = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            command, check=True, capture_output=True, text=True
+        ).stdout
+        runs.append(json.loads(output))
+
+    print(f"GET {args.path}: median of {args.runs} fresh processes")
+    for stage in STAGES:
+        values = [run[stage] for run in runs]
+        print(f"  {stage:<14} {statistics.median(values):8.2f} ms"
+              f"  (min {min(values):.2f})")
+
+
+if __name__ == '__main__':
+    main()
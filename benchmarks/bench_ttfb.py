@@ -0,0 +1,105 @@
+"""
+Time-to-first-byte benchmark for streamed page rendering.
+
+Serves the app with Werkzeug's threaded server on a local port and
+requests the large pages over a raw socket, once with the pages in
+``STREAMED_PAGES`` and once buffered. For each it reports when the first
+byte arrived, when the stylesheet link arrived (the point where a browser
+can start fetching ``style.css``) and when the response was complete.
+The page cache is off so every request renders the template.
+
+Usage:
+    python benchmarks/bench_ttfb.py [--repeat N]
+"""
+
+import argparse
+import logging
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from app import create_app  # noqa: E402
+
+PAGES = ('/tutorials', '/copilot-integration')
+
+
+def fetch(port: int, path: str) -> Tuple[float, float, float]:
+    """
+    Request a page and time its arrival.
+
+    Args:
+        port: Server port on localhost.
+        path: Page to request.
+
+    Returns:
+        Seconds until the first byte, until the stylesheet link and until
+        the end of the response.
+    """
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+        'Connection: close\r\n\r\n'
+    ).encode('ascii')
+    received = b''
+    first = stylesheet = 0.0
+    with socket.create_connection(('127.0.0.1', port)) as conn:
+        start = time.perf_counter()
+        conn.sendall(request)
+        while chunk := conn.recv(65536):
+            now = time.perf_counter() - start
+            first = first or now
+            received += chunk
+            if not stylesheet and b'rel="stylesheet"' in received:
+                stylesheet = now
+        total = time.perf_counter() - start
+    return first, stylesheet, total
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    modes = {
+        'streamed': {'STREAMED_PAGES': ('tutorials', 'copilot_integration')},
+        'buffered': {'STREAMED_PAGES': ()},
+    }
+    results: Dict[Tuple[str, str], List[Tuple[float, float, float]]] = {}
+    for mode, config in modes.items():
+        app = create_app({'PAGE_CACHE_SIZE': 0, **config})
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            for path in PAGES:
+                fetch(server.port, path)
+                results[mode, path] = [
+                    fetch(server.port, path) for _ in range(args.repeat)
+                ]
+        finally:
+            server.shutdown()
+
+    print(f"Median of {args.repeat} requests (ms)")
+    print(f"  {'page':<22}{'mode':<10}{'first byte':>12}{'stylesheet':>12}"
+          f"{'complete':>10}")
+    for path in PAGES:
+        for mode in modes:
+            timings = zip(*results[mode, path])
+            print(f"  {path:<22}{mode:<10}" + ''.join(
+                f"{statistics.median(values) * 1000:>{width}.2f}"
+                for values, width in zip(timings, (12, 12, 10))
+            ))
+
+
+if __name__ == '__main__':
+    main()
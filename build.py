@@ -5,139 +5,1930 @@ This script renders all Flask routes to static HTML files for GitHub Pages hosti
 preserving the look and functionality of the application.
 """
 
+import argparse
+import hashlib
+import importlib
+import json
 import os
+import re
 import sys
 import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, is_dataclass
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urljoin
+from types import CodeType
+from typing import (
+    AbstractSet, Any, BinaryIO, Callable, Dict, List, Mapping, Match,
+    Optional, Sequence, Set, Tuple,
+)
+
+from bs4 import BeautifulSoup, Tag
+from flask import Flask
+from jinja2 import Environment, meta, nodes
+from werkzeug.exceptions import NotFound
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from app import create_app
+from app import create_app
+from assets import (
+    FINGERPRINT_LENGTH, MANIFEST_NAME as ASSET_MANIFEST_NAME,
+    fingerprint_name, strip_fingerprint, write_asset_manifest,
+)
+from content_encoding import SIDECAR_SUFFIXES, available_encodings, compress
+from minify import HTMLMinifier
+from profiling import BuildProfiler, find_regressions, load_report
+from stylesheet import (
+    CssRule, SelectorMatcher, UsedSelectors, parse_stylesheet, prune_rules,
+    serialize_stylesheet,
+)
+from search import (
+    INDEX_NAME as SEARCH_INDEX_NAME, SearchDocument, write_search_index,
+)
+from routes import get_copilot_examples, get_learning_resources
+
+
+# Functions whose return values are tracked as build inputs for any view
+# that references them
+DATA_SOURCES: Dict[str, Callable[[], Any]] = {
+    'get_learning_resources': get_learning_resources,
+    'get_copilot_examples': get_copilot_examples,
+}
+
+# Source files (glob patterns) that affect every rendered page
+SOURCE_FILES = ('build.py', 'src/*.py')
+
+MANIFEST_NAME = '.build-manifest.json'
+
+# Routes that only work on a server (queries and search) and are not rendered
+DYNAMIC_ROUTE_PREFIXES = ('/api/', '/search')
+MANIFEST_VERSION = 2
+
+# Text file types that get precompressed sidecars
+COMPRESSIBLE_SUFFIXES = (
+    '.html', '.css', '.js', '.json', '.svg', '.txt', '.xml',
+)
+
+# Files smaller than this are not worth precompressing
+COMPRESS_THRESHOLD = 1024
+
+# Number of leading content blocks of <main> treated as above the fold
+FOLD_BLOCKS = 2
+
+# Matches <link rel="stylesheet" ...> tags
+STYLESHEET_LINK = re.compile(
+    r'''<link\b[^>]*\brel=["']stylesheet["'][^>]*>''', re.IGNORECASE
+)
+HREF_ATTRIBUTE = re.compile(r'''\bhref=["']([^"']+)["']''')
+
+# Output directory of the client-side search index
+SEARCH_DIR = 'search'
+
+# Suffix of every page <title>, left out of search result titles
+SITE_TITLE_SUFFIX = ' - GitHub Copilot Demo'
+
+# Allowed slowdown of a build stage against a --baseline, in percent
+MAX_REGRESSION = 10.0
+
+# Report of the selectors removed by --prune-css
+PRUNE_REPORT_NAME = '.css-prune-report.json'
+
+
+@dataclass
+class RouteError:
+    """
+    A route that failed to render during a build.
+
+    Attributes:
+        route: URL path that was requested.
+        filename: Output file the route would have been written to.
+        message: Description of the failure.
+    """
+
+    route: str
+    filename: str
+    message: str
+
+
+def build_static_site(
+    output_dir: str = 'docs',
+    base_url: str = '/',
+    jobs: int = 1,
+    incremental: bool = False,
+    precompress: bool = False,
+    compress_threshold: int = COMPRESS_THRESHOLD,
+    critical_css: bool = False,
+    prune_css: bool = False,
+    minify: bool = False,
+    sync: bool = False,
+    link: bool = False,
+    search_index: bool = True,
+    profiler: Optional[BuildProfiler] = None,
+) -> List[RouteError]:
+    """
+    Build static site by rendering all Flask routes to HTML files.
+
+    Args:
+        output_dir: Directory to output static files (default: 'docs' for GitHub Pages).
+        base_url: Base URL for the site (default: '/' for custom domain).
+        jobs: Number of worker processes used to render routes. With more
+            than one job, each worker creates its own app and renders a
+            share of the routes; the output is identical to a serial build.
+        incremental: Keep the existing output directory and only re-render
+            routes whose inputs (templates, route data, sources) changed
+            since the build recorded in its manifest.
+        precompress: Write ``.gz`` and ``.br`` sidecars for every text
+            output of at least ``compress_threshold`` bytes.
+        compress_threshold: Minimum file size in bytes to precompress.
+        critical_css: Inline the stylesheet rules used above the fold into
+            each rendered page and load the full stylesheet asynchronously.
+        prune_css: Link pages to a copy of each stylesheet without the
+            selectors that match nothing in any page. The full stylesheet
+            is still written and is used when this is off.
+        minify: Minify the HTML of each page written by this build.
+        sync: Keep the static directory of an existing output and only
+            write the static files that changed, instead of wiping it and
+            copying everything. Incremental builds always sync.
+        link: Hardlink static files into the output instead of copying
+            them where the filesystem allows it.
+        search_index: Write a sharded search index of the pages and
+            learning resources for the search box in ``main.js``.
+        profiler: Profiler that receives the timing of every stage and
+            route of this build.
+
+    Returns:
+        List of routes that failed to render (empty on success).
+    """
+    if profiler is None:
+        profiler = BuildProfiler()
+    started = time.perf_counter()
+    output_path = Path(output_dir)
+    options = {
+        'base_url': base_url,
+        'critical_css': critical_css,
+        'prune_css': prune_css,
+        'minify': minify,
+        'search_index': search_index,
+    }
+    sync = sync or incremental
+    manifest = load_manifest(output_path) if sync else None
+    previous = manifest if incremental else None
+    if previous is not None and previous.get('options') != options:
+        previous = None
+
+    # Create output directory
+    with profiler.stage('clean'):
+        if previous is None and output_path.exists():
+            clean_output(output_path, keep=('static',) if sync else ())
+        output_path.mkdir(parents=True, exist_ok=True)
+
+    # Create Flask app and find the pages to render
+    with profiler.stage('app'):
+        app = create_app()
+        all_routes = discover_routes(app)
+
+    # Work out which routes need rendering
+    with profiler.stage('plan'):
+        route_inputs = collect_route_inputs(app, all_routes)
+        routes = plan_routes(all_routes, route_inputs, previous, output_path)
+    if previous is not None:
+        print(
+            f"Incremental build: {len(routes)} of {len(all_routes)} "
+            f"route(s) changed"
+        )
+        remove_stale_pages(previous, all_routes, output_path)
+
+    # Render each route
+    with profiler.stage('render'):
+        if not routes:
+            results = []
+        elif jobs > 1:
+            results = render_routes_parallel(
+                routes, base_url, jobs, profiler=profiler
+            )
+        else:
+            results = render_routes(
+                routes, base_url, app=app, profiler=profiler
+            )
+
+    errors: List[RouteError] = []
+    written: List[str] = []
+    with profiler.stage('write'):
+        for route, filename, html, error in results:
+            print(f"Rendering {route} -> {filename}")
+            if error is not None:
+                errors.append(RouteError(route, filename, error))
+                print(f"  ✗ Error: {error}")
+                continue
+
+            # Write to file
+            timing = profiler.route(route)
+            start = time.perf_counter()
+            output_file = output_path / filename
+            data = html.encode('utf-8')
+            output_file.write_bytes(data)
+            timing.write = time.perf_counter() - start
+            timing.bytes = len(data)
+            written.append(filename)
+            print(f"  ✓ Created {output_file}")
+
+    # Copy static assets
+    with profiler.stage('static'):
+        static_records = copy_static_assets(
+            output_path, base_url,
+            previous=manifest.get('static') if manifest is not None else None,
+            link=link,
+        )
+
+    # Point every page at stylesheets without unused selectors
+    if prune_css:
+        with profiler.stage('prune_css'):
+            prune_unused_css(output_path, base_url)
+
+    # Inline above-the-fold CSS into the pages written by this build
+    if critical_css:
+        with profiler.stage('critical_css'):
+            inline_critical_css(output_path, written, base_url)
+
+    # Index the pages and resources for client-side search
+    if search_index:
+        with profiler.stage('search'):
+            build_search(output_path, base_url)
+
+    # Strip comments and indentation from the pages written by this build
+    if minify:
+        with profiler.stage('minify'):
+            minify_pages(output_path, written)
+
+    with profiler.stage('manifest'):
+        write_manifest(
+            output_path, options, all_routes, route_inputs, static_records,
+            failed={error.route for error in errors},
+        )
+
+    # Precompress text outputs
+    if precompress:
+        with profiler.stage('precompress'):
+            compressed = precompress_outputs(
+                output_path, threshold=compress_threshold, jobs=jobs
+            )
+        report_compression(compressed)
+    
+    # Create CNAME file for custom domain
+    create_cname_file(output_path)
+    
+    # Create .nojekyll file to disable Jekyll processing
+    create_nojekyll_file(output_path)
+
+    report_route_errors(errors)
+    profiler.total = time.perf_counter() - started
+
+    print(f"\n✓ Static site built successfully in '{output_dir}' directory")
+    print(f"  Base URL: {base_url}")
+    print(f"  Files generated: {len(list(output_path.rglob('*')))}")
+    return errors
+
+
+RenderResult = Tuple[str, str, str, Optional[str]]
+
+
+def discover_routes(app: Flask) -> List[Tuple[str, str]]:
+    """
+    Find the pages to render from the app's URL map.
+
+    Every argument-free GET rule except ``static`` and the dynamic routes
+    under ``DYNAMIC_ROUTE_PREFIXES`` becomes a page, and the
+    ``errorhandler(404)`` page is rendered as ``/404`` -> ``404.html``.
+
+    Args:
+        app: Flask application.
+
+    Returns:
+        (route, output filename) pairs, sorted by route.
+    """
+    routes = {
+        rule.rule: route_filename(rule.rule)
+        for rule in app.url_map.iter_rules()
+        if rule.endpoint != 'static'
+        and not rule.arguments
+        and 'GET' in (rule.methods or ())
+        and not rule.rule.startswith(DYNAMIC_ROUTE_PREFIXES)
+    }
+    if 404 in app.error_handler_spec[None]:
+        routes.setdefault('/404', '404.html')
+    return sorted(routes.items())
+
+
+def render_view(app: Flask, route: str) -> Tuple[str, int]:
+    """
+    Render a route by calling its view function directly.
+
+    The view runs inside a request context for the route, without building
+    a WSGI response: ``before_request``/``after_request`` hooks are skipped
+    and the rendered text is returned as-is. Routes that do not match a
+    URL rule are rendered by the 404 error handler.
+
+    Args:
+        app: Flask application.
+        route: URL path to render.
+
+    Returns:
+        A (rendered text, status code) tuple.
+    """
+    # A string, a (body, status) tuple or a response
+    rv: Any
+    with app.test_request_context(route) as ctx:
+        request = ctx.request
+        rule = request.url_rule
+        if request.routing_exception is None and rule is not None:
+            view = app.view_functions[rule.endpoint]
+            rv = view(**(request.view_args or {}))
+        else:
+            rv = view_for_route(app, route)(request.routing_exception)
+
+    status = 200
+    if isinstance(rv, tuple):
+        rv, status = rv[0], rv[1]
+    if not isinstance(rv, str):
+        response = app.make_response(rv)
+        return response.get_data(as_text=True), response.status_code
+    return rv, status
+
+
+def render_routes(
+    routes: Sequence[Tuple[str, str]],
+    base_url: str,
+    app: Optional[Flask] = None,
+    profiler: Optional[BuildProfiler] = None,
+) -> List[RenderResult]:
+    """
+    Render routes to HTML by direct view dispatch.
+
+    Args:
+        routes: (route, output filename) pairs to render.
+        base_url: Base URL for the site.
+        app: Flask application to render with (default: a new app from
+            ``create_app()``).
+        profiler: Profiler that receives the render, rewrite, template
+            load and template compile time of each route.
+
+    Returns:
+        One (route, filename, html, error) tuple per route, in input order.
+        ``error`` is None on success and ``html`` is empty on failure.
+    """
+    if app is None:
+        app = create_app()
+    if profiler is None:
+        profiler = BuildProfiler()
+    app.config['FREEZER_BASE_URL'] = base_url
+    app.config['FREEZER_RELATIVE_URLS'] = False
+    profiler.instrument_templates(app.jinja_env)
+
+    rewriter = LinkRewriter.from_app(app, base_url)
+
+    results: List[RenderResult] = []
+    for route, filename in routes:
+        timing = profiler.route(route)
+        compiled = profiler.compile_time
+        loaded = profiler.load_time
+        start = time.perf_counter()
+        try:
+            html, status = render_view(app, route)
+            timing.render = time.perf_counter() - start
+            timing.compile = profiler.compile_time - compiled
+            timing.load = profiler.load_time - loaded
+            # Accept both 200 and 404 status codes (for error pages)
+            if status in (200, 404):
+                # Update asset paths for GitHub Pages
+                start = time.perf_counter()
+                html = rewriter.rewrite(html)
+                timing.rewrite = time.perf_counter() - start
+                results.append((route, filename, html, None))
+            else:
+                results.append((
+                    route, filename, '', f"unexpected status {status}",
+                ))
+        except Exception as e:
+            results.append((route, filename, '', f"{type(e).__name__}: {e}"))
+    return results
+
+
+def render_routes_profiled(
+    routes: Sequence[Tuple[str, str]], base_url: str
+) -> Tuple[List[RenderResult], BuildProfiler]:
+    """
+    Render routes in a worker process and return their timings as well.
+
+    Args:
+        routes: (route, output filename) pairs to render.
+        base_url: Base URL for the site.
+
+    Returns:
+        The results of ``render_routes`` and the worker's profiler.
+    """
+    profiler = BuildProfiler()
+    return render_routes(routes, base_url, profiler=profiler), profiler
+
+
+def render_routes_parallel(
+    routes: Sequence[Tuple[str, str]],
+    base_url: str,
+    jobs: int,
+    profiler: Optional[BuildProfiler] = None,
+) -> List[RenderResult]:
+    """
+    Render routes across a pool of worker processes.
+
+    The route list is split into ``jobs`` interleaved chunks and each worker
+    renders its chunk with its own app via ``render_routes``. Results are
+    returned in the original route order so that reporting and output are
+    the same as a serial build.
+
+    Args:
+        routes: (route, output filename) pairs to render.
+        base_url: Base URL for the site.
+        jobs: Number of worker processes.
+        profiler: Profiler that receives the route timings measured in
+            the workers.
+
+    Returns:
+        One (route, filename, html, error) tuple per route, in input order.
+    """
+    jobs = max(1, min(jobs, len(routes)))
+    chunks = [list(routes[i::jobs]) for i in range(jobs)]
+
+    results: List[RenderResult] = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(render_routes_profiled, chunk, base_url)
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            try:
+                chunk_results, chunk_profiler = future.result()
+                results.extend(chunk_results)
+                if profiler is not None:
+                    profiler.merge(chunk_profiler)
+            except Exception as e:
+                # The worker itself died (e.g. create_app failed)
+                results.extend(
+                    (route, filename, '', f"worker failed: {e}")
+                    for route, filename in chunk
+                )
+
+    order = {route: index for index, (route, _) in enumerate(routes)}
+    results.sort(key=lambda result: order[result[0]])
+    return results
+
+
+def report_route_errors(errors: Sequence[RouteError]) -> None:
+    """
+    Print a summary of every route that failed to render.
+
+    Args:
+        errors: Routes that failed during the build.
+
+    Returns:
+        None
+    """
+    if not errors:
+        return
+    print(f"\n✗ {len(errors)} route(s) failed to render:")
+    for error in errors:
+        print(f"  - {error.route} -> {error.filename}: {error.message}")
+
+
+def file_digest(path: Path) -> str:
+    """
+    Compute the SHA-256 digest of a file.
+
+    Args:
+        path: File to hash.
+
+    Returns:
+        Hex digest of the file contents.
+    """
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def jsonable(value: Any) -> Any:
+    """
+    Convert a value ``json.dumps`` cannot encode by itself.
+
+    Args:
+        value: Catalog record, read-only mapping or other object.
+
+    Returns:
+        A dict for dataclass records and mappings, else ``str(value)``.
+    """
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def data_digest(data: Any) -> str:
+    """
+    Compute a stable SHA-256 digest of route data.
+
+    Args:
+        data: Value returned by a data source.
+
+    Returns:
+        Hex digest of the canonical JSON encoding of ``data``.
+    """
+    encoded = json.dumps(data, sort_keys=True, default=jsonable)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def template_source(env: Environment, name: str) -> str:
+    """
+    Read the source of a template through the environment's loader.
+
+    Args:
+        env: Jinja environment.
+        name: Template name.
+
+    Returns:
+        The template source.
+
+    Raises:
+        RuntimeError: If the environment has no loader.
+    """
+    if env.loader is None:
+        raise RuntimeError('The Jinja environment has no template loader')
+    source, _, _ = env.loader.get_source(env, name)
+    return source
+
+
+def template_dependencies(app: Flask) -> Dict[str, Set[str]]:
+    """
+    Build the graph of templates referenced by each template.
+
+    Edges come from ``{% extends %}``, ``{% include %}``, ``{% import %}``
+    and ``{% from %}`` tags. Dynamic references that cannot be resolved
+    statically are ignored.
+
+    Args:
+        app: Flask application whose Jinja environment is inspected.
+
+    Returns:
+        Mapping of template name to the names it references directly.
+    """
+    env = app.jinja_env
+    graph: Dict[str, Set[str]] = {}
+    for name in env.list_templates():
+        source = template_source(env, name)
+        referenced = meta.find_referenced_templates(env.parse(source))
+        graph[name] = {ref for ref in referenced if ref is not None}
+    return graph
+
+
+def template_static_references(app: Flask) -> Dict[str, Set[str]]:
+    """
+    Find the static files each template links to.
+
+    Only literal ``url_for('static', filename='...')`` calls are found.
+
+    Args:
+        app: Flask application whose Jinja environment is inspected.
+
+    Returns:
+        Mapping of template name to the static file paths it references.
+    """
+    env = app.jinja_env
+    references: Dict[str, Set[str]] = {}
+    for name in env.list_templates():
+        source = template_source(env, name)
+        found: Set[str] = set()
+        for call in env.parse(source).find_all(nodes.Call):
+            if not (
+                isinstance(call.node, nodes.Name)
+                and call.node.name == 'url_for'
+                and call.args
+                and isinstance(call.args[0], nodes.Const)
+                and call.args[0].value == 'static'
+            ):
+                continue
+            for keyword in call.kwargs:
+                if (
+                    keyword.key == 'filename'
+                    and isinstance(keyword.value, nodes.Const)
+                ):
+                    found.add(keyword.value.value)
+        references[name] = found
+    return references
+
+
+def template_closure(
+    roots: Sequence[str], graph: Dict[str, Set[str]]
+) -> Set[str]:
+    """
+    Collect templates reachable from the given root templates.
+
+    Args:
+        roots: Templates rendered directly by a view.
+        graph: Template dependency graph from ``template_dependencies``.
+
+    Returns:
+        The roots plus every template they extend or include, transitively.
+    """
+    seen: Set[str] = set()
+    stack = [root for root in roots if root in graph]
+    while stack:
+        name = stack.pop()
+        if name not in seen:
+            seen.add(name)
+            stack.extend(graph[name] - seen)
+    return seen
+
+
+def view_for_route(app: Flask, route: str) -> Callable[..., Any]:
+    """
+    Find the function that produces the response for a route.
+
+    Routes that do not match a URL rule resolve to the 404 error handler.
+
+    Args:
+        app: Flask application.
+        route: URL path.
+
+    Returns:
+        The view function or error handler for the route.
+    """
+    adapter = app.url_map.bind('localhost')
+    try:
+        endpoint, _ = adapter.match(route)
+    except NotFound:
+        return app.error_handler_spec[None][404][NotFound]
+    return app.view_functions[endpoint]
+
+
+def code_references(code: CodeType) -> Tuple[Set[str], Set[str]]:
+    """
+    List the string constants and global names used by a code object.
+
+    Args:
+        code: Code object to inspect (nested code objects are included).
+
+    Returns:
+        A (string constants, global names) tuple.
+    """
+    strings: Set[str] = set()
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, str):
+            strings.add(const)
+        elif isinstance(const, CodeType):
+            nested_strings, nested_names = code_references(const)
+            strings |= nested_strings
+            names |= nested_names
+    return strings, names
+
+
+def collect_route_inputs(
+    app: Flask, routes: Sequence[Tuple[str, str]]
+) -> Dict[str, Dict[str, str]]:
+    """
+    Hash every input that a route's rendered output depends on.
+
+    A route depends on the templates its view renders (found from the
+    view's string constants) and everything they extend or include, on the
+    static files those templates link to (their fingerprinted names end up
+    in the page), on the data sources its view calls, and on the build and
+    app source files.
+
+    Args:
+        app: Flask application used to resolve views and templates.
+        routes: (route, output filename) pairs.
+
+    Returns:
+        Mapping of route to a {input key: digest} dictionary.
+    """
+    graph = template_dependencies(app)
+    static_references = template_static_references(app)
+    static_folder = Path(app.static_folder or '')
+    env = app.jinja_env
+    template_hashes: Dict[str, str] = {}
+    static_hashes: Dict[str, str] = {}
+    data_hashes: Dict[str, str] = {}
+
+    root_dir = Path(__file__).parent
+    shared = {
+        f'source:{path.relative_to(root_dir).as_posix()}': file_digest(path)
+        for pattern in SOURCE_FILES
+        for path in sorted(root_dir.glob(pattern))
+    }
+
+    inputs: Dict[str, Dict[str, str]] = {}
+    for route, _ in routes:
+        strings, names = code_references(
+            view_for_route(app, route).__code__
+        )
+        route_hashes = dict(shared)
+        for name in sorted(template_closure(sorted(strings), graph)):
+            if name not in template_hashes:
+                source = template_source(env, name)
+                template_hashes[name] = data_digest(source)
+            route_hashes[f'template:{name}'] = template_hashes[name]
+            for static_name in static_references[name]:
+                if static_name not in static_hashes:
+                    static_file = static_folder / static_name
+                    static_hashes[static_name] = (
+                        file_digest(static_file)
+                        if static_file.is_file() else ''
+                    )
+                route_hashes[f'static:{static_name}'] = (
+                    static_hashes[static_name]
+                )
+        for name in sorted(names & DATA_SOURCES.keys()):
+            if name not in data_hashes:
+                data_hashes[name] = data_digest(DATA_SOURCES[name]())
+            route_hashes[f'data:{name}'] = data_hashes[name]
+        inputs[route] = route_hashes
+    return inputs
+
+
+def plan_routes(
+    routes: Sequence[Tuple[str, str]],
+    route_inputs: Dict[str, Dict[str, str]],
+    previous: Optional[Dict[str, Any]],
+    output_path: Path,
+) -> List[Tuple[str, str]]:
+    """
+    Select the routes that must be rendered.
+
+    Args:
+        routes: (route, output filename) pairs.
+        route_inputs: Current input digests from ``collect_route_inputs``.
+        previous: Manifest of the previous build, or None for a full build.
+        output_path: Output directory.
+
+    Returns:
+        The routes whose inputs changed, whose output is missing, or that
+        were not recorded by the previous build.
+    """
+    if previous is None:
+        return list(routes)
+
+    recorded = previous.get('routes', {})
+    changed = []
+    for route, filename in routes:
+        entry = recorded.get(route)
+        if (
+            entry is None
+            or entry.get('filename') != filename
+            or entry.get('inputs') != route_inputs[route]
+            or not (output_path / filename).exists()
+        ):
+            changed.append((route, filename))
+    return changed
+
+
+def remove_stale_pages(
+    previous: Dict[str, Any],
+    routes: Sequence[Tuple[str, str]],
+    output_path: Path,
+) -> None:
+    """
+    Delete pages written by the previous build for routes that are gone.
+
+    Args:
+        previous: Manifest of the previous build.
+        routes: (route, output filename) pairs of the current build.
+        output_path: Output directory.
+
+    Returns:
+        None
+    """
+    current = {route for route, _ in routes}
+    for route, entry in previous.get('routes', {}).items():
+        if route not in current:
+            stale = output_path / entry['filename']
+            if stale.exists():
+                stale.unlink()
+                print(f"  ✓ Removed {stale}")
+
+
+def clean_output(output_path: Path, keep: Sequence[str] = ()) -> None:
+    """
+    Empty the output directory for a full build.
+
+    Args:
+        output_path: Output directory.
+        keep: Names of top-level entries to leave in place.
+
+    Returns:
+        None
+    """
+    for entry in output_path.iterdir():
+        if entry.name in keep:
+            continue
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
+
+
+def load_manifest(output_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load the manifest recorded by a previous build.
+
+    Args:
+        output_path: Output directory.
+
+    Returns:
+        The manifest, or None if it is missing, unreadable or outdated.
+    """
+    manifest_file = output_path / MANIFEST_NAME
+    try:
+        manifest: Any = json.loads(manifest_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get('version') != MANIFEST_VERSION
+    ):
+        return None
+    return manifest
+
+
+def write_manifest(
+    output_path: Path,
+    options: Dict[str, Any],
+    routes: Sequence[Tuple[str, str]],
+    route_inputs: Dict[str, Dict[str, str]],
+    static_records: Dict[str, Dict[str, Any]],
+    failed: Set[str],
+) -> None:
+    """
+    Record the inputs of this build for the next incremental build.
+
+    Routes that failed to render are left out so they are retried.
+
+    Args:
+        output_path: Output directory.
+        options: Build options the pages were produced with; a later
+            incremental build with different options starts from scratch.
+        routes: (route, output filename) pairs of this build.
+        route_inputs: Input digests from ``collect_route_inputs``.
+        static_records: Records of the synced static files.
+        failed: Routes that failed to render.
+
+    Returns:
+        None
+    """
+    filenames = dict(routes)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'options': options,
+        'routes': {
+            route: {'filename': filenames[route], 'inputs': inputs}
+            for route, inputs in route_inputs.items()
+            if route not in failed
+        },
+        'static': static_records,
+    }
+    manifest_file = output_path / MANIFEST_NAME
+    manifest_file.write_text(
+        json.dumps(manifest, indent=2, sort_keys=True) + '\n',
+        encoding='utf-8',
+    )
+
+
+# Matches the path of app-relative href/src values (either quote style);
+# any query string or fragment is left in place after the match. There is
+# deliberately no leading \b: it defeats the regex engine's literal prefix
+# scan, and data-href/data-src attributes want the same rewriting anyway.
+LINK_PATTERN = re.compile(
+    r'''(?P<attr>(?:href|src)=["'])(?P<path>/[^"'?#]*)'''
+)
+
+
+def route_filename(route: str) -> str:
+    """
+    Get the static output filename for a route.
+
+    Args:
+        route: URL path without arguments, e.g. ``/resources``.
+
+    Returns:
+        Output filename, e.g. ``resources.html`` (``index.html`` for ``/``).
+    """
+    path = route.strip('/')
+    return f'{path}.html' if path else 'index.html'
+
+
+class LinkRewriter:
+    """
+    Rewrite app-relative links in rendered HTML for static hosting.
+
+    The link table is built once from the app's URL map, so every page
+    route is covered without listing it by hand. Rewriting is a single
+    scan over the document that only touches ``href``/``src`` values.
+
+    Attributes:
+        base_url: Base URL the static site is served from.
+        static_prefix: URL prefix of the app's static files.
+        links: Mapping of app route to its static URL.
+    """
+
+    def __init__(
+        self, links: Dict[str, str], static_prefix: str, base_url: str
+    ) -> None:
+        """
+        Initialize a LinkRewriter.
+
+        Args:
+            links: Mapping of app route to its static URL.
+            static_prefix: URL prefix of the app's static files
+                (e.g. ``/static/``).
+            base_url: Base URL the static site is served from.
+        """
+        self.links = links
+        self.static_prefix = static_prefix
+        self.base_url = base_url
+
+    @classmethod
+    def from_app(cls, app: Flask, base_url: str) -> 'LinkRewriter':
+        """
+        Build a rewriter for every argument-free GET route of an app.
+
+        Dynamic routes under ``DYNAMIC_ROUTE_PREFIXES`` are not rendered,
+        so links to them are left as they are.
+
+        Args:
+            app: Flask application.
+            base_url: Base URL the static site is served from.
+
+        Returns:
+            LinkRewriter instance.
+        """
+        links: Dict[str, str] = {}
+        for rule in app.url_map.iter_rules():
+            if (
+                rule.endpoint == 'static'
+                or rule.arguments
+                or 'GET' not in (rule.methods or ())
+                or rule.rule.startswith(DYNAMIC_ROUTE_PREFIXES)
+            ):
+                continue
+            filename = route_filename(rule.rule)
+            links[rule.rule] = (
+                base_url if filename == 'index.html' else base_url + filename
+            )
+        static_prefix = f"{(app.static_url_path or '').rstrip('/')}/"
+        return cls(links, static_prefix, base_url)
+
+    def rewrite(self, html: str) -> str:
+        """
+        Rewrite all route and static links in an HTML document.
+
+        Args:
+            html: Rendered HTML.
+
+        Returns:
+            HTML with links pointing at the static site.
+        """
+        return LINK_PATTERN.sub(self._replace, html)
+
+    def _replace(self, match: Match[str]) -> str:
+        """Rewrite a single matched attribute."""
+        path = match.group('path')
+        target = self.links.get(path)
+        if target is None:
+            if not path.startswith(self.static_prefix):
+                return match.group(0)
+            target = self.base_url + 'static/' + path[len(self.static_prefix):]
+        return match.group('attr') + target
+
+
+@lru_cache(maxsize=None)
+def default_link_rewriter(base_url: str) -> LinkRewriter:
+    """
+    Get a cached LinkRewriter for the default app.
+
+    Args:
+        base_url: Base URL the static site is served from.
+
+    Returns:
+        LinkRewriter built from ``create_app()``.
+    """
+    return LinkRewriter.from_app(create_app(), base_url)
+
+
+def update_asset_paths(html: str, base_url: str) -> str:
+    """
+    Update asset paths in HTML to work with GitHub Pages.
+
+    Kept for callers that do not have an app at hand; builds use a
+    ``LinkRewriter`` created from the app being rendered.
+
+    Args:
+        html: HTML content to update.
+        base_url: Base URL for the site.
+
+    Returns:
+        Updated HTML content.
+    """
+    return default_link_rewriter(base_url).rewrite(html)
+
+
+@dataclass
+class SyncStats:
+    """
+    Counts of what a static asset sync did.
+
+    Attributes:
+        copied: Files written by copying.
+        linked: Files written as hardlinks to the source.
+        unchanged: Files that were already up to date.
+        removed: Files deleted because their source is gone.
+    """
+
+    copied: int = 0
+    linked: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+def copy_file_contents(source: BinaryIO, dest: BinaryIO) -> None:
+    """
+    Copy one open file into another.
+
+    ``os.copy_file_range`` lets the kernel copy (or reflink) the data
+    without passing it through user space; where it is unavailable or the
+    filesystem refuses it, the data is copied in Python.
+
+    Args:
+        source: File opened for binary reading.
+        dest: Empty file opened for binary writing.
+
+    Returns:
+        None
+    """
+    try:
+        while os.copy_file_range(source.fileno(), dest.fileno(), 1 << 30):
+            pass
+    except (AttributeError, OSError):
+        source.seek(0)
+        dest.seek(0)
+        dest.truncate()
+        shutil.copyfileobj(source, dest)
+
+
+def copy_file(source: Path, dest: Path, link: bool = False) -> bool:
+    """
+    Copy a file, replacing the destination atomically.
+
+    The new file is written next to the destination and renamed over it,
+    so a destination that is a hardlink to some other file is replaced
+    rather than written through.
+
+    Args:
+        source: File to copy.
+        dest: Destination path.
+        link: Hardlink the destination to the source when the filesystem
+            allows it instead of copying the data.
+
+    Returns:
+        True if the destination was hardlinked, False if it was copied.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    temp = dest.with_name(f'.{dest.name}.tmp')
+    temp.unlink(missing_ok=True)
+    try:
+        if link:
+            try:
+                os.link(source, temp)
+                os.replace(temp, dest)
+                return True
+            except OSError:
+                temp.unlink(missing_ok=True)
+        with open(source, 'rb') as src_file, open(temp, 'wb') as dest_file:
+            copy_file_contents(src_file, dest_file)
+        shutil.copystat(source, temp)
+        os.replace(temp, dest)
+        return False
+    finally:
+        temp.unlink(missing_ok=True)
 
 
-def build_static_site(output_dir: str = 'docs', base_url: str = '/') -> None:
+def is_generated_static(name: str, sources: AbstractSet[str]) -> bool:
     """
-    Build static site by rendering all Flask routes to HTML files.
+    Tell whether an output static file was produced by the build itself.
+
+    Fingerprinted copies, precompressed sidecars and the asset manifest
+    are written by later build steps and have no file of their own in
+    ``src/static``.
 
     Args:
-        output_dir: Directory to output static files (default: 'docs' for GitHub Pages).
-        base_url: Base URL for the site (default: '/' for custom domain).
+        name: Path relative to the output static directory.
+        sources: Paths of the files in the source static directory.
 
     Returns:
-        None
+        True if the file belongs to a source file or to the build.
     """
-    # Create Flask app
-    app = create_app()
-    app.config['FREEZER_BASE_URL'] = base_url
-    app.config['FREEZER_RELATIVE_URLS'] = False
+    if name == ASSET_MANIFEST_NAME:
+        return True
+    for suffix in SIDECAR_SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return name in sources or strip_fingerprint(name) in sources
 
-    # Create output directory
-    output_path = Path(output_dir)
-    if output_path.exists():
-        shutil.rmtree(output_path)
-    output_path.mkdir(parents=True)
-
-    # Routes to render
-    routes = [
-        ('/', 'index.html'),
-        ('/resources', 'resources.html'),
-        ('/examples', 'examples.html'),
-        ('/about', 'about.html'),
-        ('/author', 'author.html'),
-        ('/tutorials', 'tutorials.html'),
-        ('/copilot-integration', 'copilot-integration.html'),
-        ('/404', '404.html'),
-    ]
 
-    # Render each route
-    with app.test_client() as client:
-        for route, filename in routes:
-            print(f"Rendering {route} -> {filename}")
-            try:
-                response = client.get(route)
-                # Accept both 200 and 404 status codes (for error pages)
-                if response.status_code in (200, 404):
-                    html = response.data.decode('utf-8')
-                    
-                    # Update asset paths for GitHub Pages
-                    html = update_asset_paths(html, base_url)
-                    
-                    # Write to file
-                    output_file = output_path / filename
-                    output_file.write_text(html, encoding='utf-8')
-                    print(f"  ✓ Created {output_file}")
-                else:
-                    print(f"  ✗ Error: {response.status_code}")
-            except Exception as e:
-                print(f"  ✗ Error rendering {route}: {e}")
+def static_record(
+    source: Path, stat: os.stat_result, previous: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Get the record of a source static file.
 
-    # Copy static assets
-    copy_static_assets(output_path, base_url)
-    
-    # Create CNAME file for custom domain
-    create_cname_file(output_path)
-    
-    # Create .nojekyll file to disable Jekyll processing
-    create_nojekyll_file(output_path)
+    Args:
+        source: Source file.
+        stat: Its ``os.stat`` result.
+        previous: Its record from the previous build, if any.
 
-    print(f"\n✓ Static site built successfully in '{output_dir}' directory")
-    print(f"  Base URL: {base_url}")
-    print(f"  Files generated: {len(list(output_path.rglob('*')))}")
+    Returns:
+        The previous record if size and modification time are unchanged,
+        otherwise a new one with the file's digest.
+    """
+    if (
+        isinstance(previous, dict)
+        and previous.get('size') == stat.st_size
+        and previous.get('mtime_ns') == stat.st_mtime_ns
+    ):
+        return previous
+    return {
+        'digest': file_digest(source),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
 
 
-def update_asset_paths(html: str, base_url: str) -> str:
+def is_up_to_date(dest: Path, stat: os.stat_result, digest: str) -> bool:
     """
-    Update asset paths in HTML to work with GitHub Pages.
+    Tell whether an output static file already matches its source.
+
+    A file with the source's size and modification time (or the source
+    itself, when hardlinked) matches. One with the same size but another
+    time matches if its content hash is ``digest``; its modification time
+    is then updated so the next check is cheap.
 
     Args:
-        html: HTML content to update.
-        base_url: Base URL for the site.
+        dest: File in the output.
+        stat: ``os.stat`` result of the source file.
+        digest: Content hash of the source file.
 
     Returns:
-        Updated HTML content.
+        True if the file does not need to be written.
     """
-    # Update asset references
-    html = html.replace('href="/static/', f'href="{base_url}static/')
-    html = html.replace('src="/static/', f'src="{base_url}static/')
-    
-    # Update navigation links
-    html = html.replace('href="/"', f'href="{base_url}"')
-    html = html.replace('href="/resources"', f'href="{base_url}resources.html"')
-    html = html.replace('href="/examples"', f'href="{base_url}examples.html"')
-    html = html.replace('href="/about"', f'href="{base_url}about.html"')
-    html = html.replace('href="/author"', f'href="{base_url}author.html"')
-    html = html.replace('href="/tutorials"', f'href="{base_url}tutorials.html"')
-    html = html.replace('href="/copilot-integration"', f'href="{base_url}copilot-integration.html"')
-    
-    return html
+    try:
+        dest_stat = dest.stat()
+    except FileNotFoundError:
+        return False
+    if dest_stat.st_size != stat.st_size:
+        return False
+    if dest_stat.st_mtime_ns == stat.st_mtime_ns or os.path.samestat(
+        dest_stat, stat
+    ):
+        return True
+    if file_digest(dest) != digest:
+        return False
+    os.utime(dest, ns=(dest_stat.st_atime_ns, stat.st_mtime_ns))
+    return True
+
+
+def remove_stale_static(dest_static: Path, sources: AbstractSet[str]) -> int:
+    """
+    Delete output static files whose source is gone, and empty folders.
+
+    Args:
+        dest_static: Static directory in the output.
+        sources: Paths of the files in the source static directory.
+
+    Returns:
+        Number of files deleted.
+    """
+    removed = 0
+    if not dest_static.exists():
+        return removed
+    for path in sorted(dest_static.rglob('*'), reverse=True):
+        if path.is_dir():
+            if not any(path.iterdir()):
+                path.rmdir()
+            continue
+        name = path.relative_to(dest_static).as_posix()
+        if not is_generated_static(name, sources):
+            path.unlink()
+            removed += 1
+    return removed
+
 
+def sync_static_tree(
+    src_static: Path,
+    dest_static: Path,
+    previous: Optional[Dict[str, Dict[str, Any]]] = None,
+    link: bool = False,
+) -> Tuple[Dict[str, Dict[str, Any]], SyncStats]:
+    """
+    Make a static directory in the output match the source directory.
+
+    A destination file whose size and modification time match its source
+    is left alone; one whose size matches but whose time differs is kept
+    if its content hash matches. Everything else is (re)written with
+    ``copy_file``. Files whose source is gone are deleted, except those
+    ``is_generated_static`` attributes to the build.
+
+    Args:
+        src_static: Source static directory.
+        dest_static: Static directory in the output.
+        previous: Static file records of the previous build; a source file
+            whose size and modification time are unchanged reuses the
+            recorded digest instead of being hashed again.
+        link: Hardlink files instead of copying them where possible.
+
+    Returns:
+        The records of the synced files (path relative to the static
+        directory -> ``digest``, ``size`` and ``mtime_ns``) and the counts
+        of what was done.
+    """
+    previous = previous or {}
+    records: Dict[str, Dict[str, Any]] = {}
+    stats = SyncStats()
+
+    for source in sorted(src_static.rglob('*')):
+        if not source.is_file():
+            continue
+        name = source.relative_to(src_static).as_posix()
+        stat = source.stat()
+        record = static_record(source, stat, previous.get(name))
+        records[name] = record
+        dest = dest_static / name
+        if is_up_to_date(dest, stat, record['digest']):
+            stats.unchanged += 1
+        elif copy_file(source, dest, link=link):
+            stats.linked += 1
+        else:
+            stats.copied += 1
 
-def copy_static_assets(output_path: Path, base_url: str) -> None:
+    stats.removed = remove_stale_static(dest_static, records.keys())
+    return records, stats
+
+
+def copy_static_assets(
+    output_path: Path,
+    base_url: str,
+    previous: Optional[Dict[str, Dict[str, Any]]] = None,
+    link: bool = False,
+) -> Dict[str, Dict[str, Any]]:
     """
-    Copy static assets (CSS, JS) to output directory.
+    Sync static assets (CSS, JS) to output directory.
+
+    Only files that changed since they were last copied are written, and
+    files that no longer exist in ``src/static`` are removed.
 
     Args:
         output_path: Path to output directory.
         base_url: Base URL for the site.
+        previous: Static file records of the previous build, used to skip
+            hashing unchanged source files and to remove the fingerprinted
+            copies of files that changed.
+        link: Hardlink static files into the output instead of copying
+            them where the filesystem allows it.
 
     Returns:
-        None
+        Mapping of static file path (relative to the static directory) to
+        its record (``digest``, ``size`` and ``mtime_ns``).
     """
-    src_static = Path('src/static')
+    src_static = Path(__file__).parent / 'src' / 'static'
     dest_static = output_path / 'static'
+    records: Dict[str, Dict[str, Any]] = {}
 
     if src_static.exists():
-        print(f"\nCopying static assets...")
-        shutil.copytree(src_static, dest_static, dirs_exist_ok=True)
-        print(f"  ✓ Copied static assets to {dest_static}")
-        
+        print("\nCopying static assets...")
+        records, stats = sync_static_tree(
+            src_static, dest_static, previous=previous, link=link
+        )
+        print(
+            f"  ✓ Synced static assets to {dest_static}: "
+            f"{stats.copied} copied, {stats.linked} linked, "
+            f"{stats.unchanged} unchanged, {stats.removed} removed"
+        )
+
+        fingerprint_static_assets(
+            dest_static,
+            {name: record['digest'] for name, record in records.items()},
+            previous={
+                name: record['digest']
+                for name, record in (previous or {}).items()
+            },
+            link=link,
+        )
+
         # Count files
         css_files = list(dest_static.glob('**/*.css'))
         js_files = list(dest_static.glob('**/*.js'))
         print(f"  - CSS files: {len(css_files)}")
         print(f"  - JS files: {len(js_files)}")
+    return records
+
+
+def fingerprint_static_assets(
+    dest_static: Path,
+    hashes: Dict[str, str],
+    previous: Optional[Dict[str, str]] = None,
+    link: bool = False,
+) -> Dict[str, str]:
+    """
+    Write content-hashed copies of static assets and an asset manifest.
+
+    Each file gets a copy named after its digest (``css/style.<hash>.css``)
+    so it can be served with long-lived immutable caching. The mapping is
+    written to ``static/asset-manifest.json``; the app resolves
+    ``url_for('static', ...)`` to the same names.
+
+    Args:
+        dest_static: Static directory in the output.
+        hashes: Mapping of static file path to its SHA-256 digest.
+        previous: Static file digests recorded by the previous build; the
+            fingerprinted copies of files that changed since are removed.
+        link: Hardlink the copies to the unhashed files where possible.
+
+    Returns:
+        Mapping of static file path to its fingerprinted path.
+    """
+    manifest = {
+        name: fingerprint_name(name, digest) for name, digest in hashes.items()
+    }
+    for name, digest in (previous or {}).items():
+        if hashes.get(name) != digest:
+            stale = dest_static / fingerprint_name(name, digest)
+            stale.unlink(missing_ok=True)
+
+    for name, hashed in manifest.items():
+        dest = dest_static / hashed
+        if not dest.exists():
+            copy_file(dest_static / name, dest, link=link)
+
+    write_asset_manifest(dest_static, manifest)
+    print(f"  ✓ Fingerprinted {len(manifest)} static asset(s)")
+    return manifest
+
+
+@dataclass
+class CompressionResult:
+    """
+    Sizes of one output file and its precompressed sidecars.
+
+    Attributes:
+        path: Output file, relative to the output directory.
+        original: Size of the file in bytes.
+        compressed: Size of each sidecar in bytes, keyed by encoding.
+    """
+
+    path: str
+    original: int
+    compressed: Dict[str, int]
+
+
+def compress_file(path: Path, encodings: Sequence[str]) -> Dict[str, int]:
+    """
+    Write precompressed sidecars for one file at maximum compression.
+
+    A sidecar that is newer than its source is kept as-is, so incremental
+    builds only recompress files that were rewritten.
+
+    Args:
+        path: File to compress.
+        encodings: Content encodings to write sidecars for.
+
+    Returns:
+        Size of each sidecar in bytes, keyed by encoding.
+    """
+    data: Optional[bytes] = None
+    mtime = path.stat().st_mtime_ns
+    sizes: Dict[str, int] = {}
+    for encoding in encodings:
+        sidecar = path.with_name(path.name + SIDECAR_SUFFIXES[encoding])
+        if sidecar.exists() and sidecar.stat().st_mtime_ns >= mtime:
+            sizes[encoding] = sidecar.stat().st_size
+            continue
+        if data is None:
+            data = path.read_bytes()
+        compressed = compress(data, encoding)
+        sidecar.write_bytes(compressed)
+        sizes[encoding] = len(compressed)
+    return sizes
+
+
+def precompress_outputs(
+    output_path: Path,
+    threshold: int = COMPRESS_THRESHOLD,
+    jobs: int = 1,
+) -> List[CompressionResult]:
+    """
+    Write ``.gz`` and ``.br`` sidecars for every text file in the output.
+
+    Files are compressed concurrently on a thread pool: zlib and brotli
+    release the GIL while compressing, so threads scale across cores
+    without pickling file contents between processes. Sidecars whose
+    source file is gone or now below the threshold are removed.
+
+    Args:
+        output_path: Output directory.
+        threshold: Minimum file size in bytes to precompress.
+        jobs: Number of compression threads (default: one per CPU when 1).
+
+    Returns:
+        Per-file sizes, sorted by path.
+    """
+    encodings = available_encodings()
+    sidecar_suffixes = tuple(SIDECAR_SUFFIXES.values())
+    candidates: List[Path] = []
+    for path in sorted(output_path.rglob('*')):
+        if not path.is_file() or path.name.startswith('.'):
+            continue
+        if path.name.endswith(sidecar_suffixes):
+            source = path.with_name(path.name[:-len(path.suffix)])
+            if not source.is_file() or source.stat().st_size < threshold:
+                path.unlink()
+            continue
+        if (
+            path.suffix in COMPRESSIBLE_SUFFIXES
+            and path.stat().st_size >= threshold
+        ):
+            candidates.append(path)
+
+    print(f"\nPrecompressing {len(candidates)} file(s) "
+          f"({', '.join(encodings)})...")
+    with ThreadPoolExecutor(max_workers=jobs if jobs > 1 else None) as pool:
+        sizes = pool.map(
+            lambda path: compress_file(path, encodings), candidates
+        )
+        return [
+            CompressionResult(
+                path.relative_to(output_path).as_posix(),
+                path.stat().st_size,
+                compressed,
+            )
+            for path, compressed in zip(candidates, sizes)
+        ]
+
+
+def report_compression(results: Sequence[CompressionResult]) -> None:
+    """
+    Print original against compressed sizes for each precompressed file.
+
+    Args:
+        results: Per-file sizes from ``precompress_outputs``.
+
+    Returns:
+        None
+    """
+    encodings = available_encodings()
+    width = max((len(result.path) for result in results), default=4)
+    header = f"  {'File':<{width}} {'Original':>10}"
+    for encoding in encodings:
+        header += f" {encoding:>16}"
+    print(header)
+
+    totals = {encoding: 0 for encoding in encodings}
+    total_original = 0
+    for result in results:
+        line = f"  {result.path:<{width}} {result.original:>10,}"
+        for encoding in encodings:
+            size = result.compressed[encoding]
+            totals[encoding] += size
+            percent = 100 * size / result.original
+            line += f" {size:>9,} {percent:5.1f}%"
+        total_original += result.original
+        print(line)
+
+    line = f"  {'Total':<{width}} {total_original:>10,}"
+    for encoding in encodings:
+        percent = 100 * totals[encoding] / max(total_original, 1)
+        line += f" {totals[encoding]:>9,} {percent:5.1f}%"
+    print(line)
+
+
+def linked_stylesheets(html: str, base_url: str) -> Set[str]:
+    """
+    List the local stylesheets a page links to.
+
+    Args:
+        html: Page HTML.
+        base_url: Base URL the page was rendered for.
+
+    Returns:
+        Stylesheet paths relative to the output directory.
+    """
+    linked: Set[str] = set()
+    for link in STYLESHEET_LINK.findall(html):
+        href = HREF_ATTRIBUTE.search(link)
+        if href and href.group(1).startswith(base_url):
+            path = href.group(1)[len(base_url):]
+            if '//' not in path:
+                linked.add(path)
+    return linked
+
+
+def repoint_stylesheet(
+    output_path: Path,
+    pages: Dict[Path, str],
+    base_url: str,
+    name: str,
+    pruned_name: str,
+) -> None:
+    """
+    Link pages to a pruned stylesheet instead of its other fingerprints.
+
+    Fingerprinted copies of ``name`` other than the full and the pruned
+    one are stale and are deleted. Pages are rewritten on disk and in
+    ``pages``.
+
+    Args:
+        output_path: Output directory.
+        pages: Page contents keyed by file; updated in place.
+        base_url: Base URL the pages were rendered for.
+        name: Unhashed stylesheet path relative to the output.
+        pruned_name: Fingerprinted name of the pruned stylesheet.
+    """
+    stem, dot, suffix = name.rpartition('.')
+    variant = re.compile(
+        re.escape(stem) + rf'\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}'
+        + re.escape(dot + suffix) + '$'
+    )
+    source = output_path / name
+    full_name = fingerprint_name(name, file_digest(source))
+    for candidate in source.parent.iterdir():
+        relative = candidate.relative_to(output_path).as_posix()
+        if variant.match(relative) and relative not in (
+            full_name, pruned_name
+        ):
+            candidate.unlink()
+
+    page_variant = re.compile(
+        re.escape(base_url) + variant.pattern.rstrip('$')
+    )
+    for page, html in pages.items():
+        updated = page_variant.sub(base_url + pruned_name, html)
+        if updated != html:
+            page.write_text(updated, encoding='utf-8')
+            pages[page] = updated
+
+
+def prune_unused_css(output_path: Path, base_url: str) -> Dict[str, Any]:
+    """
+    Write stylesheets without dead selectors and link every page to them.
+
+    Used classes, ids and element names are collected from every page in
+    the output (not just the ones rendered by this build) and from the
+    scripts they run, including classes toggled from ``main.js`` such as
+    ``active`` on ``nav-menu``. Each linked stylesheet is pruned from its
+    full, unhashed copy and written under its own fingerprint; the full
+    stylesheet stays in the output. A report of removed selectors is
+    written to ``PRUNE_REPORT_NAME``.
+
+    Args:
+        output_path: Output directory.
+        base_url: Base URL the pages were rendered for.
+
+    Returns:
+        The report, keyed by original stylesheet path.
+    """
+    print("\nPruning unused CSS...")
+    pages = {page: page.read_text(encoding='utf-8')
+             for page in sorted(output_path.glob('*.html'))}
+    used = UsedSelectors()
+    linked: Set[str] = set()
+    for html in pages.values():
+        soup = BeautifulSoup(html, 'html.parser')
+        used.add_document(soup)
+        for script in soup.find_all('script'):
+            if script.string:
+                used.add_script(script.string)
+        linked |= {strip_fingerprint(path)
+                   for path in linked_stylesheets(html, base_url)}
+    for script_file in sorted(output_path.glob('static/**/*.js')):
+        used.add_script(script_file.read_text(encoding='utf-8'))
+
+    report: Dict[str, Any] = {}
+    for name in sorted(linked):
+        source = output_path / name
+        if not source.is_file():
+            continue
+        original = source.read_text(encoding='utf-8')
+        rules, dead = prune_rules(parse_stylesheet(original), used)
+        css = serialize_stylesheet(rules) + '\n'
+        digest = hashlib.sha256(css.encode('utf-8')).hexdigest()
+        pruned_name = fingerprint_name(name, digest)
+        pruned_file = output_path / pruned_name
+        if not pruned_file.exists():
+            # The name is content-addressed, so an existing file is
+            # identical (and may be hardlinked to the source)
+            pruned_file.write_text(css, encoding='utf-8')
+
+        repoint_stylesheet(output_path, pages, base_url, name, pruned_name)
+
+        report[name] = {
+            'file': pruned_name,
+            'original_bytes': len(original.encode('utf-8')),
+            'pruned_bytes': len(css.encode('utf-8')),
+            'dead_selectors': dead,
+        }
+        print(
+            f"  ✓ {name}: removed {len(dead)} dead selector(s), "
+            f"{report[name]['original_bytes']:,} -> "
+            f"{report[name]['pruned_bytes']:,} bytes ({pruned_name})"
+        )
+        for selector in dead:
+            print(f"    - {selector}")
+
+    report_file = output_path / PRUNE_REPORT_NAME
+    report_file.write_text(
+        json.dumps(report, indent=2) + '\n', encoding='utf-8'
+    )
+    return report
+
+
+def fold_elements(soup: BeautifulSoup) -> Set[int]:
+    """
+    Find the elements that are visible before the user scrolls.
+
+    The fold is approximated as the navigation and header, the first
+    ``FOLD_BLOCKS`` content blocks of ``<main>``, and all their ancestors.
+
+    Args:
+        soup: Parsed page.
+
+    Returns:
+        ``id()`` of every element above the fold.
+    """
+    roots: List[Tag] = list(soup.find_all(['nav', 'header'], recursive=True))
+    main = soup.find('main')
+    if isinstance(main, Tag):
+        container = main.find(class_='container', recursive=False) or main
+        blocks = [
+            child for child in container.children if isinstance(child, Tag)
+        ]
+        roots.extend(blocks[:FOLD_BLOCKS])
+
+    fold: Set[int] = set()
+    for root in roots:
+        fold.add(id(root))
+        fold.update(id(tag) for tag in root.find_all(True))
+        fold.update(id(parent) for parent in root.parents)
+    return fold
+
+
+def critical_rules(
+    rules: Sequence[CssRule],
+    soup: BeautifulSoup,
+    fold: Set[int],
+    matcher: SelectorMatcher,
+) -> List[CssRule]:
+    """
+    Select the rules that style at least one element above the fold.
+
+    Block at-rules such as ``@media`` are kept with their matching
+    children; ``@font-face`` is always kept; ``@keyframes`` and statement
+    at-rules are left to the full stylesheet.
+
+    Args:
+        rules: Parsed stylesheet.
+        soup: Parsed page.
+        fold: Elements above the fold, from ``fold_elements``.
+        matcher: Selector matcher (shared across pages).
+
+    Returns:
+        The critical subset of ``rules``.
+    """
+    critical: List[CssRule] = []
+    for rule in rules:
+        if rule.is_nested:
+            children = critical_rules(rule.children, soup, fold, matcher)
+            if children:
+                critical.append(
+                    CssRule(prelude=rule.prelude, children=children)
+                )
+        elif rule.prelude:
+            if rule.block and rule.prelude.startswith('@font-face'):
+                critical.append(rule)
+        elif any(
+            id(tag) in fold
+            for selector in rule.selectors
+            for tag in matcher.matches(selector, soup)
+        ):
+            critical.append(rule)
+    return critical
+
+
+def defer_stylesheet(link: str, href: str, css: str) -> str:
+    """
+    Replace a stylesheet link with inline critical CSS and an async load.
+
+    The full stylesheet is preloaded and switched to ``rel=stylesheet``
+    once it arrives; a ``<noscript>`` link covers browsers without JS.
+
+    Args:
+        link: Original ``<link rel="stylesheet">`` tag.
+        href: Stylesheet URL.
+        css: Critical CSS to inline.
+
+    Returns:
+        Replacement HTML.
+    """
+    return (
+        f'<style>{css}</style>\n'
+        f'    <link rel="preload" href="{href}" as="style" '
+        f'onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        f'    <noscript>{link}</noscript>'
+    )
+
+
+def inline_critical_css(
+    output_path: Path, filenames: Sequence[str], base_url: str
+) -> Dict[str, int]:
+    """
+    Inline each page's above-the-fold CSS and defer its stylesheets.
+
+    Args:
+        output_path: Output directory.
+        filenames: Pages (relative to ``output_path``) to process.
+        base_url: Base URL the pages were rendered for; only stylesheets
+            under it are inlined.
+
+    Returns:
+        Size in bytes of the CSS inlined into each page.
+    """
+    if filenames:
+        print("\nInlining critical CSS...")
+    matcher = SelectorMatcher()
+    stylesheets: Dict[Path, List[CssRule]] = {}
+    inlined: Dict[str, int] = {}
+
+    for filename in filenames:
+        page = output_path / filename
+        html = page.read_text(encoding='utf-8')
+        soup = BeautifulSoup(html, 'html.parser')
+        fold = fold_elements(soup)
+        total = 0
+
+        def replace(match: Match[str]) -> str:
+            nonlocal total
+            href_match = HREF_ATTRIBUTE.search(match.group(0))
+            if href_match is None:
+                return match.group(0)
+            href = href_match.group(1)
+            if not href.startswith(base_url) or '//' in href:
+                return match.group(0)
+            css_file = output_path / href[len(base_url):]
+            if not css_file.is_file():
+                return match.group(0)
+            if css_file not in stylesheets:
+                stylesheets[css_file] = parse_stylesheet(
+                    css_file.read_text(encoding='utf-8')
+                )
+            css = serialize_stylesheet(
+                critical_rules(stylesheets[css_file], soup, fold, matcher)
+            )
+            total += len(css.encode('utf-8'))
+            return defer_stylesheet(match.group(0), href, css)
+
+        page.write_text(STYLESHEET_LINK.sub(replace, html), encoding='utf-8')
+        inlined[filename] = total
+        print(f"  ✓ Inlined {total:,} bytes of critical CSS into {filename}")
+    return inlined
+
+
+def page_search_documents(
+    output_path: Path, base_url: str
+) -> List[SearchDocument]:
+    """
+    Extract the searchable text of every rendered page.
+
+    The text of ``<main>`` is indexed under the page title; the 404 page
+    is left out.
+
+    Args:
+        output_path: Output directory.
+        base_url: Base URL the pages were rendered for.
+
+    Returns:
+        One document per page, in file name order.
+    """
+    documents = []
+    for page in sorted(output_path.glob('*.html')):
+        if page.name == '404.html':
+            continue
+        soup = BeautifulSoup(page.read_text(encoding='utf-8'), 'html.parser')
+        main = soup.find('main') or soup.body or soup
+        for element in main.find_all(['script', 'style', 'template']):
+            element.decompose()
+        title = soup.title.get_text(strip=True) if soup.title else page.stem
+        title = title.removesuffix(SITE_TITLE_SUFFIX)
+        url = base_url if page.name == 'index.html' else base_url + page.name
+        documents.append(SearchDocument(
+            title=title,
+            url=url,
+            text=main.get_text(' ', strip=True),
+            kind='Page',
+        ))
+    return documents
+
+
+def resource_search_documents() -> List[SearchDocument]:
+    """
+    Turn every learning resource into a search document.
+
+    Returns:
+        One document per entry of ``get_learning_resources()``, labelled
+        with its category.
+    """
+    documents = []
+    for category, entries in DATA_SOURCES['get_learning_resources']().items():
+        kind = category.replace('_', ' ').title()
+        for entry in entries:
+            documents.append(SearchDocument(
+                title=entry.title,
+                url=entry.url,
+                text=f"{entry.description} {kind} {entry.cost}",
+                kind=kind,
+                summary=entry.description,
+            ))
+    return documents
+
+
+def build_search(output_path: Path, base_url: str) -> Dict[str, int]:
+    """
+    Write the client-side search index and point every page at it.
+
+    The index covers the text of all pages in the output and every
+    learning resource, and is written to ``SEARCH_DIR``. Each page gets
+    a ``<meta name="search-index">`` tag, which is what makes
+    ``main.js`` show the search box.
+
+    Args:
+        output_path: Output directory.
+        base_url: Base URL the pages were rendered for.
+
+    Returns:
+        Counts of documents, terms, shards and bytes written.
+    """
+    print("\nBuilding search index...")
+    documents = page_search_documents(output_path, base_url)
+    documents += resource_search_documents()
+    stats = write_search_index(output_path / SEARCH_DIR, documents)
+
+    meta = (
+        f'<meta name="search-index" '
+        f'content="{base_url}{SEARCH_DIR}/{SEARCH_INDEX_NAME}">'
+    )
+    for page in sorted(output_path.glob('*.html')):
+        html = page.read_text(encoding='utf-8')
+        if 'name="search-index"' not in html and '</head>' in html:
+            head, end, tail = html.partition('</head>')
+            page.write_text(head + meta + '\n' + end + tail, encoding='utf-8')
+
+    print(
+        f"  ✓ Indexed {stats['documents']} document(s): {stats['terms']} "
+        f"term(s) in {stats['shards']} shard(s), {stats['bytes']:,} bytes"
+    )
+    return stats
+
+
+def minify_pages(
+    output_path: Path, filenames: Sequence[str]
+) -> Dict[str, int]:
+    """
+    Minify the HTML of rendered pages in place.
+
+    Args:
+        output_path: Output directory.
+        filenames: Pages (relative to ``output_path``) to minify.
+
+    Returns:
+        Number of bytes saved for each page.
+    """
+    if filenames:
+        print("\nMinifying HTML...")
+    saved: Dict[str, int] = {}
+    for filename in filenames:
+        page = output_path / filename
+        minifier = HTMLMinifier()
+        html = minifier.feed(page.read_text(encoding='utf-8'))
+        html += minifier.close()
+        page.write_text(html, encoding='utf-8')
+        saved[filename] = minifier.bytes_saved
+        print(
+            f"  ✓ {filename}: saved {minifier.bytes_saved:,} of "
+            f"{minifier.bytes_in:,} bytes"
+        )
+    return saved
 
 
 def create_cname_file(output_path: Path) -> None:
@@ -170,9 +1961,273 @@ def create_nojekyll_file(output_path: Path) -> None:
     print(f"✓ Created .nojekyll file to disable Jekyll processing")
 
 
+# Build inputs watched by --watch
+WATCH_PATHS = (
+    'src/templates', 'src/static', 'src/routes.py', 'src/catalog.py',
+)
+
+
+def reload_sources(changed: Set[Path]) -> None:
+    """
+    Re-import edited Python modules before a rebuild.
+
+    ``create_app`` imports ``register_routes`` when it is called, so a
+    reloaded ``routes`` module is picked up by the next build; the route
+    data functions tracked in ``DATA_SOURCES`` are refreshed as well.
+    ``catalog`` is reloaded first so the catalog is built again from the
+    edited data.
+
+    Args:
+        changed: Files changed since the last build.
+
+    Returns:
+        None
+    """
+    if any(path.suffix == '.py' for path in changed):
+        importlib.reload(sys.modules['catalog'])
+        routes_module = importlib.reload(sys.modules['routes'])
+        for name in DATA_SOURCES:
+            DATA_SOURCES[name] = getattr(routes_module, name)
+
+
+def watch_site(
+    build_options: Dict[str, Any],
+    host: str = '127.0.0.1',
+    port: int = 8000,
+    poll: bool = False,
+    debounce: float = 0.1,
+    max_rebuilds: Optional[int] = None,
+) -> None:
+    """
+    Build the site, serve it, and rebuild whenever its sources change.
+
+    Changes under ``WATCH_PATHS`` are collected until they settle for
+    ``debounce`` seconds and then trigger an incremental build, so only
+    the affected pages and static files are rewritten. Pages served by
+    the development server reload themselves after each build.
+
+    Args:
+        build_options: Keyword arguments for ``build_static_site``.
+        host: Interface for the development server.
+        port: Port for the development server.
+        poll: Poll for changes instead of using inotify.
+        debounce: Quiet period in seconds before a rebuild starts.
+        max_rebuilds: Stop after this many rebuilds (None runs until
+            interrupted).
+
+    Returns:
+        None
+    """
+    from watch import LiveReloadServer, create_watcher, wait_for_changes
+
+    root = Path(__file__).parent
+    build_static_site(**build_options)
+    options = dict(build_options, incremental=True)
+
+    watcher = create_watcher(
+        [root / path for path in WATCH_PATHS], poll=poll
+    )
+    server = LiveReloadServer(
+        options.get('output_dir', 'docs'), host=host, port=port,
+        base_url=options.get('base_url', '/'),
+    )
+    server.start()
+    print(
+        f"\nServing {server.url} with live reload; watching "
+        f"{', '.join(WATCH_PATHS)} ({type(watcher).__name__}). "
+        f"Press Ctrl+C to stop."
+    )
+
+    rebuilds = 0
+    try:
+        while max_rebuilds is None or rebuilds < max_rebuilds:
+            changed = wait_for_changes(watcher, debounce)
+            started = time.perf_counter()
+            names = sorted(
+                path.relative_to(root).as_posix()
+                if path.is_relative_to(root) else str(path)
+                for path in changed
+            )
+            print(f"\nChanged: {', '.join(names)}")
+            reload_sources(changed)
+            errors = build_static_site(**options)
+            server.notify()
+            rebuilds += 1
+            elapsed = (time.perf_counter() - started) * 1000
+            status = f", {len(errors)} route error(s)" if errors else ''
+            print(f"↻ Rebuilt in {elapsed:.0f} ms{status}")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+        server.stop()
+
+
+def check_profile(
+    profiler: BuildProfiler,
+    report_path: Optional[str] = None,
+    summary: bool = False,
+    baseline_path: Optional[str] = None,
+    max_regression: float = MAX_REGRESSION,
+) -> List[str]:
+    """
+    Save, print and check the timings of a build.
+
+    Args:
+        profiler: Profiler the build reported to.
+        report_path: Where to write the JSON report, if anywhere.
+        summary: Print the flame-style summary.
+        baseline_path: Report of an earlier build to compare with.
+        max_regression: Allowed slowdown per stage, in percent.
+
+    Returns:
+        Descriptions of the stages that regressed past the limit.
+    """
+    if report_path:
+        profiler.write_report(report_path)
+        print(f"\n✓ Wrote build profile to {report_path}")
+    if summary:
+        print(f"\nBuild profile:\n{profiler.summary()}")
+    if not baseline_path:
+        return []
+
+    regressions = find_regressions(
+        profiler.report(), load_report(baseline_path), max_regression
+    )
+    if regressions:
+        print(f"\n✗ {len(regressions)} stage(s) regressed against "
+              f"{baseline_path}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+    else:
+        print(f"\n✓ No stage regressed more than {max_regression:g}% "
+              f"against {baseline_path}")
+    return regressions
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments for the build script.
+
+    Args:
+        argv: Argument list (defaults to ``sys.argv[1:]``).
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description='Render the Flask app to static HTML files.'
+    )
+    parser.add_argument(
+        'output_dir', nargs='?', default='docs',
+        help="Output directory (default: 'docs')",
+    )
+    parser.add_argument(
+        '--base-url', default='/',
+        help="Base URL for the site (default: '/')",
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Number of worker processes used to render routes (default: 1)',
+    )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='Only re-render routes whose inputs changed since the last build',
+    )
+    parser.add_argument(
+        '--sync', action='store_true',
+        help='Keep the output static directory and only write changed '
+             'static files (implied by --incremental)',
+    )
+    parser.add_argument(
+        '--link', action='store_true',
+        help='Hardlink static files into the output instead of copying them',
+    )
+    parser.add_argument(
+        '--critical-css', action='store_true',
+        help='Inline above-the-fold CSS and load the stylesheet async',
+    )
+    parser.add_argument(
+        '--prune-css', action='store_true',
+        help='Link pages to stylesheets without unused selectors '
+             '(the full stylesheet is kept in the output)',
+    )
+    parser.add_argument(
+        '--minify', action='store_true',
+        help='Minify the HTML of the rendered pages',
+    )
+    parser.add_argument(
+        '--precompress', action='store_true',
+        help='Write .gz and .br sidecars for text files in the output',
+    )
+    parser.add_argument(
+        '--no-search', dest='search_index', action='store_false',
+        help='Do not build the client-side search index',
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help='Serve the output with live reload and rebuild on changes',
+    )
+    parser.add_argument(
+        '--port', type=int, default=8000,
+        help='Port for the --watch server (default: 8000)',
+    )
+    parser.add_argument(
+        '--poll', action='store_true',
+        help='Poll for changes instead of using inotify with --watch',
+    )
+    parser.add_argument(
+        '--profile', metavar='REPORT',
+        help='Write stage and per-route timings to a JSON report',
+    )
+    parser.add_argument(
+        '--profile-summary', action='store_true',
+        help='Print a flame-style summary of the build timings',
+    )
+    parser.add_argument(
+        '--baseline', metavar='REPORT',
+        help='Compare the timings with a saved --profile report',
+    )
+    parser.add_argument(
+        '--max-regression', type=float, default=MAX_REGRESSION,
+        metavar='PERCENT',
+        help='Fail if a stage is this much slower than the baseline '
+             f'(default: {MAX_REGRESSION:g})',
+    )
+    parser.add_argument(
+        '--compress-threshold', type=int, default=COMPRESS_THRESHOLD,
+        help='Minimum file size in bytes to precompress '
+             f'(default: {COMPRESS_THRESHOLD})',
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-    # Check if custom output directory specified
-    output_dir = sys.argv[1] if len(sys.argv) > 1 else 'docs'
-    
+    args = parse_args()
+
+    build_options = dict(
+        output_dir=args.output_dir,
+        base_url=args.base_url,
+        jobs=args.jobs,
+        incremental=args.incremental,
+        precompress=args.precompress,
+        compress_threshold=args.compress_threshold,
+        critical_css=args.critical_css,
+        prune_css=args.prune_css,
+        minify=args.minify,
+        sync=args.sync,
+        link=args.link,
+        search_index=args.search_index,
+    )
+    if args.watch:
+        watch_site(build_options, port=args.port, poll=args.poll)
+        sys.exit(0)
+
     # Build the static site
-    build_static_site(output_dir=output_dir)
+    profiler = BuildProfiler()
+    errors = build_static_site(**build_options, profiler=profiler)
+    regressions = check_profile(
+        profiler, args.profile, args.profile_summary, args.baseline,
+        args.max_regression,
+    )
+    sys.exit(1 if errors or regressions else 0)
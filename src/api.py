@@ -0,0 +1,425 @@
+"""
+JSON API for querying the learning resource catalog.
+
+``GET /api/resources`` filters the catalog by ``category``, ``platform``,
+``level`` and ``cost``. Each field has a precomputed index from value to
+the sorted ids of the matching entries, so a query walks the shortest
+posting list and checks the other filters per candidate instead of
+scanning the catalog. Results are paged with opaque cursors and carry an
+``ETag`` derived from the catalog version and the query, so unchanged
+pages are revalidated without building the response body.
+"""
+
+import base64
+import binascii
+import hashlib
+import heapq
+import json
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from flask import Flask, Response, current_app, jsonify, request
+
+from catalog import Resource, load_catalog
+
+# Fields that can be filtered on
+FIELDS = ("category", "platform", "level", "cost")
+
+# Page size used when the request does not set ``limit``, and its maximum
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Number of distinct filter sets whose match counts are remembered
+COUNT_CACHE_SIZE = 1024
+
+# Filters: field name -> accepted (case-folded) values
+Filters = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+class QueryError(ValueError):
+    """Raised for invalid query parameters or cursors."""
+
+
+def normalize(value: Optional[str]) -> str:
+    """
+    Fold a field value for case-insensitive matching.
+
+    Args:
+        value: Field value, or None for a missing value.
+
+    Returns:
+        The case-folded value ("" for missing values).
+    """
+    return value.casefold() if value else ""
+
+
+class ResourceIndex:
+    """
+    Catalog entries with a posting-list index per filterable field.
+
+    Entry ids are positions in catalog order. For each field the index
+    maps every value to an ``array`` of ids in ascending order, and a
+    per-entry array of value codes answers "does entry N match" checks
+    without touching the records.
+
+    Args:
+        entries: (category, resource) pairs in catalog order.
+
+    Example:
+        >>> index = ResourceIndex.from_catalog()
+        >>> ids, cursor = index.query((("level", ("beginner",)),), limit=5)
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Resource]]) -> None:
+        """Index the entries."""
+        categories: List[str] = []
+        resources: List[Resource] = []
+        for category, resource in entries:
+            categories.append(category)
+            resources.append(resource)
+        self.categories = tuple(categories)
+        self.resources = tuple(resources)
+
+        self.postings: Dict[str, Dict[str, array]] = {}
+        self._codes: Dict[str, array] = {}
+        self._values: Dict[str, Dict[str, int]] = {}
+        for field in FIELDS:
+            values: Dict[str, int] = {}
+            codes = array("I")
+            postings: Dict[str, array] = {}
+            for entry_id in range(len(self.resources)):
+                value = normalize(self.field(entry_id, field))
+                code = values.setdefault(value, len(values))
+                codes.append(code)
+                if value:
+                    postings.setdefault(value, array("I")).append(entry_id)
+            self.postings[field] = postings
+            self._codes[field] = codes
+            self._values[field] = values
+        # Changes whenever the catalog does, which invalidates cursors
+        # and ETags
+        self.version = hashlib.sha256(
+            repr((self.categories, self.resources)).encode("utf-8")
+        ).hexdigest()[:16]
+        self._counts: Dict[Filters, int] = {}
+
+    @classmethod
+    def from_catalog(cls) -> "ResourceIndex":
+        """
+        Index the learning resources of the catalog.
+
+        Returns:
+            An index over every resource, in category order.
+        """
+        return cls(
+            (category, resource)
+            for category, resources in load_catalog().resources.items()
+            for resource in resources
+        )
+
+    def __len__(self) -> int:
+        """Number of indexed entries."""
+        return len(self.resources)
+
+    def field(self, entry_id: int, field: str) -> Optional[str]:
+        """
+        Get the raw value of a field of an entry.
+
+        Args:
+            entry_id: Entry id.
+            field: One of ``FIELDS``.
+
+        Returns:
+            The value, or None if the entry does not have one.
+        """
+        if field == "category":
+            return self.categories[entry_id]
+        value: Optional[str] = getattr(self.resources[entry_id], field)
+        return value
+
+    def to_json(self, entry_id: int) -> Dict[str, Any]:
+        """
+        Describe an entry for the API.
+
+        Args:
+            entry_id: Entry id.
+
+        Returns:
+            The entry's id, category and resource fields.
+        """
+        resource = self.resources[entry_id]
+        return {
+            "id": entry_id,
+            "category": self.categories[entry_id],
+            "title": resource.title,
+            "description": resource.description,
+            "url": resource.url,
+            "cost": resource.cost,
+            "platform": resource.platform,
+            "level": resource.level,
+        }
+
+    def _candidates(self, filters: Filters, after: int) -> Iterator[int]:
+        """Yield ids matching every filter, in ascending order."""
+        if not filters:
+            yield from range(after + 1, len(self.resources))
+            return
+
+        # Drive the scan with the field whose values have fewest entries
+        lists = {
+            field: [
+                self.postings[field].get(value, array("I"))
+                for value in values
+            ]
+            for field, values in filters
+        }
+        driver = min(lists, key=lambda field: sum(map(len, lists[field])))
+        checks = [
+            (
+                self._codes[field],
+                {
+                    self._values[field][value]
+                    for value in values
+                    if value in self._values[field]
+                },
+            )
+            for field, values in filters
+            if field != driver
+        ]
+        runs = [
+            postings[bisect_right(postings, after):]
+            for postings in lists[driver]
+        ]
+        ids = runs[0] if len(runs) == 1 else heapq.merge(*runs)
+        for entry_id in ids:
+            if all(codes[entry_id] in wanted for codes, wanted in checks):
+                yield entry_id
+
+    def query(
+        self, filters: Filters, limit: int = DEFAULT_LIMIT, after: int = -1
+    ) -> Tuple[List[int], Optional[int]]:
+        """
+        Find a page of entries matching all filters.
+
+        Args:
+            filters: Accepted values per field; an entry matches when, for
+                every field, its value is one of the accepted ones.
+            limit: Maximum number of ids returned.
+            after: Only return ids greater than this one.
+
+        Returns:
+            The matching ids, and the id to resume after for the next
+            page (None when this is the last page).
+        """
+        ids: List[int] = []
+        for entry_id in self._candidates(filters, after):
+            if len(ids) == limit:
+                return ids, ids[-1]
+            ids.append(entry_id)
+        return ids, None
+
+    def count(self, filters: Filters) -> int:
+        """
+        Count the entries matching all filters.
+
+        Args:
+            filters: Accepted values per field.
+
+        Returns:
+            Number of matching entries. Counts that need a scan are
+            remembered per filter set.
+        """
+        if not filters:
+            return len(self.resources)
+        if len(filters) == 1:
+            field, values = filters[0]
+            return sum(
+                len(self.postings[field].get(value, ())) for value in values
+            )
+        count = self._counts.get(filters)
+        if count is None:
+            count = sum(1 for _ in self._candidates(filters, -1))
+            if len(self._counts) >= COUNT_CACHE_SIZE:
+                self._counts.clear()
+            self._counts[filters] = count
+        return count
+
+
+def parse_filters(args: Any) -> Filters:
+    """
+    Read the field filters from request arguments.
+
+    A field may be given several times to accept any of the values.
+
+    Args:
+        args: Request arguments (a ``MultiDict``).
+
+    Returns:
+        Case-folded accepted values per field, in a canonical order.
+    """
+    return tuple(
+        (field, tuple(sorted({normalize(value) for value in values})))
+        for field in FIELDS
+        if (values := args.getlist(field))
+    )
+
+
+def query_digest(index: ResourceIndex, filters: Filters) -> str:
+    """
+    Fingerprint a query against a version of the index.
+
+    Args:
+        index: Index being queried.
+        filters: Parsed filters.
+
+    Returns:
+        Short hex digest tying cursors and ETags to the query.
+    """
+    key = json.dumps([index.version, filters], separators=(",", ":"))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(after: int, digest: str) -> str:
+    """
+    Build an opaque cursor.
+
+    Args:
+        after: Id of the last entry on the current page.
+        digest: ``query_digest`` of the query.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    raw = f"{after}:{digest}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, digest: str) -> int:
+    """
+    Read a cursor made by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor from a previous response.
+        digest: ``query_digest`` of the current query.
+
+    Returns:
+        Id of the last entry already returned.
+
+    Raises:
+        QueryError: If the cursor is malformed, or belongs to another
+            query or catalog version.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        after, cursor_digest = raw.decode("ascii").split(":")
+        entry_id = int(after)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise QueryError("Invalid cursor") from None
+    if cursor_digest != digest:
+        raise QueryError("Cursor does not match this query")
+    return entry_id
+
+
+def parse_limit(value: Optional[str]) -> int:
+    """
+    Read the page size.
+
+    Args:
+        value: ``limit`` request argument.
+
+    Returns:
+        The page size.
+
+    Raises:
+        QueryError: If it is not an integer from 1 to ``MAX_LIMIT``.
+    """
+    if value is None:
+        return DEFAULT_LIMIT
+    # isdigit() also accepts digits such as "²" that int() rejects
+    if (
+        not (value.isascii() and value.isdecimal())
+        or not 1 <= int(value) <= MAX_LIMIT
+    ):
+        raise QueryError(f"limit must be an integer from 1 to {MAX_LIMIT}")
+    return int(value)
+
+
+def get_resource_index(app: Flask) -> ResourceIndex:
+    """
+    Get the index an application serves, building it on first use.
+
+    Args:
+        app: Flask application.
+
+    Returns:
+        ``app.extensions["resource_index"]``, which defaults to an index
+        of the catalog.
+    """
+    index: Optional[ResourceIndex] = app.extensions.get("resource_index")
+    if index is None:
+        index = app.extensions.setdefault(
+            "resource_index", ResourceIndex.from_catalog()
+        )
+    return index
+
+
+def register_api(app: Flask) -> None:
+    """
+    Register the JSON API routes.
+
+    Args:
+        app: Flask application instance.
+    """
+
+    @app.route("/api/resources")
+    def api_resources() -> Any:
+        """
+        Query the learning resources.
+
+        Query parameters are the ``FIELDS`` filters, ``limit`` and
+        ``cursor`` (the ``next_cursor`` of the previous page).
+
+        Returns:
+            JSON with the page of ``results``, the total ``count`` and
+            ``next_cursor``, or a JSON error with status 400.
+        """
+        index = get_resource_index(current_app)
+        unknown = set(request.args) - {*FIELDS, "limit", "cursor"}
+        try:
+            if unknown:
+                raise QueryError(
+                    f"Unknown parameter: {', '.join(sorted(unknown))}"
+                )
+            filters = parse_filters(request.args)
+            limit = parse_limit(request.args.get("limit"))
+            digest = query_digest(index, filters)
+            cursor = request.args.get("cursor")
+            after = decode_cursor(cursor, digest) if cursor else -1
+        except QueryError as error:
+            return jsonify(error=str(error)), 400
+
+        # The page only depends on the catalog version and the query, so
+        # a matching ETag is answered before running the query
+        etag = f"{digest}-{after}-{limit}"
+        # Weak comparison, as compressed responses carry a weak ETag
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        ids, resume = index.query(filters, limit, after)
+        response = jsonify(
+            count=index.count(filters),
+            limit=limit,
+            next_cursor=(
+                encode_cursor(resume, digest) if resume is not None else None
+            ),
+            results=[index.to_json(entry_id) for entry_id in ids],
+        )
+        response.set_etag(etag)
+        # Every query string would get its own page cache entry and push
+        # pages out; the ETag check above already answers revalidation
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
@@ -6,13 +6,30 @@ and integrates all routes for the GitHub Copilot demonstration.
 """
 
 import os
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict
 
 from flask import Flask, render_template
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+
+@lru_cache(maxsize=None)
+def load_environment() -> None:
+    """
+    Load variables from the nearest ``.env`` file, once per process.
+
+    The file is looked up from this module's directory upwards, like
+    ``load_dotenv()`` does, but python-dotenv is only imported when a
+    file exists. Variables already set in the environment take priority.
+    """
+    here = Path(__file__).resolve().parent
+    for directory in (here, *here.parents):
+        env_file = directory / ".env"
+        if env_file.is_file():
+            from dotenv import load_dotenv
+
+            load_dotenv(env_file)
+            return
 
 
 def create_app(config: Dict[str, Any] | None = None) -> Flask:
@@ -29,25 +46,109 @@ def create_app(config: Dict[str, Any] | None = None) -> Flask:
         >>> app = create_app()
         >>> app.run()
     """
+    load_environment()
     app = Flask(__name__)
 
     # Default configuration
     default_secret = "dev-secret-key-change-in-production"
+    debug = os.getenv("FLASK_DEBUG", "False").lower() == "true"
     app.config.update(
         SECRET_KEY=os.getenv("SECRET_KEY", default_secret),
-        DEBUG=os.getenv("FLASK_DEBUG", "False").lower() == "true",
+        DEBUG=debug,
         TESTING=False,
+        # Serve static files under content-hashed names (off while
+        # debugging so edited assets are picked up without a restart)
+        ASSET_FINGERPRINTING=not debug,
+        # Minify text/html responses in an after_request filter
+        MINIFY_HTML=os.getenv("MINIFY_HTML", "False").lower() == "true",
+        # Number of rendered pages kept in memory (0 disables the cache;
+        # off while debugging so edited templates show up)
+        PAGE_CACHE_SIZE=int(
+            os.getenv("PAGE_CACHE_SIZE", "0" if debug else "256")
+        ),
+        # Compress text responses with brotli or gzip, and keep the
+        # compressed bodies of shareable responses for reuse
+        COMPRESSION=os.getenv("COMPRESSION", "True").lower() == "true",
+        COMPRESSION_GZIP_LEVEL=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+        COMPRESSION_BROTLI_QUALITY=int(
+            os.getenv("COMPRESSION_BROTLI_QUALITY", "5")
+        ),
+        COMPRESSION_MIN_SIZE=int(os.getenv("COMPRESSION_MIN_SIZE", "500")),
+        # Share compiled templates between workers through the
+        # filesystem (None uses Jinja's per-user temp directory)
+        TEMPLATE_BYTECODE_CACHE=(
+            os.getenv("TEMPLATE_BYTECODE_CACHE", str(not debug)).lower()
+            == "true"
+        ),
+        TEMPLATE_BYTECODE_CACHE_DIR=os.getenv("TEMPLATE_BYTECODE_CACHE_DIR"),
+        # Compile every template before returning the app
+        PREWARM_TEMPLATES=(
+            os.getenv("PREWARM_TEMPLATES", "False").lower() == "true"
+        ),
+        # Endpoints whose pages are streamed while they render, so the
+        # head and navigation reach the browser first
+        STREAMED_PAGES=tuple(
+            endpoint.strip()
+            for endpoint in os.getenv(
+                "STREAMED_PAGES", "tutorials,copilot_integration"
+            ).split(",")
+            if endpoint.strip()
+        ),
+        # Build the /search index before returning the app instead of
+        # on the first search
+        SEARCH_PREWARM=os.getenv("SEARCH_PREWARM", "False").lower() == "true",
+        # Threads rendering requests under ASGI (0: based on the CPU count)
+        ASGI_THREADS=int(os.getenv("ASGI_THREADS", "0")),
     )
 
     # Override with custom config if provided
     if config:
         app.config.update(config)
 
+    if app.config["TEMPLATE_BYTECODE_CACHE"]:
+        from template_cache import init_bytecode_cache
+
+        init_bytecode_cache(app, app.config["TEMPLATE_BYTECODE_CACHE_DIR"])
+
+    # Set up first so the cache stores the output of later filters
+    if app.config["PAGE_CACHE_SIZE"] > 0:
+        from cache import init_page_cache
+
+        init_page_cache(app)
+
+    # Wraps the page cache so cached pages are compressed as well
+    if app.config["COMPRESSION"]:
+        from compress import init_compression
+
+        init_compression(app)
+
+    if app.config["ASSET_FINGERPRINTING"]:
+        from assets import init_asset_fingerprinting
+
+        init_asset_fingerprinting(app)
+
+    if app.config["MINIFY_HTML"]:
+        from minify import init_html_minifier
+
+        init_html_minifier(app)
+
     # Register routes
     from routes import register_routes
 
     register_routes(app)
 
+    from api import register_api
+
+    register_api(app)
+
+    from export import register_export
+
+    register_export(app)
+
+    from fulltext import init_site_search
+
+    site_search = init_site_search(app)
+
     # Register error handlers
     @app.errorhandler(404)
     def not_found_error(error: Any) -> tuple[str, int]:
@@ -59,6 +160,14 @@ def create_app(config: Dict[str, Any] | None = None) -> Flask:
         """Handle 500 errors."""
         return render_template("500.html"), 500
 
+    if app.config["PREWARM_TEMPLATES"]:
+        from template_cache import prewarm_templates
+
+        prewarm_templates(app)
+
+    if app.config["SEARCH_PREWARM"]:
+        site_search.refresh()
+
     return app
 
 
@@ -0,0 +1,288 @@
+"""
+ASGI entry point.
+
+``ASGIAdapter`` serves a WSGI application, such as the Flask app from
+``create_app()``, to an ASGI server. The event loop only moves bytes:
+each request is handed to a bounded thread pool, where the WSGI app runs
+and renders its templates, and response chunks are passed back to the
+loop as they are produced, so streamed pages and exports keep streaming.
+At most ``ASGI_THREADS`` requests run at once; the others wait on the
+event loop without tying up a thread.
+
+Run it with any ASGI server, for example::
+
+    uvicorn --factory asgi:create_asgi_app --app-dir src
+"""
+
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+
+from app import create_app
+
+# ASGI callables
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Coroutine[Any, Any, None]]
+
+# Default number of threads running the WSGI application
+DEFAULT_THREADS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class ClientDisconnected(Exception):
+    """Raised in a worker thread when the client has gone away."""
+
+
+class ResponseWriter:
+    """
+    Pass a WSGI response from a worker thread to an ASGI connection.
+
+    Each message is handed to the event loop and the thread waits until
+    it has been sent, which bounds the data buffered per request.
+
+    Args:
+        send: ASGI send callable.
+        loop: Event loop the connection belongs to.
+    """
+
+    def __init__(self, send: Send, loop: asyncio.AbstractEventLoop) -> None:
+        """Prepare to send one response."""
+        self.send = send
+        self.loop = loop
+        self.start: Optional[Message] = None
+        self.started = False
+
+    def start_response(
+        self, status: str, headers: List[Any], exc_info: Any = None
+    ) -> Callable[[bytes], None]:
+        """WSGI ``start_response``; the start message waits for the body."""
+        if exc_info is not None and self.started:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.start = {
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ],
+        }
+        return self.write
+
+    def write(self, data: bytes) -> None:
+        """WSGI ``write`` callable."""
+        self.send_body(data, more=True)
+
+    def send_body(self, data: bytes, more: bool) -> None:
+        """
+        Send a piece of the body, after the start message if needed.
+
+        Args:
+            data: Body bytes.
+            more: Whether more body follows.
+        """
+        if not self.started:
+            if self.start is None:
+                raise RuntimeError("start_response was not called")
+            self.send_message(self.start)
+            self.started = True
+        self.send_message(
+            {"type": "http.response.body", "body": data, "more_body": more}
+        )
+
+    def send_message(self, message: Message) -> None:
+        """
+        Send a message on the event loop and wait until it is sent.
+
+        Raises:
+            ClientDisconnected: If the client has gone away.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.send(message), self.loop
+        )
+        try:
+            future.result()
+        except OSError as error:
+            raise ClientDisconnected() from error
+
+
+def build_environ(scope: Scope, body: bytes) -> Dict[str, Any]:
+    """
+    Translate an ASGI HTTP scope into a WSGI environment.
+
+    Args:
+        scope: ASGI ``http`` connection scope.
+        body: Complete request body.
+
+    Returns:
+        The WSGI environment.
+    """
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    environ: Dict[str, Any] = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", ()):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            if name == "CONTENT_TYPE":
+                environ[name] = value
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class ASGIAdapter:
+    """
+    Serve a WSGI application over ASGI from a bounded thread pool.
+
+    Args:
+        wsgi_app: WSGI application to serve.
+        max_threads: Number of requests handled concurrently.
+
+    Example:
+        >>> adapter = ASGIAdapter(create_app(), max_threads=8)
+    """
+
+    def __init__(
+        self, wsgi_app: Callable[..., Any], max_threads: int = DEFAULT_THREADS
+    ) -> None:
+        """Wrap a WSGI application."""
+        self.wsgi_app = wsgi_app
+        self.max_threads = max_threads
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="asgi"
+        )
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Handle an ASGI connection."""
+        if scope["type"] == "http":
+            await self.handle_http(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self.handle_lifespan(receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def handle_lifespan(self, receive: Receive, send: Send) -> None:
+        """Acknowledge startup and shut the thread pool down on shutdown."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def handle_http(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """
+        Run one request through the WSGI application.
+
+        Args:
+            scope: ASGI ``http`` scope.
+            receive: Receives the request body.
+            send: Sends the response.
+        """
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        environ = build_environ(scope, b"".join(chunks))
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_threads)
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            await loop.run_in_executor(
+                self.executor, self.run_wsgi, environ, send, loop
+            )
+
+    def run_wsgi(
+        self,
+        environ: Dict[str, Any],
+        send: Send,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """
+        Call the WSGI application in a worker thread.
+
+        Args:
+            environ: WSGI environment.
+            send: ASGI send callable.
+            loop: Event loop the connection belongs to.
+        """
+        writer = ResponseWriter(send, loop)
+        app_iter: Iterable[bytes] = self.wsgi_app(
+            environ, writer.start_response
+        )
+        try:
+            for chunk in app_iter:
+                if chunk:
+                    writer.send_body(chunk, more=True)
+            writer.send_body(b"", more=False)
+        except ClientDisconnected:
+            pass
+        finally:
+            close = getattr(app_iter, "close", None)
+            if close is not None:
+                close()
+
+
+def create_asgi_app(config: Optional[Dict[str, Any]] = None) -> ASGIAdapter:
+    """
+    Create the Flask application and wrap it for ASGI servers.
+
+    Args:
+        config: Configuration overrides passed to ``create_app``.
+            ``ASGI_THREADS`` sets the size of the thread pool.
+
+    Returns:
+        The ASGI application.
+    """
+    app = create_app(config)
+    return ASGIAdapter(
+        app, max_threads=app.config.get("ASGI_THREADS") or DEFAULT_THREADS
+    )
@@ -0,0 +1,202 @@
+"""
+Content-hashed static asset fingerprinting.
+
+This module maps static files to fingerprinted names that embed a digest
+of their contents (``css/style.css`` -> ``css/style.<hash>.css``). Because
+a fingerprinted URL changes whenever the file changes, responses for it
+can be cached forever by browsers and CDNs.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from flask import Flask, Response
+
+# Number of hex digits of the SHA-256 digest kept in fingerprinted names
+FINGERPRINT_LENGTH = 12
+
+# Matches the digest that fingerprint_name inserts into a file name
+FINGERPRINT_PATTERN = re.compile(
+    rf"\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}(?=\.[^./]+$|$)"
+)
+
+# Name of the manifest written next to the static files by the build
+MANIFEST_NAME = "asset-manifest.json"
+
+# Cache lifetime for fingerprinted assets (one year)
+IMMUTABLE_MAX_AGE = 31536000
+
+
+def fingerprint_name(name: str, digest: str) -> str:
+    """
+    Insert a content digest into a static file name.
+
+    Args:
+        name: Static file path relative to the static folder.
+        digest: Hex digest of the file contents.
+
+    Returns:
+        Fingerprinted file path.
+
+    Example:
+        >>> fingerprint_name("css/style.css", "0123456789abcdef")
+        'css/style.0123456789ab.css'
+    """
+    path, dot, suffix = name.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{name}.{digest[:FINGERPRINT_LENGTH]}"
+    return f"{path}.{digest[:FINGERPRINT_LENGTH]}.{suffix}"
+
+
+def strip_fingerprint(name: str) -> str:
+    """
+    Recover the original static file path from a fingerprinted path.
+
+    Args:
+        name: Static file path, fingerprinted or not.
+
+    Returns:
+        The path without its content digest.
+
+    Example:
+        >>> strip_fingerprint("css/style.0123456789ab.css")
+        'css/style.css'
+    """
+    return FINGERPRINT_PATTERN.sub("", name, count=1)
+
+
+def build_asset_manifest(static_dir: Path) -> Dict[str, str]:
+    """
+    Fingerprint every file in a static folder.
+
+    Args:
+        static_dir: Static folder to scan.
+
+    Returns:
+        Mapping of static file path to its fingerprinted path.
+    """
+    manifest: Dict[str, str] = {}
+    if not static_dir.is_dir():
+        return manifest
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file() or path.name == MANIFEST_NAME:
+            continue
+        name = path.relative_to(static_dir).as_posix()
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        manifest[name] = fingerprint_name(name, digest)
+    return manifest
+
+
+def write_asset_manifest(static_dir: Path, manifest: Dict[str, str]) -> Path:
+    """
+    Write an asset manifest as JSON into a static folder.
+
+    Args:
+        static_dir: Static folder the manifest describes.
+        manifest: Mapping of static file path to its fingerprinted path.
+
+    Returns:
+        Path of the written manifest file.
+    """
+    manifest_file = static_dir / MANIFEST_NAME
+    manifest_file.write_text(
+        json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+    return manifest_file
+
+
+class AssetManifest(Mapping[str, str]):
+    """
+    Asset manifest of a static folder, built when first used.
+
+    Hashing the static files is left to the first request that links to
+    or serves one, so creating an app stays cheap.
+
+    Args:
+        static_dir: Static folder to fingerprint.
+    """
+
+    def __init__(self, static_dir: Path) -> None:
+        """Create a manifest that has not been built yet."""
+        self.static_dir = static_dir
+        self._manifest: Optional[Dict[str, str]] = None
+        self._originals: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        """Build the manifest on first use."""
+        if self._manifest is None:
+            with self._lock:
+                if self._manifest is None:
+                    manifest = build_asset_manifest(self.static_dir)
+                    self._originals = {
+                        hashed: name for name, hashed in manifest.items()
+                    }
+                    self._manifest = manifest
+        return self._manifest
+
+    def __getitem__(self, name: str) -> str:
+        """Get the fingerprinted path of a static file."""
+        return self._load()[name]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the static file paths."""
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        """Number of static files."""
+        return len(self._load())
+
+    def original(self, hashed: str) -> Optional[str]:
+        """
+        Get the static file a fingerprinted path refers to.
+
+        Args:
+            hashed: Fingerprinted path.
+
+        Returns:
+            The original path, or None if ``hashed`` is not fingerprinted.
+        """
+        self._load()
+        return self._originals.get(hashed)
+
+
+def init_asset_fingerprinting(app: Flask) -> None:
+    """
+    Serve static files under fingerprinted names.
+
+    ``url_for('static', filename=...)`` resolves through the asset manifest
+    to the fingerprinted name, and requests for fingerprinted names are
+    served from the original file with an immutable ``Cache-Control``.
+    Requests for the original names keep working with default caching.
+
+    Args:
+        app: Flask application with a static folder.
+    """
+    manifest = AssetManifest(Path(app.static_folder or ""))
+    app.extensions["asset_manifest"] = manifest
+
+    @app.url_defaults
+    def fingerprint_static_url(endpoint: str, values: Dict[str, Any]) -> None:
+        """Point static URLs at the fingerprinted file name."""
+        if endpoint == "static" and values.get("filename") in manifest:
+            values["filename"] = manifest[values["filename"]]
+
+    def fingerprinted_static(filename: str) -> Response:
+        """Serve a static file, caching fingerprinted names forever."""
+        original = manifest.original(filename)
+        if original is None:
+            return app.send_static_file(filename)
+
+        response = app.send_static_file(original)
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions["static"] = fingerprinted_static
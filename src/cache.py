@@ -0,0 +1,360 @@
+"""
+In-process cache of rendered pages.
+
+Pages only change on deploy, so the first response for each URL is kept
+in a bounded LRU cache and replayed for later requests. Cached responses
+carry a strong ``ETag`` and a ``Last-Modified`` date, and conditional
+requests get a ``304 Not Modified``. Hits are answered by a WSGI
+middleware before Flask dispatches the request, so they never reach
+routing, the view or Jinja.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from flask import Flask, Response, request
+
+# Default number of pages kept
+PAGE_CACHE_SIZE = 256
+
+# Largest streamed page that is collected for the cache while it is sent
+MAX_STREAMED_PAGE = 1024 * 1024
+
+CacheKey = Tuple[str, str, Tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    """
+    A stored response.
+
+    Attributes:
+        body: Response body.
+        status: HTTP status code.
+        headers: Response headers, including ``ETag`` and
+            ``Last-Modified``.
+    """
+
+    body: bytes
+    status: int
+    headers: Tuple[Tuple[str, str], ...]
+
+    def to_response(self, environ: dict) -> Response:
+        """
+        Build the response for a request.
+
+        Args:
+            environ: WSGI environment of the request.
+
+        Returns:
+            The stored response, or a 304 if the request's
+            ``If-None-Match``/``If-Modified-Since`` headers match.
+        """
+        response = Response(self.body, self.status, list(self.headers))
+        response.make_conditional(environ)
+        return response
+
+
+class PageCache:
+    """
+    Thread-safe LRU cache of rendered pages.
+
+    Args:
+        max_entries: Number of pages kept; the least recently used page
+            is dropped when a new one is stored.
+        vary: Request headers whose values select separate cache entries.
+
+    Example:
+        >>> cache = PageCache(max_entries=2)
+        >>> cache.invalidate()  # after deploying new templates or data
+    """
+
+    def __init__(
+        self, max_entries: int = PAGE_CACHE_SIZE, vary: Sequence[str] = ()
+    ) -> None:
+        """Create an empty cache."""
+        self.max_entries = max_entries
+        self.vary = tuple(vary)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, CachedPage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._environ_vary = tuple(
+            "HTTP_" + name.upper().replace("-", "_") for name in self.vary
+        )
+
+    def __len__(self) -> int:
+        """Number of cached pages."""
+        return len(self._entries)
+
+    def key(self, environ: dict) -> CacheKey:
+        """
+        Get the cache key of a request.
+
+        Args:
+            environ: WSGI environment of the request.
+
+        Returns:
+            Key made of the path, the query string and the values of the
+            ``vary`` headers.
+        """
+        return (
+            environ.get("PATH_INFO", ""),
+            environ.get("QUERY_STRING", ""),
+            tuple(environ.get(name, "") for name in self._environ_vary),
+        )
+
+    def get(self, key: CacheKey) -> Optional[CachedPage]:
+        """
+        Look up a page and mark it as recently used.
+
+        Args:
+            key: Cache key from ``key``.
+
+        Returns:
+            The cached page, or None.
+        """
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key: CacheKey, page: CachedPage) -> None:
+        """
+        Store a page, evicting the least recently used one if full.
+
+        Args:
+            key: Cache key from ``key``.
+            page: Page to store.
+        """
+        with self._lock:
+            self._entries[key] = page
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: Optional[str] = None) -> int:
+        """
+        Drop cached pages, e.g. after templates or route data changed.
+
+        Args:
+            path: Only drop the entries for this URL path (all variants
+                and query strings); None drops everything.
+
+        Returns:
+            Number of entries dropped.
+        """
+        with self._lock:
+            if path is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            stale = [key for key in self._entries if key[0] == path]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+
+class PageCacheMiddleware:
+    """
+    WSGI middleware that answers ``GET``/``HEAD`` requests from the cache.
+
+    Args:
+        wsgi_app: Application to call on a miss.
+        cache: Cache to read.
+    """
+
+    def __init__(self, wsgi_app: Callable[..., Any], cache: PageCache) -> None:
+        """Wrap a WSGI application."""
+        self.wsgi_app = wsgi_app
+        self.cache = cache
+
+    def __call__(
+        self, environ: dict, start_response: Callable[..., Any]
+    ) -> Iterable[bytes]:
+        """Serve a cached page or pass the request on."""
+        if environ.get("REQUEST_METHOD") in ("GET", "HEAD"):
+            page = self.cache.get(self.cache.key(environ))
+            if page is not None:
+                return page.to_response(environ)(environ, start_response)
+        app_iter: Iterable[bytes] = self.wsgi_app(environ, start_response)
+        return app_iter
+
+
+def is_cacheable(response: Response) -> bool:
+    """
+    Tell whether a response can be replayed to other clients.
+
+    Args:
+        response: Response to a ``GET`` or ``HEAD`` request.
+
+    Returns:
+        True for ``200`` responses that set no cookie and do not forbid
+        shared caching. Streamed responses qualify only if they are HTML
+        pages.
+    """
+    return (
+        response.status_code == 200
+        and (not response.is_streamed or response.mimetype == "text/html")
+        and not response.direct_passthrough
+        and "Set-Cookie" not in response.headers
+        and not response.cache_control.no_store
+        and not response.cache_control.private
+    )
+
+
+def make_page(body: bytes, response: Response) -> CachedPage:
+    """
+    Build the cache entry for a response.
+
+    Args:
+        body: Complete response body.
+        response: Response whose status and headers are stored.
+
+    Returns:
+        The page to cache.
+    """
+    headers: List[Tuple[str, str]] = [
+        (name, value)
+        for name, value in response.headers.items()
+        if name.lower() != "content-length"
+    ]
+    return CachedPage(body, response.status_code, tuple(headers))
+
+
+def store_when_sent(
+    cache: PageCache, key: CacheKey, response: Response
+) -> Iterator[bytes]:
+    """
+    Pass a streamed body through and cache it once it is fully sent.
+
+    The body is only stored if the client received all of it and it is
+    at most ``MAX_STREAMED_PAGE`` bytes. The stored copy gets an ``ETag``
+    so later requests can be revalidated.
+
+    Args:
+        cache: Cache to store the page in.
+        key: Cache key of the request.
+        response: Streamed response whose body is passed through.
+
+    Returns:
+        Iterator over the body chunks, encoded as UTF-8, to use as the
+        new response body.
+    """
+    body = response.response
+
+    def generate() -> Iterator[bytes]:
+        chunks: Optional[List[bytes]] = []
+        size = 0
+        try:
+            for chunk in body:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                yield chunk
+                if chunks is not None:
+                    size += len(chunk)
+                    chunks.append(chunk)
+                    if size > MAX_STREAMED_PAGE:
+                        chunks = None
+        finally:
+            close = getattr(body, "close", None)
+            if close is not None:
+                close()
+        if chunks is not None:
+            data = b"".join(chunks)
+            if "ETag" not in response.headers:
+                response.set_etag(hashlib.sha256(data).hexdigest()[:32])
+            cache.put(key, make_page(data, response))
+
+    return generate()
+
+
+def init_page_cache(app: Flask) -> PageCache:
+    """
+    Cache the rendered pages of an application.
+
+    The cache is stored in ``app.extensions["page_cache"]``; call its
+    ``invalidate`` method (or ``invalidate_page_cache``) when templates
+    or route data change. Views may set their own ``ETag``; other
+    responses get a digest of the body. Streamed pages are stored once
+    they have been sent in full. It must be set up before other
+    ``after_request`` filters so it stores their final output. Cache
+    hits skip ``before_request``/``after_request`` hooks entirely.
+
+    Args:
+        app: Flask application. ``PAGE_CACHE_SIZE`` sets the number of
+            pages kept and ``PAGE_CACHE_VARY`` the request headers that
+            select separate entries.
+
+    Returns:
+        The page cache.
+    """
+    cache = PageCache(
+        max_entries=app.config.get("PAGE_CACHE_SIZE", PAGE_CACHE_SIZE),
+        vary=app.config.get("PAGE_CACHE_VARY", ()),
+    )
+    app.extensions["page_cache"] = cache
+    app.wsgi_app = PageCacheMiddleware(  # type: ignore[method-assign]
+        app.wsgi_app, cache
+    )
+
+    @app.after_request
+    def store_page(response: Response) -> Response:
+        """Cache cacheable page responses and answer conditional requests."""
+        if (
+            request.method not in ("GET", "HEAD")
+            or request.endpoint == "static"
+            or not is_cacheable(response)
+        ):
+            return response
+
+        response.last_modified = datetime.now(timezone.utc).replace(
+            microsecond=0
+        )
+        if cache.vary:
+            response.vary.update(cache.vary)
+        key = cache.key(request.environ)
+        if response.is_streamed:
+            response.response = store_when_sent(cache, key, response)
+            return response
+
+        body = response.get_data()
+        if "ETag" not in response.headers:
+            response.set_etag(hashlib.sha256(body).hexdigest()[:32])
+        cache.put(key, make_page(body, response))
+        response.make_conditional(request)
+        return response
+
+    return cache
+
+
+def invalidate_page_cache(app: Flask, path: Optional[str] = None) -> int:
+    """
+    Drop an application's cached pages.
+
+    Args:
+        app: Flask application set up with ``init_page_cache``.
+        path: Only drop the entries for this URL path.
+
+    Returns:
+        Number of entries dropped (0 if the app has no page cache).
+    """
+    cache = app.extensions.get("page_cache")
+    return cache.invalidate(path) if cache is not None else 0
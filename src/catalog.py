@@ -0,0 +1,438 @@
+"""
+Catalog of learning resources and Copilot feature examples.
+
+The catalog is made of frozen, slotted dataclass records held in tuples
+and read-only mappings. It is built once per process by ``load_catalog``
+and shared by every request and by the static build, instead of nested
+dicts and lists being rebuilt for each page view. Because nothing
+changes it after it is built, a pre-fork server that loads the catalog
+before forking shares it with all of its workers.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Resource:
+    """
+    A learning resource.
+
+    Attributes:
+        title: Resource name.
+        description: One or two sentence summary.
+        url: Link to the resource.
+        cost: Price label, e.g. ``Free``.
+        platform: Hosting platform, for courses and videos.
+        level: Target experience level, for courses.
+    """
+
+    title: str
+    description: str
+    url: str
+    cost: str
+    platform: Optional[str] = None
+    level: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Example:
+    """
+    A GitHub Copilot feature example.
+
+    Attributes:
+        title: Feature name.
+        description: What the feature does.
+        features: Highlights listed under the description.
+    """
+
+    title: str
+    description: str
+    features: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Catalog:
+    """
+    Everything shown on the resources and examples pages.
+
+    Attributes:
+        resources: Resources by category, in display order.
+        examples: Feature examples, in display order.
+    """
+
+    resources: Mapping[str, Tuple[Resource, ...]]
+    examples: Tuple[Example, ...]
+
+
+def build_resources() -> Mapping[str, Tuple[Resource, ...]]:
+    """
+    Build the categorized learning resources.
+
+    Returns:
+        Read-only mapping of category to its resources.
+    """
+    return MappingProxyType({
+        "documentation": (
+            Resource(
+                title="GitHub Copilot Documentation",
+                description=(
+                    "Comprehensive documentation for GitHub Copilot, "
+                    "covering usage, integration, and best practices"
+                ),
+                url="https://docs.github.com/copilot",
+                cost="Free",
+            ),
+            Resource(
+                title="GitHub Copilot in VS Code",
+                description=(
+                    "Official documentation for using GitHub Copilot in "
+                    "Visual Studio Code, including advanced features"
+                ),
+                url="https://code.visualstudio.com/docs/copilot/overview",
+                cost="Free",
+            ),
+            Resource(
+                title="GitHub Copilot Quickstart",
+                description=(
+                    "Quick start guide to get up and running with "
+                    "GitHub Copilot in minutes"
+                ),
+                url="https://docs.github.com/en/copilot/quickstart",
+                cost="Free",
+            ),
+            Resource(
+                title="GitHub Copilot Chat Documentation",
+                description=(
+                    "Documentation for GitHub Copilot Chat features "
+                    "across different environments"
+                ),
+                url="https://docs.github.com/en/copilot/github-copilot-chat",
+                cost="Free",
+            ),
+            Resource(
+                title="GitHub Copilot CLI Documentation",
+                description=(
+                    "Guide to using GitHub Copilot in the command "
+                    "line interface"
+                ),
+                url=(
+                    "https://docs.github.com/en/copilot/"
+                    "github-copilot-in-the-cli"
+                ),
+                cost="Free",
+            ),
+        ),
+        "getting_started": (
+            Resource(
+                title="Essentials of GitHub Copilot",
+                description=(
+                    "A learning pathway covering the basics of GitHub "
+                    "Copilot, including common questions and expert insights"
+                ),
+                url=(
+                    "https://resources.github.com/learn/pathways/copilot/"
+                    "essentials/essentials-of-github-copilot/"
+                ),
+                cost="Free",
+            ),
+            Resource(
+                title="Getting Started with GitHub Copilot",
+                description=(
+                    "Step-by-step tutorials for beginners to unlock the "
+                    "full potential of GitHub Copilot"
+                ),
+                url="https://github.com/features/copilot/tutorials",
+                cost="Free",
+            ),
+            Resource(
+                title="GitHub Copilot Learning Pathways",
+                description=(
+                    "Expert-guided learning pathways for AI-powered "
+                    "development with GitHub Copilot"
+                ),
+                url="https://resources.github.com/learn/pathways/",
+                cost="Free",
+            ),
+        ),
+        "microsoft_learn": (
+            Resource(
+                title="GitHub Copilot Fundamentals (Microsoft Learn)",
+                description=(
+                    "Official Microsoft training modules on GitHub Copilot "
+                    "fundamentals, productivity, and business use cases"
+                ),
+                url=(
+                    "https://learn.microsoft.com/en-us/training/paths/"
+                    "copilot/"
+                ),
+                platform="Microsoft Learn",
+                level="Beginner to Intermediate",
+                cost="Free",
+            ),
+            Resource(
+                title="Generate Documentation Using GitHub Copilot Tools",
+                description=(
+                    "Intermediate module on using Copilot Chat for code "
+                    "explanations and documentation"
+                ),
+                url=(
+                    "https://learn.microsoft.com/en-us/training/modules/"
+                    "generate-documentation-using-github-copilot-tools/"
+                ),
+                platform="Microsoft Learn",
+                level="Intermediate",
+                cost="Free",
+            ),
+        ),
+        "courses": (
+            Resource(
+                title="Boost Your Productivity with GitHub Copilot",
+                description=(
+                    "Beginner-level course covering setup, prompt "
+                    "engineering, and best practices for GitHub Copilot"
+                ),
+                url=(
+                    "https://www.coursera.org/learn/"
+                    "introduction-to-github-copilot"
+                ),
+                platform="Coursera",
+                level="Beginner",
+                cost="Free (with paid certificate)",
+            ),
+            Resource(
+                title="Introduction to GitHub Copilot",
+                description=(
+                    "Intermediate course covering setup, database "
+                    "integration, and real-world scenarios"
+                ),
+                url=(
+                    "https://www.coursera.org/learn/"
+                    "introduction-to-microsoft-github-copilot"
+                ),
+                platform="Coursera",
+                level="Intermediate",
+                cost="Free (with paid certificate)",
+            ),
+            Resource(
+                title="GitHub Copilot: The AI Pair Programmer for Coding",
+                description=(
+                    "Short course on AI-assisted programming and best "
+                    "practices with GitHub Copilot"
+                ),
+                url=(
+                    "https://www.coursera.org/learn/"
+                    "github-copilot-the-ai-pair-programmer-for-coding"
+                ),
+                platform="Coursera",
+                level="Beginner",
+                cost="Free (with paid certificate)",
+            ),
+        ),
+        "videos": (
+            Resource(
+                title="Introduction to GitHub Copilot Tutorial",
+                description=(
+                    "Beginner-friendly video tutorial covering "
+                    "installation, usage, and productivity tips"
+                ),
+                url="https://www.youtube.com/watch?v=2pFPJYdPM7Q",
+                platform="YouTube",
+                cost="Free",
+            ),
+            Resource(
+                title="First Hour with GitHub Copilot",
+                description=(
+                    "Practical walkthrough of Copilot features, prompt "
+                    "best practices, and code completion"
+                ),
+                url="https://www.youtube.com/watch?v=7GtrNVoJatE",
+                platform="YouTube",
+                cost="Free",
+            ),
+            Resource(
+                title="How to Use GitHub Copilot (Complete Beginner's Guide)",
+                description=(
+                    "In-depth beginner's guide covering prompt "
+                    "engineering, security, and practical coding examples"
+                ),
+                url="https://www.youtube.com/watch?v=SJqGYwRq0uc",
+                platform="YouTube",
+                cost="Free",
+            ),
+            Resource(
+                title="Coding with an AI Pair Programmer: Getting Started",
+                description=(
+                    "Introduction to GitHub Copilot mechanics, data "
+                    "handling, and workflow adaptation"
+                ),
+                url="https://www.youtube.com/watch?v=dhfTaSGYQ4o",
+                platform="YouTube",
+                cost="Free",
+            ),
+            Resource(
+                title="GitHub YouTube Channel",
+                description=(
+                    "Official GitHub YouTube channel with Copilot "
+                    "tutorials and announcements"
+                ),
+                url="https://www.youtube.com/@GitHub",
+                platform="YouTube",
+                cost="Free",
+            ),
+        ),
+        "certification": (
+            Resource(
+                title="GitHub Copilot Certification Study Guide",
+                description=(
+                    "Official study guide and resources for preparing "
+                    "for the GitHub Copilot certification exam"
+                ),
+                url="https://learn.github.com/certification/COPILOT",
+                cost="Free",
+            ),
+            Resource(
+                title=(
+                    "Free Official Learning Resources for Copilot "
+                    "Certification"
+                ),
+                description=(
+                    "Comprehensive guide to official resources, modules, "
+                    "and exam preparation for GitHub Copilot certification"
+                ),
+                url=(
+                    "https://dellenny.com/free-official-learning-resources"
+                    "-for-the-github-copilot-certification-exam/"
+                ),
+                cost="Free",
+            ),
+        ),
+        "community": (
+            Resource(
+                title="GitHub Copilot Community Discussions",
+                description=(
+                    "Official community forum for GitHub Copilot "
+                    "discussions, questions, and feedback"
+                ),
+                url=(
+                    "https://github.com/orgs/community/discussions/"
+                    "categories/copilot"
+                ),
+                cost="Free",
+            ),
+            Resource(
+                title="Awesome GitHub Copilot",
+                description=(
+                    "Curated list of GitHub Copilot resources, projects, "
+                    "and extensions"
+                ),
+                url="https://github.com/github/awesome-copilot/tree/main",
+                cost="Free",
+            ),
+        ),
+        "best_practices": (
+            Resource(
+                title="How to write better prompts for GitHub Copilot",
+                description=(
+                    "Learn best practices for crafting effective prompts "
+                    "to get better results from Copilot"
+                ),
+                url=(
+                    "https://github.blog/2023-06-20-how-to-write-better"
+                    "-prompts-for-github-copilot/"
+                ),
+                cost="Free",
+            ),
+            Resource(
+                title="GitHub Copilot Best Practices",
+                description=(
+                    "Official best practices for using GitHub Copilot "
+                    "effectively"
+                ),
+                url=(
+                    "https://docs.github.com/en/copilot/using-github-copilot/"
+                    "getting-started-with-github-copilot"
+                    "#best-practices-for-using-github-copilot"
+                ),
+                cost="Free",
+            ),
+        ),
+    })
+
+
+def build_examples() -> Tuple[Example, ...]:
+    """
+    Build the GitHub Copilot feature examples.
+
+    Returns:
+        The examples, in display order.
+    """
+    return (
+        Example(
+            title="Code Completion",
+            description="Copilot suggests code completions as you type",
+            features=(
+                "Context-aware suggestions",
+                "Multiple language support",
+                "Function and class generation",
+            ),
+        ),
+        Example(
+            title="Documentation Generation",
+            description="Generate docstrings and comments automatically",
+            features=(
+                "PEP 257 compliant docstrings",
+                "Parameter descriptions",
+                "Return value documentation",
+            ),
+        ),
+        Example(
+            title="Test Generation",
+            description="Create comprehensive test cases with pytest",
+            features=(
+                "Unit test generation",
+                "Edge case coverage",
+                "Fixture creation",
+            ),
+        ),
+        Example(
+            title="Code Refactoring",
+            description="Refactor existing code following best practices",
+            features=(
+                "Function extraction",
+                "Variable renaming",
+                "Code optimization",
+            ),
+        ),
+        Example(
+            title="Bug Fixing",
+            description="Identify and fix bugs with Copilot assistance",
+            features=(
+                "Error analysis",
+                "Solution suggestions",
+                "Error handling improvements",
+            ),
+        ),
+        Example(
+            title="Code Translation",
+            description="Convert code between different languages",
+            features=(
+                "Multi-language support",
+                "Idiom preservation",
+                "Best practices application",
+            ),
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_catalog() -> Catalog:
+    """
+    Get the catalog, building it on first use.
+
+    Returns:
+        The process-wide catalog; every call returns the same object.
+    """
+    return Catalog(resources=build_resources(), examples=build_examples())
@@ -0,0 +1,430 @@
+"""
+Runtime response compression.
+
+A WSGI middleware compresses text responses (HTML, CSS, JavaScript, JSON,
+SVG) with brotli or gzip, picked from the request's ``Accept-Encoding``
+by quality value. It wraps the page cache middleware, so pages served
+from the cache are compressed too, while the cache itself keeps one
+uncompressed copy per page.
+
+Complete bodies of shareable responses, including static files, are
+compressed once: the result is kept in a bounded LRU cache keyed by a
+hash of the body, the encoding and the level. Streamed pages are
+compressed chunk by chunk with a flush after each chunk, so they still
+arrive progressively. Responses below ``COMPRESSION_MIN_SIZE`` bytes,
+responses that already have a ``Content-Encoding`` and types that are
+compressed already (images, fonts, archives) are sent as they are.
+
+Revalidations answered with ``304`` repeat the weak ``ETag`` of the
+compressed ``200``, so a client keeps one validator per representation.
+
+The encoders come from ``content_encoding``, which the static build uses
+for precompression. Brotli needs the optional ``Brotli`` package; without it
+only gzip is offered.
+"""
+
+import hashlib
+import mimetypes
+import threading
+import zlib
+from collections import OrderedDict
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from typing import Tuple
+
+from flask import Flask
+from werkzeug.datastructures import Headers
+from werkzeug.http import dump_header, parse_accept_header, parse_set_header
+from werkzeug.wsgi import ClosingIterator
+
+from content_encoding import available_encodings, brotli, compress
+
+# Default compression levels
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Bodies smaller than this many bytes are not worth compressing
+MIN_SIZE = 500
+
+# Total size of the compressed bodies kept for reuse
+CACHE_BYTES = 16 * 1024 * 1024
+
+# Media types that compress well
+COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/javascript",
+        "application/json",
+        "application/manifest+json",
+        "application/xml",
+        "image/svg+xml",
+        "text/css",
+        "text/html",
+        "text/javascript",
+        "text/plain",
+        "text/xml",
+    }
+)
+
+# Key of a compressed body: body digest, encoding and level
+BodyKey = Tuple[bytes, str, int]
+
+
+def choose_encoding(
+    accept_encoding: str, encodings: Iterable[str]
+) -> Optional[str]:
+    """
+    Pick the encoding for a response.
+
+    Args:
+        accept_encoding: The request's ``Accept-Encoding`` header.
+        encodings: Supported encodings, most preferred first.
+
+    Returns:
+        The supported encoding with the highest quality value (the first
+        in ``encodings`` on ties), or None if the client accepts none.
+
+    Example:
+        >>> choose_encoding("gzip;q=1.0, br;q=0.5", ("br", "gzip"))
+        'gzip'
+    """
+    accepted = parse_accept_header(accept_encoding)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_stream(
+    chunks: Iterable[bytes], encoding: str, level: int
+) -> Iterator[bytes]:
+    """
+    Compress a streamed body, flushing after every chunk.
+
+    Args:
+        chunks: Body chunks.
+        encoding: ``"br"`` or ``"gzip"``.
+        level: Brotli quality or gzip level.
+
+    Yields:
+        Compressed chunks.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            if chunk:
+                yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+
+    deflate = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if chunk:
+            yield deflate.compress(chunk) + deflate.flush(zlib.Z_SYNC_FLUSH)
+    yield deflate.flush()
+
+
+class CompressedBodyCache:
+    """
+    Thread-safe LRU cache of compressed bodies, bounded by total size.
+
+    Args:
+        max_bytes: Total size of the compressed bodies kept.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_BYTES) -> None:
+        """Create an empty cache."""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[BodyKey, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached bodies."""
+        return len(self._entries)
+
+    def compress(self, data: bytes, encoding: str, level: int) -> bytes:
+        """
+        Compress a body, reusing an earlier result for the same bytes.
+
+        Args:
+            data: Body to compress.
+            encoding: ``"br"`` or ``"gzip"``.
+            level: Brotli quality or gzip level.
+
+        Returns:
+            The compressed body.
+        """
+        key = (hashlib.sha256(data).digest(), encoding, level)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        compressed = compress(data, encoding, level)
+        if len(compressed) > self.max_bytes:
+            return compressed
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = compressed
+                self.size += len(compressed)
+                while self.size > self.max_bytes:
+                    _, dropped = self._entries.popitem(last=False)
+                    self.size -= len(dropped)
+        return compressed
+
+
+def is_compressible(status: str, headers: Headers) -> bool:
+    """
+    Tell whether a response's body may be compressed.
+
+    Args:
+        status: WSGI status line.
+        headers: Response headers.
+
+    Returns:
+        True for ``200`` responses of a ``COMPRESSIBLE_TYPES`` type that
+        are not encoded yet and do not forbid transformation.
+    """
+    mimetype = headers.get("Content-Type", "").split(";")[0].strip().lower()
+    return (
+        status.startswith("200")
+        and mimetype in COMPRESSIBLE_TYPES
+        and "Content-Encoding" not in headers
+        and "no-transform" not in headers.get("Cache-Control", "")
+    )
+
+
+def is_compressible_revalidation(environ: dict, headers: Headers) -> bool:
+    """
+    Tell whether a ``304`` response revalidates a compressible body.
+
+    A ``304`` usually has no ``Content-Type``; the type is then guessed
+    from the path, and paths without a known type (the pages) count as
+    compressible.
+
+    Args:
+        environ: WSGI environment of the request.
+        headers: Headers of the ``304`` response.
+
+    Returns:
+        True if the ``200`` response would have been compressed by type.
+    """
+    mimetype = headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if not mimetype:
+        path = environ.get("PATH_INFO", "")
+        mimetype = mimetypes.guess_type(path)[0] or "text/html"
+    return (
+        "ETag" in headers
+        and mimetype in COMPRESSIBLE_TYPES
+        and "no-transform" not in headers.get("Cache-Control", "")
+    )
+
+
+def is_shareable(headers: Headers) -> bool:
+    """
+    Tell whether a compressed body may be kept for other requests.
+
+    Args:
+        headers: Response headers.
+
+    Returns:
+        False for responses that set a cookie or forbid shared caching.
+    """
+    cache_control = headers.get("Cache-Control", "")
+    return (
+        "Set-Cookie" not in headers
+        and "no-store" not in cache_control
+        and "private" not in cache_control
+    )
+
+
+def vary_on_encoding(headers: Headers) -> None:
+    """
+    Add ``Accept-Encoding`` to the ``Vary`` header.
+
+    Args:
+        headers: Response headers, changed in place.
+    """
+    vary = parse_set_header(headers.get("Vary"))
+    vary.add("Accept-Encoding")
+    headers["Vary"] = dump_header(vary)
+
+
+def weaken_etag(headers: Headers) -> None:
+    """
+    Mark the ``ETag`` as weak for a compressed representation.
+
+    The compressed bytes differ from the ones the strong validator was
+    made for, but conditional requests (which compare weakly) still
+    match.
+
+    Args:
+        headers: Response headers, changed in place.
+    """
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+def call_app(
+    wsgi_app: Callable[..., Any], environ: dict
+) -> Tuple[Iterable[bytes], str, Headers]:
+    """
+    Call a WSGI application without starting the response yet.
+
+    Args:
+        wsgi_app: Application to call.
+        environ: WSGI environment.
+
+    Returns:
+        The body iterable, the status line and the headers.
+    """
+    response: List[Any] = []
+    written: List[bytes] = []
+
+    def start_response(
+        status: str, headers: List[Tuple[str, str]], exc_info: Any = None
+    ) -> Callable[[bytes], None]:
+        response[:] = [status, headers]
+        return written.append
+
+    app_iter = wsgi_app(environ, start_response)
+    chunks = iter(app_iter)
+    if not response:
+        # The application may only call start_response on the first chunk
+        written.extend(islice(chunks, 1))
+    if written:
+        app_iter = ClosingIterator(
+            chain(written, chunks), getattr(app_iter, "close", None)
+        )
+    status, headers = response
+    return app_iter, status, Headers(headers)
+
+
+class CompressionMiddleware:
+    """
+    WSGI middleware that compresses responses.
+
+    Args:
+        wsgi_app: Application whose responses are compressed.
+        cache: Cache of compressed bodies.
+        levels: Level per encoding.
+        min_size: Smallest body, in bytes, that is compressed.
+    """
+
+    def __init__(
+        self,
+        wsgi_app: Callable[..., Any],
+        cache: CompressedBodyCache,
+        levels: Dict[str, int],
+        min_size: int = MIN_SIZE,
+    ) -> None:
+        """Wrap a WSGI application."""
+        self.wsgi_app = wsgi_app
+        self.cache = cache
+        self.levels = levels
+        self.min_size = min_size
+        self.encodings = available_encodings()
+
+    def __call__(
+        self, environ: dict, start_response: Callable[..., Any]
+    ) -> Iterable[bytes]:
+        """Call the application and compress its response if useful."""
+        app_iter, status, headers = call_app(self.wsgi_app, environ)
+        if status.startswith("304"):
+            # Keep the validator the 200 response went out with
+            if is_compressible_revalidation(environ, headers) and (
+                choose_encoding(
+                    environ.get("HTTP_ACCEPT_ENCODING", ""), self.encodings
+                )
+            ):
+                vary_on_encoding(headers)
+                weaken_etag(headers)
+            start_response(status, headers.to_wsgi_list())
+            return app_iter
+        if not is_compressible(status, headers):
+            start_response(status, headers.to_wsgi_list())
+            return app_iter
+
+        # The body depends on Accept-Encoding from here on
+        vary_on_encoding(headers)
+        encoding = choose_encoding(
+            environ.get("HTTP_ACCEPT_ENCODING", ""), self.encodings
+        )
+        length = headers.get("Content-Length", type=int)
+        if (
+            encoding is None
+            or environ.get("REQUEST_METHOD") == "HEAD"
+            or (length is not None and length < self.min_size)
+        ):
+            start_response(status, headers.to_wsgi_list())
+            return app_iter
+
+        level = self.levels[encoding]
+        if length is None:
+            # Streamed response: compress as it is sent
+            headers["Content-Encoding"] = encoding
+            weaken_etag(headers)
+            start_response(status, headers.to_wsgi_list())
+            return ClosingIterator(
+                compress_stream(app_iter, encoding, level),
+                getattr(app_iter, "close", None),
+            )
+
+        try:
+            data = b"".join(app_iter)
+        finally:
+            close = getattr(app_iter, "close", None)
+            if close is not None:
+                close()
+        if is_shareable(headers):
+            body = self.cache.compress(data, encoding, level)
+        else:
+            body = compress(data, encoding, level)
+        if len(body) >= len(data):
+            body = data
+        else:
+            headers["Content-Encoding"] = encoding
+            weaken_etag(headers)
+        headers["Content-Length"] = str(len(body))
+        start_response(status, headers.to_wsgi_list())
+        return [body]
+
+
+def init_compression(app: Flask) -> CompressedBodyCache:
+    """
+    Compress an application's responses.
+
+    Must be set up after the page cache so that cache hits are
+    compressed as well. The compressed body cache is stored in
+    ``app.extensions["compression_cache"]``.
+
+    Args:
+        app: Flask application. ``COMPRESSION_GZIP_LEVEL``,
+            ``COMPRESSION_BROTLI_QUALITY``, ``COMPRESSION_MIN_SIZE`` and
+            ``COMPRESSION_CACHE_BYTES`` override the defaults.
+
+    Returns:
+        The compressed body cache.
+    """
+    cache = CompressedBodyCache(
+        app.config.get("COMPRESSION_CACHE_BYTES", CACHE_BYTES)
+    )
+    app.extensions["compression_cache"] = cache
+    app.wsgi_app = CompressionMiddleware(  # type: ignore[method-assign]
+        app.wsgi_app,
+        cache,
+        levels={
+            "gzip": app.config.get("COMPRESSION_GZIP_LEVEL", GZIP_LEVEL),
+            "br": app.config.get("COMPRESSION_BROTLI_QUALITY", BROTLI_QUALITY),
+        },
+        min_size=app.config.get("COMPRESSION_MIN_SIZE", MIN_SIZE),
+    )
+    return cache
@@ -0,0 +1,67 @@
+"""
+Content encoding helpers for gzip and brotli.
+
+The static build uses them to write precompressed sidecars, and the
+runtime middleware in ``compress`` to encode responses. Brotli support
+needs the optional ``brotli`` package; without it only gzip is available.
+"""
+
+import gzip
+from typing import Optional, Tuple
+
+try:
+    import brotli  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Highest compression settings, used for build-time precompression
+GZIP_MAX_LEVEL = 9
+BROTLI_MAX_QUALITY = 11
+
+# File extension used for precompressed sidecars of each encoding
+SIDECAR_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """
+    List the content encodings that can be produced.
+
+    Returns:
+        Encoding names in order of preference (best compression first).
+    """
+    if brotli is not None:
+        return ("br", "gzip")
+    return ("gzip",)
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress data with a content encoding.
+
+    gzip output uses a zero timestamp, so the same input always gives the
+    same bytes.
+
+    Args:
+        data: Bytes to compress.
+        encoding: ``"gzip"`` or ``"br"``.
+        level: Compression level (gzip 1-9, brotli 0-11). Defaults to the
+            maximum.
+
+    Returns:
+        Compressed bytes.
+
+    Raises:
+        ValueError: If the encoding is unknown or not available.
+    """
+    if encoding == "gzip":
+        if level is None:
+            level = GZIP_MAX_LEVEL
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli encoding requires the brotli package")
+        if level is None:
+            level = BROTLI_MAX_QUALITY
+        compressed: bytes = brotli.compress(data, quality=level)
+        return compressed
+    raise ValueError(f"Unsupported content encoding: {encoding}")
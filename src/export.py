@@ -0,0 +1,365 @@
+"""
+Streaming NDJSON export of the resource catalog and the examples.
+
+Records are produced one at a time by generators, serialized to one JSON
+object per line and, when requested, gzip-compressed as they stream, so
+memory use does not grow with the size of the catalog. An export can be
+resumed from a record offset: a client that received N complete lines
+asks for ``offset=N``.
+
+The exports are served under ``/api/export/`` and can be written to a
+file from the command line::
+
+    python src/export.py resources -o resources.ndjson.gz --gzip
+"""
+
+import argparse
+import json
+import sys
+import zlib
+from dataclasses import fields
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from flask import Flask, Response, jsonify, request
+
+from catalog import Example, Resource
+from routes import get_copilot_examples, get_learning_resources
+
+# Records serialized between explicit flushes of the compressor, so a
+# client receives data steadily and a cut connection loses little
+FLUSH_EVERY = 256
+
+# Bytes of uncompressed output collected before a chunk is sent
+CHUNK_SIZE = 16 * 1024
+
+# zlib compression level for gzip streams
+COMPRESSION_LEVEL = 6
+
+# Adds a gzip header and trailer to zlib's deflate stream
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+RESOURCE_FIELDS = tuple(field.name for field in fields(Resource))
+EXAMPLE_FIELDS = tuple(field.name for field in fields(Example))
+
+
+def iter_resources(
+    resources: Optional[Mapping[str, Sequence[Resource]]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the learning resources as export records.
+
+    Args:
+        resources: Resources by category (defaults to the catalog).
+
+    Yields:
+        One dictionary per resource, with its ``category`` first.
+    """
+    if resources is None:
+        resources = get_learning_resources()
+    for category, entries in resources.items():
+        for entry in entries:
+            record = {"category": category}
+            for name in RESOURCE_FIELDS:
+                record[name] = getattr(entry, name)
+            yield record
+
+
+def iter_examples(
+    examples: Optional[Sequence[Example]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the Copilot examples as export records.
+
+    Args:
+        examples: Examples to export (defaults to the catalog).
+
+    Yields:
+        One dictionary per example.
+    """
+    if examples is None:
+        examples = get_copilot_examples()
+    for example in examples:
+        yield {name: getattr(example, name) for name in EXAMPLE_FIELDS}
+
+
+# Export name -> record generator
+DATASETS: Dict[str, Callable[[], Iterator[Dict[str, Any]]]] = {
+    "resources": iter_resources,
+    "examples": iter_examples,
+}
+
+
+def ndjson_lines(
+    records: Iterable[Dict[str, Any]], offset: int = 0
+) -> Iterator[bytes]:
+    """
+    Serialize records as newline-delimited JSON.
+
+    Args:
+        records: Records to serialize.
+        offset: Number of leading records to skip.
+
+    Yields:
+        One UTF-8 encoded line per record.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for record in islice(records, offset, None):
+        yield (encoder.encode(record) + "\n").encode("utf-8")
+
+
+def gzip_chunks(
+    lines: Iterable[bytes],
+    level: int = COMPRESSION_LEVEL,
+    flush_every: int = FLUSH_EVERY,
+) -> Iterator[bytes]:
+    """
+    Gzip-compress a stream of lines incrementally.
+
+    The compressor is sync-flushed every ``flush_every`` lines so that
+    everything sent so far can be decompressed, even if the stream is cut
+    off later.
+
+    Args:
+        lines: Chunks to compress.
+        level: zlib compression level.
+        flush_every: Lines between flushes.
+
+    Yields:
+        Compressed chunks forming a single gzip member.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    pending = 0
+    for line in lines:
+        chunk = compressor.compress(line)
+        pending += 1
+        if pending == flush_every:
+            chunk += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def batch_chunks(
+    lines: Iterable[bytes], size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Join small lines into chunks of about ``size`` bytes.
+
+    Writing one short line per WSGI chunk costs a system call each.
+
+    Args:
+        lines: Lines to join.
+        size: Chunk size to reach before yielding.
+
+    Yields:
+        Chunks made of whole lines.
+    """
+    buffer: List[bytes] = []
+    buffered = 0
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def export_stream(
+    records: Iterable[Dict[str, Any]], offset: int = 0, compress: bool = False
+) -> Iterator[bytes]:
+    """
+    Stream records as NDJSON, optionally gzip-compressed.
+
+    Args:
+        records: Records to export.
+        offset: Number of leading records to skip.
+        compress: Whether to gzip the stream.
+
+    Returns:
+        Iterator over the chunks of the export.
+    """
+    lines = ndjson_lines(records, offset)
+    return gzip_chunks(lines) if compress else batch_chunks(lines)
+
+
+def parse_offset(value: Optional[str]) -> int:
+    """
+    Read the ``offset`` request argument.
+
+    Args:
+        value: Argument value, or None if absent.
+
+    Returns:
+        The offset (0 when absent).
+
+    Raises:
+        ValueError: If it is not a non-negative integer.
+    """
+    if value is None:
+        return 0
+    # isdigit() also accepts digits such as "²" that int() rejects
+    if not (value.isascii() and value.isdecimal()):
+        raise ValueError("offset must be a non-negative integer")
+    return int(value)
+
+
+def offset_argument(value: str) -> int:
+    """
+    Read the ``--offset`` command line argument with ``parse_offset``.
+
+    Args:
+        value: Argument value.
+
+    Returns:
+        The offset.
+
+    Raises:
+        argparse.ArgumentTypeError: If it is not a non-negative integer.
+    """
+    try:
+        return parse_offset(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from error
+
+
+def register_export(app: Flask) -> None:
+    """
+    Register the ``/api/export/<dataset>.ndjson`` routes.
+
+    Args:
+        app: Flask application instance.
+    """
+
+    @app.route("/api/export/<dataset>.ndjson")
+    def api_export(dataset: str) -> Any:
+        """
+        Stream a dataset as NDJSON.
+
+        The response is gzip-compressed when the client accepts it.
+        ``offset`` skips that many records, to resume an export that was
+        interrupted.
+
+        Args:
+            dataset: Name of the dataset, a key of ``DATASETS``.
+
+        Returns:
+            Streamed NDJSON, or a JSON error with status 400 or 404.
+        """
+        if dataset not in DATASETS:
+            return jsonify(error=f"Unknown export: {dataset}"), 404
+        try:
+            offset = parse_offset(request.args.get("offset"))
+        except ValueError as error:
+            return jsonify(error=str(error)), 400
+
+        compress = request.accept_encodings["gzip"] > 0
+        response = Response(
+            export_stream(DATASETS[dataset](), offset, compress),
+            mimetype=NDJSON_MIMETYPE,
+        )
+        if compress:
+            response.headers["Content-Encoding"] = "gzip"
+        response.vary.add("Accept-Encoding")
+        response.headers["Content-Disposition"] = (
+            f"attachment; filename={dataset}.ndjson"
+        )
+        return response
+
+
+def count_lines(path: Path) -> int:
+    """
+    Count the complete lines of an uncompressed export file.
+
+    A partial last line, left by an interrupted export, is removed so
+    that the export can be appended to.
+
+    Args:
+        path: Export file.
+
+    Returns:
+        Number of complete lines.
+    """
+    lines = 0
+    complete = 0
+    with path.open("rb+") as stream:
+        while chunk := stream.read(1 << 16):
+            lines += chunk.count(b"\n")
+            if b"\n" in chunk:
+                complete = stream.tell() - len(chunk) + chunk.rindex(b"\n") + 1
+        stream.truncate(complete)
+    return lines
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Write an export to a file or standard output.
+
+    Args:
+        argv: Command line arguments (defaults to ``sys.argv[1:]``).
+
+    Returns:
+        Exit status.
+    """
+    parser = argparse.ArgumentParser(
+        description="Export the catalog as NDJSON."
+    )
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument(
+        "-o", "--output", help="Output file (default: standard output)"
+    )
+    parser.add_argument(
+        "--gzip", action="store_true", help="Compress the output with gzip"
+    )
+    parser.add_argument(
+        "--offset",
+        type=offset_argument,
+        default=0,
+        help="Number of records to skip (default: %(default)d)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Append to an uncompressed output file, skipping the records "
+        "it already holds",
+    )
+    args = parser.parse_args(argv)
+
+    offset = args.offset
+    mode = "wb"
+    if args.resume:
+        if not args.output or args.gzip:
+            parser.error("--resume needs an uncompressed --output file")
+        path = Path(args.output)
+        if path.exists():
+            offset = count_lines(path)
+            mode = "ab"
+
+    chunks = export_stream(DATASETS[args.dataset](), offset, args.gzip)
+    if args.output:
+        with open(args.output, mode) as stream:
+            stream.writelines(chunks)
+    else:
+        sys.stdout.buffer.writelines(chunks)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
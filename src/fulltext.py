@@ -0,0 +1,662 @@
+"""
+Server-side full-text search with BM25 ranking.
+
+The index covers the learning resources and feature examples of the
+catalog, the sections of the rendered tutorials page and the markdown
+guides under ``.github/tutorials``, ``.github/prompts`` and
+``.github/instructions`` (one document per ``##`` section). It is built
+once per process. After that, the source files are checked at most every
+``REFRESH_INTERVAL`` seconds, and only the sources whose files changed
+are indexed again.
+"""
+
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from flask import Flask, current_app, jsonify, make_response
+from flask import render_template, request, url_for
+from markupsafe import Markup, escape
+
+from catalog import load_catalog
+from search import TITLE_WEIGHT, SearchDocument, summarize, tokenize
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Seconds between checks of the source files for changes
+REFRESH_INTERVAL = 2.0
+
+# Approximate number of characters in a result snippet
+SNIPPET_LENGTH = 200
+
+# Matches tried as the start of a snippet
+MAX_WINDOWS = 50
+
+# Results per page, and the most a request may ask for
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Directories (relative to the repository root) of indexed markdown
+MARKDOWN_DIRS = (
+    ".github/tutorials",
+    ".github/prompts",
+    ".github/instructions",
+)
+
+# Rendered pages indexed section by section, with their templates
+PAGES = {"tutorials": ("tutorials.html", "base.html")}
+
+# Markdown documents link to their source on GitHub
+REPOSITORY_URL = "https://github.com/agharib89/gh-copilot-raisa/blob/main/"
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FRONT_MATTER = re.compile(r"\A(?:<!--.*?-->\s*)?---\n.*?\n---\n", re.DOTALL)
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_NOISE = re.compile(r"<!--.*?-->|<[^>]+>|[*_`>|]+|^\s*[-+]\s+", re.M)
+LEADING_SYMBOLS = re.compile(r"^[^\w]+")
+
+
+@dataclass
+class SearchResult:
+    """
+    A ranked search hit.
+
+    Attributes:
+        title: Document title.
+        url: Link to the document.
+        kind: Source label, e.g. ``Tutorial`` or a resource category.
+        score: BM25 score.
+        snippet: HTML-escaped excerpt with matches in ``<mark>`` tags.
+    """
+
+    title: str
+    url: str
+    kind: str
+    score: float
+    snippet: Markup
+
+
+class FullTextIndex:
+    """
+    Inverted index supporting document updates and BM25 queries.
+
+    Each term maps to the documents that contain it and the term's
+    frequency in each. Title terms count ``TITLE_WEIGHT`` times.
+    Documents can be removed again, so a changed source is re-indexed
+    without rebuilding everything.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self.documents: Dict[int, SearchDocument] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.lengths: Dict[int, int] = {}
+        self._terms: Dict[int, Tuple[str, ...]] = {}
+        self._next_id = 0
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return len(self.documents)
+
+    def add(self, document: SearchDocument) -> int:
+        """
+        Index a document.
+
+        Args:
+            document: Document to add.
+
+        Returns:
+            The document's id.
+        """
+        counts = Counter(tokenize(document.text))
+        for term in tokenize(document.title):
+            counts[term] += TITLE_WEIGHT
+        doc_id = self._next_id
+        self._next_id += 1
+        self.documents[doc_id] = document
+        for term, frequency in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+        self._terms[doc_id] = tuple(counts)
+        self.lengths[doc_id] = sum(counts.values())
+        self._total_length += self.lengths[doc_id]
+        return doc_id
+
+    def remove(self, doc_id: int) -> None:
+        """
+        Drop a document from the index.
+
+        Args:
+            doc_id: Id returned by ``add``.
+        """
+        for term in self._terms.pop(doc_id):
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+        self._total_length -= self.lengths.pop(doc_id)
+        del self.documents[doc_id]
+
+    def rank(
+        self, terms: Sequence[str], limit: int = DEFAULT_LIMIT
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank the documents containing any of the terms with BM25.
+
+        Args:
+            terms: Query terms, as produced by ``tokenize``.
+            limit: Maximum number of results.
+
+        Returns:
+            (document id, score) pairs, best first.
+        """
+        count = len(self.documents)
+        if not count:
+            return []
+        average = self._total_length / count
+        scores: Dict[int, float] = {}
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for doc_id, frequency in postings.items():
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * self.lengths[doc_id] / average
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) + (
+                    idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                )
+        return heapq.nlargest(
+            limit, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+
+
+@lru_cache(maxsize=256)
+def term_pattern(terms: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Compile a pattern matching any of the terms as whole words.
+
+    Args:
+        terms: Query terms.
+
+    Returns:
+        Case-insensitive pattern, longest terms first.
+    """
+    alternatives = sorted(set(terms), key=len, reverse=True)
+    return re.compile(
+        r"\b(?:{})\b".format("|".join(map(re.escape, alternatives))),
+        re.IGNORECASE,
+    )
+
+
+def best_window(
+    matches: Sequence["re.Match[str]"], term_count: int, length: int
+) -> int:
+    """
+    Find the match to start a snippet at.
+
+    A window of ``length`` characters slides over the matches, starting
+    at each of the first ``MAX_WINDOWS``.
+
+    Args:
+        matches: Matches of the query terms, in order.
+        term_count: Number of distinct query terms.
+        length: Approximate excerpt length.
+
+    Returns:
+        Position in ``matches`` of the first window that covers the most
+        distinct terms.
+    """
+    best, best_terms, last = 0, 0, 0
+    for index, match in enumerate(matches[:MAX_WINDOWS]):
+        while (
+            last < len(matches)
+            and matches[last].start() < match.start() + length
+        ):
+            last += 1
+        distinct = len({m.group().casefold() for m in matches[index:last]})
+        if distinct > best_terms:
+            best, best_terms = index, distinct
+            if distinct == term_count:
+                break
+    return best
+
+
+def highlight(
+    text: str, terms: Sequence[str], length: int = SNIPPET_LENGTH
+) -> Markup:
+    """
+    Cut an excerpt around the query terms and mark them.
+
+    The excerpt starts shortly before the match that has the most
+    distinct query terms within ``length`` characters after it.
+
+    Args:
+        text: Document text.
+        terms: Query terms.
+        length: Approximate excerpt length.
+
+    Returns:
+        HTML-escaped excerpt with each match wrapped in ``<mark>``.
+    """
+    matches = list(term_pattern(tuple(terms)).finditer(text)) if terms else []
+    if not matches:
+        return Markup(escape(summarize(text, length)))
+
+    # Start and end the excerpt at word boundaries
+    first = matches[best_window(matches, len(set(terms)), length)].start()
+    start = max(first - length // 5, 0)
+    if start:
+        start = min(text.find(" ", start) + 1 or start, first)
+    end = min(start + length, len(text))
+    if end < len(text) and text.rfind(" ", first, end) > first:
+        end = text.rfind(" ", first, end)
+
+    parts = ["…" if start else ""]
+    position = start
+    for match in matches:
+        if match.start() < start:
+            continue
+        if match.end() > end:
+            break
+        parts.append(escape(text[position:match.start()]))
+        parts.append(f"<mark>{escape(match.group())}</mark>")
+        position = match.end()
+    parts.append(escape(text[position:end]))
+    parts.append("…" if end < len(text) else "")
+    return Markup("".join(parts))
+
+
+def slugify(heading: str) -> str:
+    """
+    Turn a heading into the anchor GitHub gives it.
+
+    Args:
+        heading: Heading text.
+
+    Returns:
+        Lower-case anchor with spaces as hyphens and punctuation removed.
+
+    Example:
+        >>> slugify("Step 2: Create the File")
+        'step-2-create-the-file'
+    """
+    slug = re.sub(r"[^\w\- ]", "", heading.strip().lower())
+    return slug.replace(" ", "-")
+
+
+def strip_markdown(text: str) -> str:
+    """
+    Reduce markdown to plain text for indexing.
+
+    Args:
+        text: Markdown source.
+
+    Returns:
+        The text with link targets, HTML, emphasis, list markers and code
+        fences removed and whitespace collapsed.
+    """
+    text = MARKDOWN_LINK.sub(r"\1", text)
+    text = MARKDOWN_NOISE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def markdown_documents(path: Path, root: Path) -> List[SearchDocument]:
+    """
+    Split a markdown file into one document per ``##`` section.
+
+    Text before the first ``##`` heading forms a document titled with the
+    file's ``#`` heading. Section links point at the file on GitHub.
+
+    Args:
+        path: Markdown file.
+        root: Repository root the link is made relative to.
+
+    Returns:
+        The file's non-empty sections.
+    """
+    source = FRONT_MATTER.sub("", path.read_text(encoding="utf-8"))
+    url = REPOSITORY_URL + path.relative_to(root).as_posix()
+    title = path.name
+    sections: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    in_code = False
+    for line in source.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+            continue
+        heading = None if in_code else HEADING.match(line)
+        if heading is None:
+            sections[-1][1].append(line)
+        elif len(heading.group(1)) == 1 and title == path.name:
+            title = strip_markdown(heading.group(2))
+        elif len(heading.group(1)) == 2:
+            sections.append((strip_markdown(heading.group(2)), []))
+        else:
+            sections[-1][1].append(heading.group(2))
+
+    documents = []
+    for section, lines in sections:
+        text = strip_markdown("\n".join(lines))
+        if not text and section is None:
+            continue
+        documents.append(SearchDocument(
+            title=f"{title} › {section}" if section else title,
+            url=f"{url}#{slugify(section)}" if section else url,
+            text=text,
+            kind="Guide",
+        ))
+    return documents
+
+
+def page_documents(app: Flask, endpoint: str) -> List[SearchDocument]:
+    """
+    Render a page and split it into one document per ``<section id>``.
+
+    Args:
+        app: Flask application.
+        endpoint: Endpoint of the page.
+
+    Returns:
+        One document per section that has an id, titled by its heading
+        and linking to its anchor.
+    """
+    # Only indexing needs bs4; importing it slows down create_app
+    from bs4 import BeautifulSoup
+
+    with app.test_request_context():
+        path = url_for(endpoint)
+    with app.test_request_context(path):
+        # Streamed pages return a response rather than a string
+        rv = app.ensure_sync(app.view_functions[endpoint])()
+        html = app.make_response(rv).get_data(as_text=True)
+        soup = BeautifulSoup(html, "html.parser")
+        documents = []
+        for section in soup.select("main section[id]"):
+            heading = section.find(["h1", "h2", "h3"])
+            title = heading.get_text(" ", strip=True) if heading else ""
+            if heading is not None:
+                heading.decompose()
+            documents.append(SearchDocument(
+                # Drop the emoji the headings start with
+                title=LEADING_SYMBOLS.sub("", title) or endpoint.title(),
+                url=url_for(endpoint, _anchor=str(section["id"])),
+                text=" ".join(section.get_text(" ").split()),
+                kind=endpoint.replace("_", " ").title(),
+            ))
+    return documents
+
+
+def catalog_documents(app: Flask) -> List[SearchDocument]:
+    """
+    Turn the catalog's resources and examples into documents.
+
+    Args:
+        app: Flask application, used to link examples to their page.
+
+    Returns:
+        One document per resource and per example.
+    """
+    catalog = load_catalog()
+    documents = []
+    for category, resources in catalog.resources.items():
+        kind = category.replace("_", " ").title()
+        for resource in resources:
+            documents.append(SearchDocument(
+                title=resource.title,
+                url=resource.url,
+                text=" ".join(filter(None, (
+                    resource.description, resource.platform,
+                    resource.level, resource.cost,
+                ))),
+                kind=kind,
+                summary=resource.description,
+            ))
+    with app.test_request_context():
+        examples_url = url_for("examples")
+    for example in catalog.examples:
+        documents.append(SearchDocument(
+            title=example.title,
+            url=examples_url,
+            text=f"{example.description} {' '.join(example.features)}",
+            kind="Example",
+        ))
+    return documents
+
+
+@dataclass
+class Source:
+    """
+    A group of documents that is re-indexed as a whole.
+
+    Attributes:
+        key: Unique name of the source.
+        paths: Files whose changes make the source stale.
+        load: Function producing the source's documents.
+    """
+
+    key: str
+    paths: Tuple[Path, ...]
+    load: Callable[[], List[SearchDocument]]
+
+
+class SiteSearch:
+    """
+    Full-text search over the site's content, kept in sync with files.
+
+    Args:
+        app: Flask application whose pages and catalog are indexed.
+        root: Repository root holding ``MARKDOWN_DIRS``.
+        refresh_interval: Minimum seconds between checks for changed
+            source files.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        root: Path = ROOT,
+        refresh_interval: float = REFRESH_INTERVAL,
+    ) -> None:
+        """Create an empty search; the index is built on first use."""
+        self.app = app
+        self.root = root
+        self.refresh_interval = refresh_interval
+        self.index = FullTextIndex()
+        self._documents: Dict[str, List[int]] = {}
+        self._signatures: Dict[str, Tuple[Tuple[str, int, int], ...]] = {}
+        self._checked: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def sources(self) -> List[Source]:
+        """
+        List the indexed sources.
+
+        The catalog is loaded once per process, so it is never stale; the
+        rendered pages follow their templates and each markdown file is a
+        source of its own.
+
+        Returns:
+            The current sources.
+        """
+        app = self.app
+        sources = [Source("catalog", (), lambda: catalog_documents(app))]
+        template_dir = Path(app.root_path, app.template_folder or "")
+        for endpoint, templates in PAGES.items():
+            sources.append(Source(
+                f"page:{endpoint}",
+                tuple(template_dir / name for name in templates),
+                partial(page_documents, app, endpoint),
+            ))
+        for directory in MARKDOWN_DIRS:
+            folder = self.root / directory
+            if not folder.is_dir():
+                continue
+            for path in sorted(folder.glob("*.md")):
+                sources.append(Source(
+                    f"markdown:{directory}/{path.name}",
+                    (path,),
+                    partial(markdown_documents, path, self.root),
+                ))
+        return sources
+
+    def refresh(self) -> int:
+        """
+        Index new and changed sources and drop removed ones.
+
+        Returns:
+            Number of sources (re-)indexed or dropped.
+        """
+        with self._lock:
+            self._checked = time.monotonic()
+            updated = 0
+            current = set()
+            for source in self.sources():
+                try:
+                    signature = tuple(
+                        (str(path), stat.st_mtime_ns, stat.st_size)
+                        for path in source.paths
+                        for stat in (os.stat(path),)
+                    )
+                except OSError:
+                    # Removed since it was listed; dropped below
+                    continue
+                current.add(source.key)
+                if self._signatures.get(source.key) == signature:
+                    continue
+                try:
+                    documents = list(source.load())
+                except OSError:
+                    continue
+                for doc_id in self._documents.pop(source.key, ()):
+                    self.index.remove(doc_id)
+                self._documents[source.key] = [
+                    self.index.add(document) for document in documents
+                ]
+                self._signatures[source.key] = signature
+                updated += 1
+            for key in set(self._documents) - current:
+                for doc_id in self._documents.pop(key):
+                    self.index.remove(doc_id)
+                del self._signatures[key]
+                updated += 1
+            return updated
+
+    def search(
+        self, query: str, limit: int = DEFAULT_LIMIT
+    ) -> List[SearchResult]:
+        """
+        Find the documents best matching a query.
+
+        Args:
+            query: Search text.
+            limit: Maximum number of results.
+
+        Returns:
+            Results with highlighted snippets, best first.
+        """
+        terms = tokenize(query)
+        with self._lock:
+            if (
+                self._checked is None
+                or time.monotonic() - self._checked >= self.refresh_interval
+            ):
+                self.refresh()
+            if not terms:
+                return []
+            ranked = [
+                (self.index.documents[doc_id], score)
+                for doc_id, score in self.index.rank(terms, limit)
+            ]
+        return [
+            SearchResult(
+                title=document.title,
+                url=document.url,
+                kind=document.kind,
+                score=score,
+                snippet=highlight(document.text, terms),
+            )
+            for document, score in ranked
+        ]
+
+
+def init_site_search(app: Flask) -> SiteSearch:
+    """
+    Register the ``/search`` route.
+
+    The search is stored in ``app.extensions["site_search"]``. The index
+    is built by the first search, or in ``create_app`` when
+    ``SEARCH_PREWARM`` is set.
+
+    Args:
+        app: Flask application.
+
+    Returns:
+        The site search.
+    """
+    site_search = SiteSearch(app)
+    app.extensions["site_search"] = site_search
+
+    @app.route("/search")
+    def search() -> Any:
+        """
+        Search the site.
+
+        Query parameters are ``q``, ``limit`` and ``format`` (``json``
+        for a JSON response instead of the results page).
+
+        Returns:
+            The results page or JSON.
+        """
+        query = request.args.get("q", "").strip()
+        limit = request.args.get("limit", type=int, default=DEFAULT_LIMIT)
+        limit = min(max(limit, 1), MAX_LIMIT)
+        start = time.perf_counter()
+        results = current_app.extensions["site_search"].search(query, limit)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if request.args.get("format") == "json":
+            response = jsonify(
+                query=query,
+                results=[
+                    {
+                        "title": result.title,
+                        "url": result.url,
+                        "kind": result.kind,
+                        "score": round(result.score, 4),
+                        "snippet": str(result.snippet),
+                    }
+                    for result in results
+                ],
+            )
+        else:
+            response = make_response(
+                render_template(
+                    "search.html",
+                    title="Search",
+                    active_page="search",
+                    query=query,
+                    results=results,
+                    elapsed=elapsed,
+                )
+            )
+        # Results follow the index as files change, so the page cache
+        # must not replay them
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    return site_search
@@ -0,0 +1,453 @@
+"""
+Outbound link checking for the learning resource catalog.
+
+Every URL from ``get_learning_resources()`` is requested concurrently
+with asyncio, with a limit on connections per host and a timeout per
+request. Results are kept in a JSON cache so that links checked
+recently are not requested again.
+
+Run it from the repository root::
+
+    python src/linkcheck.py
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from routes import sanitize_url
+
+# Default location of the result cache
+CACHE_FILE = ".linkcheck-cache.json"
+
+# How long results stay valid, in seconds (working links / broken links)
+CACHE_TTL = 7 * 24 * 3600
+ERROR_CACHE_TTL = 3600
+
+# Request limits
+TIMEOUT = 10.0
+MAX_CONNECTIONS = 20
+MAX_PER_HOST = 2
+MAX_REDIRECTS = 5
+
+# Servers that reject HEAD requests are retried with GET
+HEAD_FALLBACK_STATUSES = (403, 405, 501)
+
+USER_AGENT = "gh-copilot-raisa-linkcheck/1.0"
+
+
+@dataclass
+class LinkResult:
+    """
+    Outcome of checking one URL.
+
+    Attributes:
+        url: URL that was checked.
+        ok: True if the final response had a 2xx or 3xx status.
+        status: Status code of the final response (0 if none).
+        final_url: URL the redirects ended at.
+        error: Description of the failure, if the request failed.
+        checked_at: Unix time of the check.
+        elapsed: Seconds the check took.
+    """
+
+    url: str
+    ok: bool
+    status: int = 0
+    final_url: str = ""
+    error: str = ""
+    checked_at: float = 0.0
+    elapsed: float = 0.0
+
+
+class LinkCache:
+    """
+    On-disk cache of link check results with expiry.
+
+    Working links are trusted for ``ttl`` seconds and broken links for
+    ``error_ttl`` seconds, so failures are retried sooner.
+
+    Args:
+        path: JSON file holding the cache.
+        ttl: Lifetime of results for working links.
+        error_ttl: Lifetime of results for broken links.
+    """
+
+    def __init__(
+        self,
+        path: "str | Path",
+        ttl: float = CACHE_TTL,
+        error_ttl: float = ERROR_CACHE_TTL,
+    ) -> None:
+        """Load the cache file if it exists."""
+        self.path = Path(path)
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.entries: Dict[str, LinkResult] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.entries = {
+                url: LinkResult(**entry) for url, entry in data.items()
+            }
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def get(
+        self, url: str, now: Optional[float] = None
+    ) -> Optional[LinkResult]:
+        """
+        Get a result that has not expired.
+
+        Args:
+            url: URL to look up.
+            now: Current Unix time (defaults to the clock).
+
+        Returns:
+            The cached result, or None if missing or expired.
+        """
+        result = self.entries.get(url)
+        if result is None:
+            return None
+        age = (time.time() if now is None else now) - result.checked_at
+        ttl = self.ttl if result.ok else self.error_ttl
+        return result if age < ttl else None
+
+    def put(self, result: LinkResult) -> None:
+        """
+        Store a result.
+
+        Args:
+            result: Result to store.
+        """
+        self.entries[result.url] = result
+
+    def save(self) -> None:
+        """Write the cache file."""
+        self.path.write_text(
+            json.dumps(
+                {url: asdict(result) for url, result in self.entries.items()},
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+
+async def fetch_status(
+    url: str,
+    method: str = "HEAD",
+    timeout: float = TIMEOUT,
+    ssl_context: Optional[ssl.SSLContext] = None,
+) -> Tuple[int, Dict[str, str]]:
+    """
+    Send one HTTP/1.1 request and read the status line and headers.
+
+    The body is never read; the connection is closed once the headers
+    have arrived.
+
+    Args:
+        url: ``http`` or ``https`` URL to request.
+        method: Request method.
+        timeout: Seconds allowed for connecting and reading the headers.
+        ssl_context: Context for ``https`` URLs (default: system trust).
+
+    Returns:
+        The status code and the response headers (lowercase names).
+
+    Raises:
+        ValueError: If the URL or the response is malformed.
+        OSError: If the connection fails.
+        asyncio.TimeoutError: If the server does not answer in time.
+    """
+    sanitize_url(url)
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    host = parts.hostname or ""
+    port = parts.port or (443 if secure else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    if secure and ssl_context is None:
+        ssl_context = ssl.create_default_context()
+
+    async def exchange() -> Tuple[int, Dict[str, str]]:
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=ssl_context if secure else None
+        )
+        try:
+            host_header = parts.netloc.rpartition("@")[2]
+            writer.write(
+                f"{method} {target} HTTP/1.1\r\n"
+                f"Host: {host_header}\r\n"
+                f"User-Agent: {USER_AGENT}\r\n"
+                "Accept: */*\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+            )
+            await writer.drain()
+            status_line = (await reader.readline()).decode("latin-1")
+            protocol, _, rest = status_line.partition(" ")
+            if not protocol.startswith("HTTP/") or not rest[:3].isdigit():
+                raise ValueError(f"malformed status line {status_line!r}")
+            headers: Dict[str, str] = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            return int(rest[:3]), headers
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+    return await asyncio.wait_for(exchange(), timeout)
+
+
+class LinkChecker:
+    """
+    Check URLs concurrently with per-host connection limits.
+
+    Args:
+        timeout: Seconds allowed per request.
+        max_connections: Maximum requests in flight overall.
+        max_per_host: Maximum requests in flight to one host.
+        ssl_context: Context for ``https`` URLs (default: system trust).
+    """
+
+    def __init__(
+        self,
+        timeout: float = TIMEOUT,
+        max_connections: int = MAX_CONNECTIONS,
+        max_per_host: int = MAX_PER_HOST,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        """Store the limits; semaphores are created per event loop."""
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.ssl_context = ssl_context
+        self._connections: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    async def _request(
+        self, url: str, method: str
+    ) -> Tuple[int, Dict[str, str]]:
+        """Send one request within the overall and per-host limits."""
+        if self._connections is None:
+            self._connections = asyncio.Semaphore(self.max_connections)
+        host = urlsplit(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.max_per_host)
+        # The host slot comes first, so requests queued for a busy host
+        # do not hold overall slots that other hosts could use
+        async with self._hosts[host], self._connections:
+            return await fetch_status(
+                url, method, self.timeout, self.ssl_context
+            )
+
+    async def check(self, url: str) -> LinkResult:
+        """
+        Check one URL, following redirects.
+
+        ``HEAD`` is tried first; servers that refuse it are asked again
+        with ``GET``.
+
+        Args:
+            url: URL to check.
+
+        Returns:
+            The result of the check.
+        """
+        started = time.perf_counter()
+        result = LinkResult(url=url, ok=False, checked_at=time.time())
+        current = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                status, headers = await self._request(current, "HEAD")
+                if status in HEAD_FALLBACK_STATUSES:
+                    status, headers = await self._request(current, "GET")
+                location = headers.get("location")
+                if 300 <= status < 400 and location:
+                    current = urljoin(current, location)
+                    continue
+                result.status = status
+                result.ok = 200 <= status < 400
+                if not result.ok:
+                    result.error = f"HTTP {status}"
+                break
+            else:
+                result.error = f"more than {MAX_REDIRECTS} redirects"
+        except asyncio.TimeoutError:
+            result.error = f"timed out after {self.timeout:g}s"
+        except (OSError, ValueError) as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.final_url = current
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def check_all(self, urls: Iterable[str]) -> List[LinkResult]:
+        """
+        Check URLs concurrently.
+
+        Args:
+            urls: URLs to check; duplicates are checked once.
+
+        Returns:
+            One result per distinct URL, in first-seen order.
+        """
+        self._connections = asyncio.Semaphore(self.max_connections)
+        self._hosts = {}
+        unique = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.check(url) for url in unique))
+        return list(results)
+
+
+def check_links(
+    urls: Iterable[str],
+    cache: Optional[LinkCache] = None,
+    checker: Optional[LinkChecker] = None,
+) -> List[LinkResult]:
+    """
+    Check URLs, reusing cached results that have not expired.
+
+    Args:
+        urls: URLs to check.
+        cache: Result cache; fresh results are stored and saved.
+        checker: Checker to use (default: a ``LinkChecker`` with the
+            default limits).
+
+    Returns:
+        One result per distinct URL, in first-seen order.
+    """
+    if checker is None:
+        checker = LinkChecker()
+    unique = list(dict.fromkeys(urls))
+    cached = {
+        url: result
+        for url in unique
+        if cache is not None and (result := cache.get(url)) is not None
+    }
+    pending = [url for url in unique if url not in cached]
+    fresh = asyncio.run(checker.check_all(pending)) if pending else []
+    if cache is not None and fresh:
+        for result in fresh:
+            cache.put(result)
+        cache.save()
+    results = {**cached, **{result.url: result for result in fresh}}
+    return [results[url] for url in unique]
+
+
+def catalog_urls() -> List[str]:
+    """
+    Collect the URLs of the learning resource catalog.
+
+    Returns:
+        Every resource URL, in catalog order.
+    """
+    from routes import get_learning_resources
+
+    return [
+        entry.url
+        for entries in get_learning_resources().values()
+        for entry in entries
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Check the catalog links and print a report.
+
+    Args:
+        argv: Command line arguments (defaults to ``sys.argv[1:]``).
+
+    Returns:
+        Exit status: 0 if every link works, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        description="Check the learning resource URLs."
+    )
+    parser.add_argument(
+        "--cache",
+        default=CACHE_FILE,
+        help=f"Result cache file (default: {CACHE_FILE})",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Check every link again"
+    )
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        default=CACHE_TTL / 3600,
+        help="Hours a working link stays cached (default: %(default)g)",
+    )
+    parser.add_argument(
+        "--error-ttl",
+        type=float,
+        default=ERROR_CACHE_TTL / 3600,
+        help="Hours a broken link stays cached (default: %(default)g)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=TIMEOUT,
+        help="Seconds allowed per request (default: %(default)g)",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=MAX_PER_HOST,
+        help="Concurrent requests per host (default: %(default)d)",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=MAX_CONNECTIONS,
+        help="Concurrent requests overall (default: %(default)d)",
+    )
+    parser.add_argument(
+        "urls", nargs="*", help="URLs to check (default: the catalog)"
+    )
+    args = parser.parse_args(argv)
+
+    cache = None
+    if not args.no_cache:
+        cache = LinkCache(
+            args.cache, ttl=args.ttl * 3600, error_ttl=args.error_ttl * 3600
+        )
+    checker = LinkChecker(
+        timeout=args.timeout,
+        max_connections=args.connections,
+        max_per_host=args.per_host,
+    )
+
+    started = time.perf_counter()
+    results = check_links(args.urls or catalog_urls(), cache, checker)
+    elapsed = time.perf_counter() - started
+
+    broken = [result for result in results if not result.ok]
+    for result in results:
+        mark = "✓" if result.ok else "✗"
+        detail = result.error or str(result.status)
+        if result.final_url and result.final_url != result.url:
+            detail += f" -> {result.final_url}"
+        print(f"{mark} {result.url} ({detail})")
+    print(
+        f"\nChecked {len(results)} link(s) in {elapsed:.1f}s: "
+        f"{len(broken)} broken"
+    )
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
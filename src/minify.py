@@ -0,0 +1,295 @@
+"""
+Streaming HTML minification.
+
+The minifier removes comments and collapses whitespace between and inside
+text runs while leaving tags and the contents of ``<pre>``, ``<code>``,
+``<textarea>``, ``<script>`` and ``<style>`` exactly as they are. It works
+on chunks, so it can wrap streamed responses as well as whole documents.
+"""
+
+import codecs
+import re
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+from flask import Flask, Response, request
+
+# Elements whose contents are emitted unchanged
+RAW_ELEMENTS = ("pre", "code", "textarea", "script", "style")
+
+RAW_ELEMENT_START = re.compile(
+    rf"<({'|'.join(RAW_ELEMENTS)})(?=[\s/>])", re.IGNORECASE
+)
+WHITESPACE = re.compile(r"\s+")
+
+
+def _collapse(match: "re.Match[str]") -> str:
+    """Collapse a whitespace run, keeping a line break if it had one."""
+    return "\n" if "\n" in match.group(0) else " "
+
+
+def _find_tag_end(text: str, start: int) -> int:
+    """Find the ``>`` that closes the tag at ``start``, skipping quotes."""
+    quote: Optional[str] = None
+    for index in range(start + 1, len(text)):
+        char = text[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == ">":
+            return index
+    return -1
+
+
+class HTMLMinifier:
+    """
+    Incremental HTML minifier.
+
+    Feed text with ``feed`` and call ``close`` at the end; the
+    concatenated output is the same however the input is split.
+
+    Attributes:
+        bytes_in: UTF-8 size of the input seen so far.
+        bytes_out: UTF-8 size of the output produced so far.
+
+    Example:
+        >>> minifier = HTMLMinifier()
+        >>> minifier.feed("<p>  Hello <!-- note -->")
+        '<p> Hello '
+        >>> minifier.feed("  world </p>") + minifier.close()
+        ' world </p>'
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty minifier."""
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._buffer = ""
+        self._raw_end: Optional[Pattern[str]] = None
+
+    @property
+    def bytes_saved(self) -> int:
+        """Number of bytes removed so far."""
+        return self.bytes_in - self.bytes_out
+
+    def feed(self, chunk: str) -> str:
+        """
+        Minify the next chunk of a document.
+
+        Output for a construct split across chunks (a tag, a comment, a
+        whitespace run) is held back until it is complete.
+
+        Args:
+            chunk: Next piece of HTML.
+
+        Returns:
+            Minified HTML that is ready to be sent.
+        """
+        self.bytes_in += len(chunk.encode("utf-8"))
+        self._buffer += chunk
+        return self._emit(self._process(final=False))
+
+    def close(self) -> str:
+        """
+        Finish the document.
+
+        Returns:
+            Any remaining minified HTML.
+        """
+        return self._emit(self._process(final=True))
+
+    def _emit(self, text: str) -> str:
+        """Count and return output text."""
+        self.bytes_out += len(text.encode("utf-8"))
+        return text
+
+    def _process(self, final: bool) -> str:
+        """Minify as much of the buffer as can be decided."""
+        buffer = self._buffer
+        out: List[str] = []
+        pos = 0
+        more = True
+        while more and pos < len(buffer):
+            if self._raw_end is not None:
+                pos, more = self._raw_text(buffer, pos, final, out)
+            elif buffer.startswith("<!--", pos):
+                pos, more = self._comment(buffer, pos, final, out)
+            elif buffer.startswith("<", pos):
+                pos, more = self._tag(buffer, pos, final, out)
+            else:
+                pos, more = self._text(buffer, pos, final, out)
+        self._buffer = buffer[pos:]
+        return "".join(out)
+
+    # Each state handler below appends output for the construct at
+    # ``pos`` and returns the position after it, along with whether
+    # processing can go on (False means wait for more input).
+
+    def _raw_text(
+        self, buffer: str, pos: int, final: bool, out: List[str]
+    ) -> Tuple[int, bool]:
+        """Copy the contents of a raw element up to its closing tag."""
+        if self._raw_end is None:
+            raise RuntimeError("Not inside a raw element")
+        match = self._raw_end.search(buffer, pos)
+        if match is None:
+            # Hold back a possible partial closing tag
+            safe = len(buffer) if final else buffer.rfind("<", pos)
+            if safe == -1:
+                safe = len(buffer)
+            out.append(buffer[pos:safe])
+            return safe, False
+        out.append(buffer[pos:match.end()])
+        self._raw_end = None
+        return match.end(), True
+
+    def _text(
+        self, buffer: str, pos: int, final: bool, out: List[str]
+    ) -> Tuple[int, bool]:
+        """Collapse whitespace in the text up to the next tag."""
+        lt = buffer.find("<", pos)
+        if lt == -1:
+            text = buffer[pos:]
+            if not final:
+                # A trailing whitespace run may continue in the next chunk
+                text = text.rstrip()
+            out.append(WHITESPACE.sub(_collapse, text))
+            return pos + len(text), False
+        out.append(WHITESPACE.sub(_collapse, buffer[pos:lt]))
+        return lt, True
+
+    def _comment(
+        self, buffer: str, pos: int, final: bool, out: List[str]
+    ) -> Tuple[int, bool]:
+        """Drop a comment, keeping conditional comments."""
+        end = buffer.find("-->", pos + 4)
+        if end == -1:
+            if final:
+                out.append(buffer[pos:])
+                return len(buffer), False
+            return pos, False
+        if buffer.startswith("<!--[if", pos):
+            out.append(buffer[pos:end + 3])
+        return end + 3, True
+
+    def _tag(
+        self, buffer: str, pos: int, final: bool, out: List[str]
+    ) -> Tuple[int, bool]:
+        """Copy a tag, entering the raw state if it opens a raw element."""
+        end = _find_tag_end(buffer, pos)
+        if end == -1:
+            if final:
+                out.append(buffer[pos:])
+                return len(buffer), False
+            return pos, False
+        tag = buffer[pos:end + 1]
+        out.append(tag)
+        raw = RAW_ELEMENT_START.match(tag)
+        if raw and not tag.endswith("/>"):
+            self._raw_end = re.compile(
+                rf"</{raw.group(1)}\s*>", re.IGNORECASE
+            )
+        return end + 1, True
+
+
+def minify_html(html: str) -> str:
+    """
+    Minify a complete HTML document.
+
+    Args:
+        html: HTML to minify.
+
+    Returns:
+        Minified HTML.
+    """
+    minifier = HTMLMinifier()
+    return minifier.feed(html) + minifier.close()
+
+
+def minify_stream(
+    chunks: Iterable[Union[str, bytes]],
+    minifier: Optional[HTMLMinifier] = None,
+) -> Iterator[bytes]:
+    """
+    Minify an iterable of HTML chunks, such as a streamed response body.
+
+    Byte chunks are decoded as UTF-8 incrementally, so multi-byte
+    characters split across chunks are handled.
+
+    Args:
+        chunks: HTML chunks (``str`` or UTF-8 ``bytes``).
+        minifier: Minifier to use, e.g. to read ``bytes_saved`` afterwards.
+
+    Yields:
+        Minified UTF-8 chunks (empty results are skipped).
+    """
+    if minifier is None:
+        minifier = HTMLMinifier()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        output = minifier.feed(text)
+        if output:
+            yield output.encode("utf-8")
+    output = minifier.feed(decoder.decode(b"", final=True)) + minifier.close()
+    if output:
+        yield output.encode("utf-8")
+
+
+def init_html_minifier(app: Flask) -> None:
+    """
+    Minify HTML responses in an ``after_request`` filter.
+
+    Buffered responses are minified in place; streamed responses are
+    wrapped so each chunk is minified as it is sent. The bytes saved are
+    logged at debug level.
+
+    Args:
+        app: Flask application.
+    """
+
+    @app.after_request
+    def minify_response(response: Response) -> Response:
+        """Minify text/html responses."""
+        if (
+            response.mimetype != "text/html"
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        if response.is_streamed:
+            minifier = HTMLMinifier()
+
+            path = request.path
+
+            def minified(body: Iterable[Any]) -> Iterator[bytes]:
+                yield from minify_stream(body, minifier)
+                app.logger.debug(
+                    "Minified %s (streamed): saved %d bytes",
+                    path,
+                    minifier.bytes_saved,
+                )
+
+            response.response = minified(response.response)
+            response.headers.pop("Content-Length", None)
+            return response
+
+        minifier = HTMLMinifier()
+        html = minifier.feed(response.get_data(as_text=True))
+        html += minifier.close()
+        response.set_data(html)
+        app.logger.debug(
+            "Minified %s: saved %d bytes", request.path, minifier.bytes_saved
+        )
+        return response
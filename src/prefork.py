@@ -0,0 +1,691 @@
+"""
+Prefork launcher for production.
+
+``python src/prefork.py`` builds the app once in a master process and
+warms it: templates, catalog, resource and search indexes, and one
+request to every page, so lazily built data and the page cache are
+filled. Then it calls ``gc.freeze()`` and forks workers that accept
+connections on a shared listening socket. The workers start with all of
+this already in memory and share it with the master copy-on-write.
+Because the objects are frozen, the workers' garbage collector never
+writes to them, so those pages are not copied.
+
+The master restarts workers that exit. Workers exit after serving
+``--max-requests`` requests, if set, to release memory they have
+accumulated. Send signals to the master to control it:
+
+    TERM, INT: finish requests in flight, stop the workers and exit.
+    HUP: replace every worker with a fresh one.
+    USR1: log the RSS and shared memory of the master and each worker.
+
+Memory figures come from ``/proc/<pid>/smaps_rollup`` and are only
+available on Linux.
+
+Workers serve HTTP with ``werkzeug.serving``, which is Werkzeug's
+development server: it starts a thread per connection with no upper
+bound, waits briefly for leftover request data after each response and
+has no protection against slow or malicious clients. Run it behind a
+reverse proxy that buffers requests and responses, or serve
+``asgi.create_asgi_app`` with an ASGI server where that is not enough.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from flask import Flask
+from werkzeug.serving import LISTEN_QUEUE, WSGIRequestHandler, make_server
+from werkzeug.wsgi import ClosingIterator
+
+from app import create_app, load_environment
+
+logger = logging.getLogger(__name__)
+
+# Seconds workers get to finish their requests before they are killed
+GRACEFUL_TIMEOUT = 30.0
+
+# Seconds between checks of the master for exited workers and signals
+POLL_INTERVAL = 0.2
+
+# Workers that fail sooner than this many seconds after starting are
+# restarted no earlier than the same delay later, so a broken app does not
+# fork in a loop
+MIN_WORKER_LIFETIME = 1.0
+
+# WSGI environ key holding the tracked response of a request
+RESPONSE_KEY = "prefork.response"
+
+# Signals handled by the master
+MASTER_SIGNALS = (
+    signal.SIGTERM,
+    signal.SIGINT,
+    signal.SIGHUP,
+    signal.SIGUSR1,
+)
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    """
+    Memory of a process, in bytes.
+
+    Attributes:
+        rss: Resident set size.
+        pss: Proportional set size (shared pages divided among the
+            processes that map them).
+        shared: Resident pages also mapped by other processes.
+        private: Resident pages only this process maps.
+    """
+
+    rss: int
+    pss: int
+    shared: int
+    private: int
+
+    def __str__(self) -> str:
+        """Format the figures in megabytes."""
+        return ", ".join(
+            f"{name} {value / (1024 * 1024):.1f} MB"
+            for name, value in (
+                ("rss", self.rss),
+                ("shared", self.shared),
+                ("private", self.private),
+                ("pss", self.pss),
+            )
+        )
+
+
+def parse_smaps_rollup(text: str) -> MemoryUsage:
+    """
+    Read memory figures from the contents of ``/proc/<pid>/smaps_rollup``.
+
+    Args:
+        text: File contents.
+
+    Returns:
+        The process's memory usage.
+    """
+    values: Dict[str, int] = {}
+    for line in text.splitlines():
+        name, _, rest = line.partition(":")
+        fields = rest.split()
+        if len(fields) == 2 and fields[1] == "kB":
+            values[name] = int(fields[0]) * 1024
+    return MemoryUsage(
+        rss=values.get("Rss", 0),
+        pss=values.get("Pss", 0),
+        shared=values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0),
+        private=(
+            values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+        ),
+    )
+
+
+def read_memory(pid: int) -> Optional[MemoryUsage]:
+    """
+    Measure the memory of a process.
+
+    Args:
+        pid: Process ID.
+
+    Returns:
+        The memory usage, or None if it cannot be read (the process has
+        exited, or ``/proc`` has no ``smaps_rollup``).
+    """
+    try:
+        text = Path(f"/proc/{pid}/smaps_rollup").read_text()
+    except OSError:
+        return None
+    return parse_smaps_rollup(text)
+
+
+def warm_app(app: Flask) -> List[str]:
+    """
+    Build everything the app otherwise builds on first use.
+
+    Compiles the templates, loads the catalog, builds the resource and
+    search indexes and requests every page without URL arguments once,
+    which fills the page cache and the asset manifest.
+
+    Args:
+        app: Flask application.
+
+    Returns:
+        Paths of the requested pages.
+    """
+    from api import get_resource_index
+    from catalog import load_catalog
+    from template_cache import prewarm_templates
+
+    prewarm_templates(app)
+    load_catalog()
+    get_resource_index(app)
+    site_search = app.extensions.get("site_search")
+    if site_search is not None:
+        site_search.refresh()
+
+    paths = sorted(
+        rule.rule
+        for rule in app.url_map.iter_rules()
+        if "GET" in (rule.methods or ()) and not rule.arguments
+    )
+    client = app.test_client()
+    for path in paths:
+        client.get(path, buffered=True).close()
+    return paths
+
+
+def preload_app(config: Optional[Dict[str, Any]] = None) -> Flask:
+    """
+    Create and warm the app, then freeze it for forking.
+
+    The garbage collector is disabled while the app is built, so no
+    collection leaves freed gaps between the long-lived objects, and
+    ``gc.freeze()`` then moves every object to the permanent generation.
+    Workers re-enable the collector after the fork.
+
+    Args:
+        config: Configuration overrides passed to ``create_app``.
+
+    Returns:
+        The warmed application.
+    """
+    gc.disable()
+    app = create_app(config)
+    paths = warm_app(app)
+    gc.freeze()
+    logger.info(
+        "Preloaded %d pages, froze %d objects",
+        len(paths),
+        gc.get_freeze_count(),
+    )
+    return app
+
+
+class TrackedResponse(ClosingIterator):
+    """Response iterable whose ``close`` only runs once."""
+
+    closed = False
+
+    def close(self) -> None:
+        """Close the response and run the callbacks, the first time only."""
+        if not self.closed:
+            self.closed = True
+            super().close()
+
+
+class WorkerRequestHandler(WSGIRequestHandler):
+    """
+    Request handler that closes the response when the client is gone.
+
+    Werkzeug does not close the response iterable if the connection
+    drops, which would leave the request counted as in flight.
+    """
+
+    def connection_dropped(
+        self, error: BaseException, environ: Optional[dict] = None
+    ) -> None:
+        """Close the tracked response of the dropped request."""
+        super().connection_dropped(error, environ)
+        response = (environ or {}).get(RESPONSE_KEY)
+        if response is not None:
+            response.close()
+
+
+class RequestTracker:
+    """
+    WSGI middleware that counts the requests of a worker.
+
+    Args:
+        wsgi_app: Application to call.
+        max_requests: Requests after which ``on_limit`` is called (0 for
+            no limit).
+        on_limit: Called once when the limit is reached.
+    """
+
+    def __init__(
+        self,
+        wsgi_app: Callable[..., Any],
+        max_requests: int = 0,
+        on_limit: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Wrap a WSGI application."""
+        self.wsgi_app = wsgi_app
+        self.max_requests = max_requests
+        self.on_limit = on_limit
+        self.served = 0
+        self.active = 0
+        self._idle = threading.Condition()
+
+    def __call__(
+        self, environ: dict, start_response: Callable[..., Any]
+    ) -> Iterable[bytes]:
+        """Call the application and count the request until it is sent."""
+        with self._idle:
+            self.served += 1
+            self.active += 1
+            limit_reached = self.served == self.max_requests
+        if limit_reached and self.on_limit is not None:
+            self.on_limit()
+        try:
+            app_iter = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self._done()
+            raise
+        response = TrackedResponse(app_iter, self._done)
+        environ[RESPONSE_KEY] = response
+        return response
+
+    def _done(self) -> None:
+        with self._idle:
+            self.active -= 1
+            self._idle.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """
+        Wait until no request is in flight.
+
+        Args:
+            timeout: Seconds to wait at most.
+
+        Returns:
+            False if requests were still running after ``timeout``.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self.active == 0, timeout)
+
+
+def run_worker(
+    app: Flask,
+    listener: socket.socket,
+    max_requests: int = 0,
+    graceful_timeout: float = GRACEFUL_TIMEOUT,
+) -> None:
+    """
+    Serve requests in a forked worker until it is told to stop.
+
+    The worker stops on ``SIGTERM`` or after ``max_requests`` requests,
+    then waits up to ``graceful_timeout`` seconds for requests in flight.
+
+    Args:
+        app: Preloaded application.
+        listener: Listening socket shared with the other workers.
+        max_requests: Requests to serve before exiting (0 for no limit).
+        graceful_timeout: Seconds to wait for requests in flight.
+    """
+    gc.enable()
+    for signum in MASTER_SIGNALS:
+        signal.signal(signum, signal.SIG_DFL)
+    # Ctrl+C reaches the whole process group; the master stops workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    stopping = threading.Event()
+
+    def stop() -> None:
+        if not stopping.is_set():
+            stopping.set()
+            # shutdown() waits for serve_forever(), so call it elsewhere
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+    tracker = RequestTracker(app, max_requests, on_limit=stop)
+    host, port = listener.getsockname()[:2]
+    server = make_server(
+        host,
+        port,
+        tracker,
+        threaded=True,
+        request_handler=WorkerRequestHandler,
+        fd=listener.fileno(),
+    )
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop())
+    server.serve_forever()
+    if not tracker.wait_idle(graceful_timeout):
+        logger.warning("Worker %d exits with requests in flight", os.getpid())
+
+
+@dataclass
+class Worker:
+    """
+    A worker process as seen by the master.
+
+    Attributes:
+        number: Position of the worker, kept by its replacements.
+        pid: Process ID.
+        started: ``time.monotonic()`` when it was forked.
+        retiring: Whether it was replaced and must not be restarted.
+    """
+
+    number: int
+    pid: int
+    started: float
+    retiring: bool = False
+
+
+class Arbiter:
+    """
+    Master process that forks and supervises the workers.
+
+    Args:
+        app: Preloaded application.
+        listener: Listening socket for the workers.
+        workers: Number of workers.
+        max_requests: Requests each worker serves before it is replaced
+            (0 for no limit).
+        graceful_timeout: Seconds workers get to stop before they are
+            killed.
+        report_after: Seconds after starting at which the memory report
+            is logged (0 for never; ``SIGUSR1`` logs it at any time).
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        listener: socket.socket,
+        workers: int,
+        max_requests: int = 0,
+        graceful_timeout: float = GRACEFUL_TIMEOUT,
+        report_after: float = 0.0,
+    ) -> None:
+        """Set up the master; no worker is started yet."""
+        self.app = app
+        self.listener = listener
+        self.worker_count = workers
+        self.max_requests = max_requests
+        self.graceful_timeout = graceful_timeout
+        self.workers: Dict[int, Worker] = {}
+        self.report_after = report_after
+        self.stop_deadline: Optional[float] = None
+        # Worker number -> time.monotonic() at which to restart it
+        self.restarts: Dict[int, float] = {}
+        self._signals: List[int] = []
+
+    def spawn(self, number: int) -> Worker:
+        """
+        Fork a worker.
+
+        Args:
+            number: Position of the worker.
+
+        Returns:
+            The new worker.
+        """
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                run_worker(
+                    self.app,
+                    self.listener,
+                    self.max_requests,
+                    self.graceful_timeout,
+                )
+            except BaseException:
+                logger.exception("Worker %d failed", os.getpid())
+                status = 1
+            finally:
+                logging.shutdown()
+                os._exit(status)
+        worker = Worker(number, pid, time.monotonic())
+        self.workers[pid] = worker
+        logger.info("Started worker %d (pid %d)", number, pid)
+        return worker
+
+    def reload(self) -> None:
+        """Replace every worker, starting each replacement first."""
+        for worker in list(self.workers.values()):
+            if worker.retiring:
+                continue
+            worker.retiring = True
+            self.spawn(worker.number)
+            self.kill(worker.pid, signal.SIGTERM)
+
+    def stop(self) -> None:
+        """Ask every worker to stop; they are killed after the timeout."""
+        if self.stop_deadline is None:
+            self.stop_deadline = time.monotonic() + self.graceful_timeout
+            self.restarts.clear()
+            for pid in list(self.workers):
+                self.kill(pid, signal.SIGTERM)
+
+    def kill(self, pid: int, signum: int) -> None:
+        """Send a signal to a worker that may have exited already."""
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def reap(self) -> None:
+        """
+        Collect exited workers and restart them unless stopping.
+
+        Workers that failed shortly after starting are scheduled in
+        ``restarts`` instead, for ``spawn_due`` to start on a later poll.
+        """
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            logger.info(
+                "Worker %d (pid %d) exited with status %d",
+                worker.number,
+                pid,
+                code,
+            )
+            if self.stop_deadline is not None or worker.retiring:
+                continue
+            now = time.monotonic()
+            if code != 0 and now - worker.started < MIN_WORKER_LIFETIME:
+                self.restarts[worker.number] = now + MIN_WORKER_LIFETIME
+            else:
+                self.spawn(worker.number)
+
+    def spawn_due(self) -> None:
+        """Start the workers whose scheduled restart time has come."""
+        now = time.monotonic()
+        for number, restart_at in list(self.restarts.items()):
+            if restart_at <= now:
+                del self.restarts[number]
+                self.spawn(number)
+
+    def memory_report(self) -> List[str]:
+        """
+        Describe the memory of the master and each worker.
+
+        Returns:
+            One line per process.
+        """
+        processes = [("master", os.getpid())] + [
+            (f"worker {worker.number}", worker.pid)
+            for worker in sorted(
+                self.workers.values(), key=lambda worker: worker.number
+            )
+        ]
+        lines = []
+        for name, pid in processes:
+            usage = read_memory(pid)
+            lines.append(
+                f"{name} (pid {pid}): {usage if usage else 'not available'}"
+            )
+        return lines
+
+    def run(self) -> int:
+        """
+        Start the workers and supervise them until stopped.
+
+        Returns:
+            Exit status.
+        """
+        for signum in MASTER_SIGNALS:
+            signal.signal(signum, self._queue_signal)
+        gc.enable()
+        for number in range(self.worker_count):
+            self.spawn(number)
+        report_at = (
+            time.monotonic() + self.report_after if self.report_after else None
+        )
+
+        while self.workers or self.stop_deadline is None:
+            self.handle_signals()
+            if report_at is not None and time.monotonic() >= report_at:
+                report_at = None
+                self._signals.append(signal.SIGUSR1)
+            self.reap()
+            self.spawn_due()
+            if (
+                self.stop_deadline is not None
+                and time.monotonic() > self.stop_deadline
+            ):
+                for pid in list(self.workers):
+                    self.kill(pid, signal.SIGKILL)
+            time.sleep(POLL_INTERVAL)
+        self.listener.close()
+        return 0
+
+    def handle_signals(self) -> None:
+        """Act on the signals received since the last call."""
+        while self._signals:
+            signum = self._signals.pop(0)
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                logger.info("Stopping")
+                self.stop()
+            elif signum == signal.SIGHUP:
+                logger.info("Replacing the workers")
+                self.reload()
+            elif signum == signal.SIGUSR1:
+                for line in self.memory_report():
+                    logger.info("%s", line)
+
+    def _queue_signal(self, signum: int, frame: Any) -> None:
+        self._signals.append(signum)
+
+
+def create_listener(host: str, port: int) -> socket.socket:
+    """
+    Open the listening socket the workers share.
+
+    Args:
+        host: Address to bind.
+        port: Port to bind (0 for any free port).
+
+    Returns:
+        The listening socket.
+    """
+    return socket.create_server((host, port), backlog=LISTEN_QUEUE)
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a command line count that must be at least 1.
+
+    Args:
+        value: Argument value.
+
+    Returns:
+        The count.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive
+            integer.
+    """
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected a positive integer, got {value!r}"
+        )
+    return count
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the prefork server.
+
+    Args:
+        argv: Command line arguments (defaults to ``sys.argv[1:]``).
+
+    Returns:
+        Exit status.
+    """
+    load_environment()
+    parser = argparse.ArgumentParser(
+        description="Serve the app from preloaded, forked workers."
+    )
+    parser.add_argument(
+        "--host",
+        default=os.getenv("FLASK_HOST", "127.0.0.1"),
+        help="Address to bind (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.getenv("FLASK_PORT", "5000")),
+        help="Port to bind (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=positive_int,
+        default=os.getenv("WORKERS", str(os.cpu_count() or 1)),
+        help="Number of worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=int(os.getenv("MAX_REQUESTS", "0")),
+        help="Replace a worker after this many requests (default: never)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT", str(GRACEFUL_TIMEOUT))),
+        help="Seconds workers get to finish requests when stopping "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--memory-report",
+        type=float,
+        metavar="SECONDS",
+        default=0.0,
+        help="Log the memory report this long after starting",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] [%(process)d] %(message)s",
+    )
+
+    listener = create_listener(args.host, args.port)
+    app = preload_app()
+    host, port = listener.getsockname()[:2]
+    logger.info("Listening on http://%s:%d", host, port)
+    arbiter = Arbiter(
+        app,
+        listener,
+        args.workers,
+        args.max_requests,
+        args.graceful_timeout,
+        report_after=args.memory_report,
+    )
+    return arbiter.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""
+Build profiling.
+
+``BuildProfiler`` records how long each build stage takes and, for every
+route, the time spent rendering, rewriting links, writing the file,
+loading templates and compiling them, plus the bytes written. The
+result can be saved as a JSON report, printed as a flame-style text
+summary, and compared with a saved baseline to catch regressions.
+"""
+
+import functools
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from jinja2 import Environment
+
+REPORT_VERSION = 1
+
+# Width of the bars in the text summary
+BAR_WIDTH = 30
+
+# Stages faster than this (in seconds) in the baseline are too noisy to
+# compare
+MIN_COMPARED_DURATION = 0.01
+
+
+@dataclass
+class RouteTiming:
+    """
+    Timings of one rendered route, in seconds.
+
+    Attributes:
+        render: Calling the view and rendering its template.
+        rewrite: Rewriting links for static hosting.
+        write: Writing the output file.
+        load: Loading templates first used by this route: reading the
+            source, checking the bytecode cache and compiling on a miss
+            (included in ``render``).
+        compile: Compiling templates first used by this route (included
+            in ``load``). Templates found in the bytecode cache are not
+            compiled, so this is 0 for them.
+        bytes: Size of the written file.
+    """
+
+    render: float = 0.0
+    rewrite: float = 0.0
+    write: float = 0.0
+    load: float = 0.0
+    compile: float = 0.0
+    bytes: int = 0
+
+    @property
+    def total(self) -> float:
+        """Time spent on the route in total."""
+        return self.render + self.rewrite + self.write
+
+
+@dataclass
+class BuildProfiler:
+    """
+    Collect stage and route timings for a build.
+
+    Attributes:
+        stages: Wall time of each stage, in the order the stages ran.
+        routes: Timings of each route.
+        templates: Compile time of each template.
+        loads: Load time of each template, compiling included.
+        total: Wall time of the whole build.
+
+    Example:
+        >>> profiler = BuildProfiler()
+        >>> with profiler.stage("render"):
+        ...     pass
+        >>> "render" in profiler.stages
+        True
+    """
+
+    stages: Dict[str, float] = field(default_factory=dict)
+    routes: Dict[str, RouteTiming] = field(default_factory=dict)
+    templates: Dict[str, float] = field(default_factory=dict)
+    loads: Dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a build stage; repeated stages accumulate.
+
+        Args:
+            name: Stage name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def route(self, route: str) -> RouteTiming:
+        """
+        Get the timings of a route, creating them on first use.
+
+        Args:
+            route: URL path.
+
+        Returns:
+            The route's timings, to be filled in by the caller.
+        """
+        if route not in self.routes:
+            self.routes[route] = RouteTiming()
+        return self.routes[route]
+
+    @property
+    def compile_time(self) -> float:
+        """Total template compile time so far."""
+        return sum(self.templates.values())
+
+    @property
+    def load_time(self) -> float:
+        """Total template load time so far."""
+        return sum(self.loads.values())
+
+    def instrument_templates(self, env: Environment) -> None:
+        """
+        Record how long a Jinja environment spends on new templates.
+
+        Load time covers everything between a template's first use and a
+        ready template object. Compile time only grows on bytecode cache
+        misses, so with ``TEMPLATE_BYTECODE_CACHE`` on, a warm build
+        shows its template cost as load time.
+
+        Args:
+            env: Environment whose ``compile`` method and loader's
+                ``load`` method are wrapped.
+        """
+        compile_source: Callable[..., Any] = env.compile
+
+        @functools.wraps(compile_source)
+        def timed_compile(
+            source: Any, name: Any = None, *args: Any, **kwargs: Any
+        ) -> Any:
+            """Compile a template and record the time taken."""
+            start = time.perf_counter()
+            try:
+                return compile_source(source, name, *args, **kwargs)
+            finally:
+                key = name or "<string>"
+                self.templates[key] = self.templates.get(key, 0.0) + (
+                    time.perf_counter() - start
+                )
+
+        env.compile = timed_compile  # type: ignore[method-assign]
+
+        loader = env.loader
+        if loader is None:
+            return
+        load_template: Callable[..., Any] = loader.load
+
+        @functools.wraps(load_template)
+        def timed_load(
+            environment: Environment, name: str, *args: Any, **kwargs: Any
+        ) -> Any:
+            """Load a template and record the time taken."""
+            start = time.perf_counter()
+            try:
+                return load_template(environment, name, *args, **kwargs)
+            finally:
+                self.loads[name] = self.loads.get(name, 0.0) + (
+                    time.perf_counter() - start
+                )
+
+        loader.load = timed_load  # type: ignore[method-assign]
+
+    def merge(self, other: "BuildProfiler") -> None:
+        """
+        Add the route and template timings of another profiler.
+
+        Used to collect the timings of worker processes.
+
+        Args:
+            other: Profiler to merge in.
+        """
+        for route, timing in other.routes.items():
+            self.routes[route] = timing
+        for name, seconds in other.templates.items():
+            self.templates[name] = self.templates.get(name, 0.0) + seconds
+        for name, seconds in other.loads.items():
+            self.loads[name] = self.loads.get(name, 0.0) + seconds
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the JSON-serializable report.
+
+        Returns:
+            Report with ``total``, ``stages``, ``routes``,
+            ``templates`` (compile times) and ``loads`` (times in
+            seconds, sizes in bytes).
+        """
+        return {
+            "version": REPORT_VERSION,
+            "total": self.total,
+            "stages": dict(self.stages),
+            "routes": {
+                route: asdict(timing)
+                for route, timing in sorted(self.routes.items())
+            },
+            "templates": dict(sorted(self.templates.items())),
+            "loads": dict(sorted(self.loads.items())),
+        }
+
+    def write_report(self, path: "str | Path") -> Path:
+        """
+        Write the report as JSON.
+
+        Args:
+            path: Report file.
+
+        Returns:
+            Path of the written report.
+        """
+        report_file = Path(path)
+        report_file.write_text(
+            json.dumps(self.report(), indent=2) + "\n", encoding="utf-8"
+        )
+        return report_file
+
+    def summary(self) -> str:
+        """
+        Render a flame-style text summary.
+
+        Each line shows a stage or route with its time, its share of the
+        build and a bar of proportional width. Routes are nested under
+        the render stage, slowest first, with their breakdown below them.
+
+        Returns:
+            The summary text.
+        """
+        total = self.total or sum(self.stages.values()) or 1e-9
+        lines: List[str] = []
+
+        def line(depth: int, label: str, seconds: float) -> None:
+            width = round(BAR_WIDTH * seconds / total)
+            lines.append(
+                f"{'  ' * depth + label:<36} {seconds * 1000:9.1f} ms "
+                f"{seconds / total:6.1%} {'█' * width}"
+            )
+
+        line(0, "build", total)
+        for name, seconds in self.stages.items():
+            line(1, name, seconds)
+            if name != "render":
+                continue
+            ranked = sorted(
+                self.routes.items(), key=lambda item: -item[1].total
+            )
+            for route, timing in ranked:
+                line(2, f"{route} ({timing.bytes:,} B)", timing.total)
+                line(3, "render", timing.render)
+                if timing.load:
+                    line(4, "load", timing.load)
+                if timing.compile:
+                    line(5, "compile", timing.compile)
+                line(3, "rewrite", timing.rewrite)
+                line(3, "write", timing.write)
+        return "\n".join(lines)
+
+
+def load_report(path: "str | Path") -> Dict[str, Any]:
+    """
+    Load a report written by ``BuildProfiler.write_report``.
+
+    Args:
+        path: Report file.
+
+    Returns:
+        The report.
+
+    Raises:
+        ValueError: If the file is not a report of this version.
+    """
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(report, dict) or report.get("version") != REPORT_VERSION:
+        raise ValueError(f"{path} is not a build profile report")
+    return report
+
+
+def find_regressions(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_regression: float,
+    min_duration: float = MIN_COMPARED_DURATION,
+) -> List[str]:
+    """
+    Compare stage timings with a baseline.
+
+    Args:
+        report: Current report.
+        baseline: Baseline report.
+        max_regression: Allowed slowdown per stage, in percent.
+        min_duration: Stages that took less than this many seconds in the
+            baseline are not compared, since their timings are mostly
+            noise.
+
+    Returns:
+        One message per stage (or the build total) that got slower than
+        allowed; empty if there is no regression.
+    """
+    pairs = [("total", report.get("total", 0.0), baseline.get("total", 0.0))]
+    pairs += [
+        (f"stage {name}", seconds, baseline["stages"][name])
+        for name, seconds in report.get("stages", {}).items()
+        if name in baseline.get("stages", {})
+    ]
+
+    regressions = []
+    for label, current, previous in pairs:
+        if previous < min_duration:
+            continue
+        change = (current - previous) / previous * 100
+        if change > max_regression:
+            regressions.append(
+                f"{label}: {previous * 1000:.1f} ms -> "
+                f"{current * 1000:.1f} ms (+{change:.1f}%, "
+                f"limit {max_regression:g}%)"
+            )
+    return regressions
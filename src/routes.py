@@ -5,10 +5,16 @@ This module defines all the routes and their handlers for the Flask
 application, including pages for home, resources, examples, and about.
 """
 
-from typing import Any, Dict, List
+from typing import Mapping, Tuple, Union
 from urllib.parse import urlparse
 
-from flask import Flask, render_template
+from flask import Flask, Response
+
+from catalog import Example, Resource, load_catalog
+from streaming import render_page
+
+# A rendered page, or a streamed response for pages in STREAMED_PAGES
+Page = Union[str, Response]
 
 
 def sanitize_url(url: str) -> str:
@@ -43,21 +49,21 @@ def register_routes(app: Flask) -> None:
     """
 
     @app.route("/")
-    def home() -> str:
+    def home() -> Page:
         """
         Render the home page.
 
         Returns:
             Rendered home page template.
         """
-        return render_template(
+        return render_page(
             "home.html",
             title="GitHub Copilot Demo",
             active_page="home",
         )
 
     @app.route("/resources")
-    def resources() -> str:
+    def resources() -> Page:
         """
         Render the resources page with learning materials.
 
@@ -65,7 +71,7 @@ def register_routes(app: Flask) -> None:
             Rendered resources page template.
         """
         learning_resources = get_learning_resources()
-        return render_template(
+        return render_page(
             "resources.html",
             title="Learning Resources",
             active_page="resources",
@@ -73,7 +79,7 @@ def register_routes(app: Flask) -> None:
         )
 
     @app.route("/examples")
-    def examples() -> str:
+    def examples() -> Page:
         """
         Render the examples page showcasing Copilot features.
 
@@ -81,7 +87,7 @@ def register_routes(app: Flask) -> None:
             Rendered examples page template.
         """
         copilot_examples = get_copilot_examples()
-        return render_template(
+        return render_page(
             "examples.html",
             title="Copilot Examples",
             active_page="examples",
@@ -89,21 +95,21 @@ def register_routes(app: Flask) -> None:
         )
 
     @app.route("/about")
-    def about() -> str:
+    def about() -> Page:
         """
         Render the about page.
 
         Returns:
             Rendered about page template.
         """
-        return render_template(
+        return render_page(
             "about.html",
             title="About This Project",
             active_page="about",
         )
 
     @app.route("/author")
-    def author() -> str:
+    def author() -> Page:
         """
         Render the author page with information about Raisa Energy.
 
@@ -112,7 +118,7 @@ def register_routes(app: Flask) -> None:
         """
         # Sanitize the creator's website URL
         creator_url = sanitize_url("https://agharib.com")
-        return render_template(
+        return render_page(
             "author.html",
             title="About the Author",
             active_page="author",
@@ -120,383 +126,50 @@ def register_routes(app: Flask) -> None:
         )
 
     @app.route("/tutorials")
-    def tutorials() -> str:
+    def tutorials() -> Page:
         """
         Render the tutorials page with customization guides.
 
         Returns:
             Rendered tutorials page template.
         """
-        return render_template(
+        return render_page(
             "tutorials.html",
             title="Customization Tutorials",
             active_page="tutorials",
         )
 
     @app.route("/copilot-integration")
-    def copilot_integration() -> str:
+    def copilot_integration() -> Page:
         """
         Render the Copilot integration page with setup guides and prompts.
 
         Returns:
             Rendered copilot-integration page template.
         """
-        return render_template(
+        return render_page(
             "copilot-integration.html",
             title="Use with GitHub Copilot",
             active_page="copilot-integration",
         )
 
 
-def get_learning_resources() -> Dict[str, List[Dict[str, Any]]]:
+def get_learning_resources() -> Mapping[str, Tuple[Resource, ...]]:
     """
     Get categorized GitHub Copilot learning resources.
 
     Returns:
-        Dictionary of resource categories with lists of resources.
+        Read-only mapping of resource categories to their resources,
+        shared by all callers.
     """
-    return {
-        "documentation": [
-            {
-                "title": "GitHub Copilot Documentation",
-                "description": (
-                    "Comprehensive documentation for GitHub Copilot, "
-                    "covering usage, integration, and best practices"
-                ),
-                "url": "https://docs.github.com/copilot",
-                "cost": "Free",
-            },
-            {
-                "title": "GitHub Copilot in VS Code",
-                "description": (
-                    "Official documentation for using GitHub Copilot in "
-                    "Visual Studio Code, including advanced features"
-                ),
-                "url": "https://code.visualstudio.com/docs/copilot/overview",
-                "cost": "Free",
-            },
-            {
-                "title": "GitHub Copilot Quickstart",
-                "description": (
-                    "Quick start guide to get up and running with "
-                    "GitHub Copilot in minutes"
-                ),
-                "url": "https://docs.github.com/en/copilot/quickstart",
-                "cost": "Free",
-            },
-            {
-                "title": "GitHub Copilot Chat Documentation",
-                "description": (
-                    "Documentation for GitHub Copilot Chat features "
-                    "across different environments"
-                ),
-                "url": "https://docs.github.com/en/copilot/github-copilot-chat",
-                "cost": "Free",
-            },
-            {
-                "title": "GitHub Copilot CLI Documentation",
-                "description": (
-                    "Guide to using GitHub Copilot in the command "
-                    "line interface"
-                ),
-                "url": (
-                    "https://docs.github.com/en/copilot/"
-                    "github-copilot-in-the-cli"
-                ),
-                "cost": "Free",
-            },
-        ],
-        "getting_started": [
-            {
-                "title": "Essentials of GitHub Copilot",
-                "description": (
-                    "A learning pathway covering the basics of GitHub "
-                    "Copilot, including common questions and expert insights"
-                ),
-                "url": (
-                    "https://resources.github.com/learn/pathways/copilot/"
-                    "essentials/essentials-of-github-copilot/"
-                ),
-                "cost": "Free",
-            },
-            {
-                "title": "Getting Started with GitHub Copilot",
-                "description": (
-                    "Step-by-step tutorials for beginners to unlock the "
-                    "full potential of GitHub Copilot"
-                ),
-                "url": "https://github.com/features/copilot/tutorials",
-                "cost": "Free",
-            },
-            {
-                "title": "GitHub Copilot Learning Pathways",
-                "description": (
-                    "Expert-guided learning pathways for AI-powered "
-                    "development with GitHub Copilot"
-                ),
-                "url": "https://resources.github.com/learn/pathways/",
-                "cost": "Free",
-            },
-        ],
-        "microsoft_learn": [
-            {
-                "title": "GitHub Copilot Fundamentals (Microsoft Learn)",
-                "description": (
-                    "Official Microsoft training modules on GitHub Copilot "
-                    "fundamentals, productivity, and business use cases"
-                ),
-                "url": "https://learn.microsoft.com/en-us/training/paths/copilot/",
-                "platform": "Microsoft Learn",
-                "level": "Beginner to Intermediate",
-                "cost": "Free",
-            },
-            {
-                "title": "Generate Documentation Using GitHub Copilot Tools",
-                "description": (
-                    "Intermediate module on using Copilot Chat for code "
-                    "explanations and documentation"
-                ),
-                "url": (
-                    "https://learn.microsoft.com/en-us/training/modules/"
-                    "generate-documentation-using-github-copilot-tools/"
-                ),
-                "platform": "Microsoft Learn",
-                "level": "Intermediate",
-                "cost": "Free",
-            },
-        ],
-        "courses": [
-            {
-                "title": "Boost Your Productivity with GitHub Copilot",
-                "description": (
-                    "Beginner-level course covering setup, prompt "
-                    "engineering, and best practices for GitHub Copilot"
-                ),
-                "url": "https://www.coursera.org/learn/introduction-to-github-copilot",
-                "platform": "Coursera",
-                "level": "Beginner",
-                "cost": "Free (with paid certificate)",
-            },
-            {
-                "title": "Introduction to GitHub Copilot",
-                "description": (
-                    "Intermediate course covering setup, database "
-                    "integration, and real-world scenarios"
-                ),
-                "url": (
-                    "https://www.coursera.org/learn/"
-                    "introduction-to-microsoft-github-copilot"
-                ),
-                "platform": "Coursera",
-                "level": "Intermediate",
-                "cost": "Free (with paid certificate)",
-            },
-            {
-                "title": "GitHub Copilot: The AI Pair Programmer for Coding",
-                "description": (
-                    "Short course on AI-assisted programming and best "
-                    "practices with GitHub Copilot"
-                ),
-                "url": (
-                    "https://www.coursera.org/learn/"
-                    "github-copilot-the-ai-pair-programmer-for-coding"
-                ),
-                "platform": "Coursera",
-                "level": "Beginner",
-                "cost": "Free (with paid certificate)",
-            },
-        ],
-        "videos": [
-            {
-                "title": "Introduction to GitHub Copilot Tutorial",
-                "description": (
-                    "Beginner-friendly video tutorial covering "
-                    "installation, usage, and productivity tips"
-                ),
-                "url": "https://www.youtube.com/watch?v=2pFPJYdPM7Q",
-                "platform": "YouTube",
-                "cost": "Free",
-            },
-            {
-                "title": "First Hour with GitHub Copilot",
-                "description": (
-                    "Practical walkthrough of Copilot features, prompt "
-                    "best practices, and code completion"
-                ),
-                "url": "https://www.youtube.com/watch?v=7GtrNVoJatE",
-                "platform": "YouTube",
-                "cost": "Free",
-            },
-            {
-                "title": "How to Use GitHub Copilot (Complete Beginner's Guide)",
-                "description": (
-                    "In-depth beginner's guide covering prompt "
-                    "engineering, security, and practical coding examples"
-                ),
-                "url": "https://www.youtube.com/watch?v=SJqGYwRq0uc",
-                "platform": "YouTube",
-                "cost": "Free",
-            },
-            {
-                "title": "Coding with an AI Pair Programmer: Getting Started",
-                "description": (
-                    "Introduction to GitHub Copilot mechanics, data "
-                    "handling, and workflow adaptation"
-                ),
-                "url": "https://www.youtube.com/watch?v=dhfTaSGYQ4o",
-                "platform": "YouTube",
-                "cost": "Free",
-            },
-            {
-                "title": "GitHub YouTube Channel",
-                "description": (
-                    "Official GitHub YouTube channel with Copilot "
-                    "tutorials and announcements"
-                ),
-                "url": "https://www.youtube.com/@GitHub",
-                "platform": "YouTube",
-                "cost": "Free",
-            },
-        ],
-        "certification": [
-            {
-                "title": "GitHub Copilot Certification Study Guide",
-                "description": (
-                    "Official study guide and resources for preparing "
-                    "for the GitHub Copilot certification exam"
-                ),
-                "url": "https://learn.github.com/certification/COPILOT",
-                "cost": "Free",
-            },
-            {
-                "title": (
-                    "Free Official Learning Resources for Copilot Certification"
-                ),
-                "description": (
-                    "Comprehensive guide to official resources, modules, "
-                    "and exam preparation for GitHub Copilot certification"
-                ),
-                "url": (
-                    "https://dellenny.com/free-official-learning-resources"
-                    "-for-the-github-copilot-certification-exam/"
-                ),
-                "cost": "Free",
-            },
-        ],
-        "community": [
-            {
-                "title": "GitHub Copilot Community Discussions",
-                "description": (
-                    "Official community forum for GitHub Copilot "
-                    "discussions, questions, and feedback"
-                ),
-                "url": (
-                    "https://github.com/orgs/community/discussions/"
-                    "categories/copilot"
-                ),
-                "cost": "Free",
-            },
-            {
-                "title": "Awesome GitHub Copilot",
-                "description": (
-                    "Curated list of GitHub Copilot resources, projects, "
-                    "and extensions"
-                ),
-                "url": "https://github.com/github/awesome-copilot/tree/main",
-                "cost": "Free",
-            },
-
-        ],
-        "best_practices": [
-            {
-                "title": "How to write better prompts for GitHub Copilot",
-                "description": (
-                    "Learn best practices for crafting effective prompts "
-                    "to get better results from Copilot"
-                ),
-                "url": (
-                    "https://github.blog/2023-06-20-how-to-write-better"
-                    "-prompts-for-github-copilot/"
-                ),
-                "cost": "Free",
-            },
-            {
-                "title": "GitHub Copilot Best Practices",
-                "description": (
-                    "Official best practices for using GitHub Copilot "
-                    "effectively"
-                ),
-                "url": (
-                    "https://docs.github.com/en/copilot/using-github-copilot/"
-                    "getting-started-with-github-copilot"
-                    "#best-practices-for-using-github-copilot"
-                ),
-                "cost": "Free",
-            },
-        ],
-    }
-
-
-def get_copilot_examples() -> List[Dict[str, Any]]:
+    return load_catalog().resources
+
+
+def get_copilot_examples() -> Tuple[Example, ...]:
     """
     Get list of GitHub Copilot feature examples.
 
     Returns:
-        List of dictionaries containing example information.
+        The feature examples, shared by all callers.
     """
-    return [
-        {
-            "title": "Code Completion",
-            "description": "Copilot suggests code completions as you type",
-            "features": [
-                "Context-aware suggestions",
-                "Multiple language support",
-                "Function and class generation",
-            ],
-        },
-        {
-            "title": "Documentation Generation",
-            "description": "Generate docstrings and comments automatically",
-            "features": [
-                "PEP 257 compliant docstrings",
-                "Parameter descriptions",
-                "Return value documentation",
-            ],
-        },
-        {
-            "title": "Test Generation",
-            "description": "Create comprehensive test cases with pytest",
-            "features": [
-                "Unit test generation",
-                "Edge case coverage",
-                "Fixture creation",
-            ],
-        },
-        {
-            "title": "Code Refactoring",
-            "description": "Refactor existing code following best practices",
-            "features": [
-                "Function extraction",
-                "Variable renaming",
-                "Code optimization",
-            ],
-        },
-        {
-            "title": "Bug Fixing",
-            "description": "Identify and fix bugs with Copilot assistance",
-            "features": [
-                "Error analysis",
-                "Solution suggestions",
-                "Error handling improvements",
-            ],
-        },
-        {
-            "title": "Code Translation",
-            "description": "Convert code between different languages",
-            "features": [
-                "Multi-language support",
-                "Idiom preservation",
-                "Best practices application",
-            ],
-        },
-    ]
+    return load_catalog().examples
@@ -0,0 +1,361 @@
+"""
+Prefix-sharded inverted index for client-side search.
+
+The index is a set of small JSON files: ``index.json`` lists the
+documents and the available shards, and each shard holds the terms that
+start with one prefix (``co.json`` holds ``code``, ``copilot``, ...).
+The prefix length grows with the index so shards stay small.
+A term's postings are a flat list of ``[doc gap, term frequency, ...]``
+pairs, where each doc gap is the difference from the previous document
+id, so most numbers are small. A browser only loads the shards of the
+terms in its query.
+"""
+
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+INDEX_VERSION = 1
+
+# Name of the file listing the documents and shards
+INDEX_NAME = "index.json"
+
+# Shards are keyed by the shortest term prefix (up to MAX_PREFIX_LENGTH
+# characters) that keeps every shard under MAX_SHARD_BYTES
+MAX_PREFIX_LENGTH = 3
+MAX_SHARD_BYTES = 16 * 1024
+
+# Each title word counts this many times towards a term's frequency
+TITLE_WEIGHT = 3
+
+# Maximum length of the summary stored with each document
+SUMMARY_LENGTH = 160
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be but by for from has have how in into is it its
+    of on or that the their this to was were what when which will with
+    you your
+    """.split()
+)
+
+
+@dataclass
+class SearchDocument:
+    """
+    A searchable page or catalog entry.
+
+    Attributes:
+        title: Title shown in results.
+        url: Link target.
+        text: Body text to index.
+        kind: Label shown with the result, e.g. ``Page`` or a category.
+        summary: Short text shown under the title.
+    """
+
+    title: str
+    url: str
+    text: str
+    kind: str
+    summary: str = ""
+
+
+def fold(text: str) -> str:
+    """
+    Case-fold text and strip accents.
+
+    Args:
+        text: Text to fold.
+
+    Returns:
+        The folded text.
+
+    Example:
+        >>> fold("Café")
+        'cafe'
+    """
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in folded if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms.
+
+    Text is folded with ``fold``; stopwords and single-character tokens
+    are dropped.
+
+    Args:
+        text: Text to split.
+
+    Returns:
+        Terms in order of appearance.
+
+    Example:
+        >>> tokenize("Getting Started with GitHub Copilot's CLI")
+        ['getting', 'started', 'github', 'copilot', 'cli']
+    """
+    return [
+        token
+        for token in TOKEN.findall(fold(text))
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def encode_postings(postings: Sequence[Tuple[int, int]]) -> List[int]:
+    """
+    Delta-encode a posting list.
+
+    Args:
+        postings: (document id, term frequency) pairs sorted by id.
+
+    Returns:
+        Flat ``[gap, frequency, gap, frequency, ...]`` list.
+
+    Example:
+        >>> encode_postings([(3, 1), (7, 2), (8, 1)])
+        [3, 1, 4, 2, 1, 1]
+    """
+    encoded: List[int] = []
+    previous = 0
+    for doc_id, frequency in postings:
+        encoded += [doc_id - previous, frequency]
+        previous = doc_id
+    return encoded
+
+
+def decode_postings(encoded: Sequence[int]) -> List[Tuple[int, int]]:
+    """
+    Decode a posting list written by ``encode_postings``.
+
+    Args:
+        encoded: Flat ``[gap, frequency, ...]`` list.
+
+    Returns:
+        (document id, term frequency) pairs.
+    """
+    postings = []
+    doc_id = 0
+    for index in range(0, len(encoded), 2):
+        doc_id += encoded[index]
+        postings.append((doc_id, encoded[index + 1]))
+    return postings
+
+
+def choose_prefix_length(
+    sizes: Dict[str, int], max_bytes: int = MAX_SHARD_BYTES
+) -> int:
+    """
+    Pick the shortest prefix length that keeps shards under a size.
+
+    Args:
+        sizes: Approximate encoded size of each term's entry.
+        max_bytes: Target maximum shard size.
+
+    Returns:
+        A prefix length between 1 and ``MAX_PREFIX_LENGTH``.
+    """
+    for length in range(1, MAX_PREFIX_LENGTH):
+        shard_sizes: Counter[str] = Counter()
+        for term, size in sizes.items():
+            shard_sizes[term[:length]] += size
+        if max(shard_sizes.values(), default=0) <= max_bytes:
+            return length
+    return MAX_PREFIX_LENGTH
+
+
+def summarize(text: str, length: int = SUMMARY_LENGTH) -> str:
+    """
+    Shorten text to at most ``length`` characters at a word boundary.
+
+    Args:
+        text: Text to shorten.
+        length: Maximum length.
+
+    Returns:
+        The text, with an ellipsis if it was cut.
+    """
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0] + "…"
+
+
+def build_search_index(
+    documents: Iterable[SearchDocument],
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, List[int]]]]:
+    """
+    Build the sharded inverted index.
+
+    Args:
+        documents: Documents to index; their position is their id.
+
+    Returns:
+        The index description (documents, prefix length, shard keys and
+        document count) and the shards, keyed by prefix, each mapping
+        term to encoded postings.
+    """
+    docs: List[Dict[str, str]] = []
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    for doc_id, document in enumerate(documents):
+        docs.append({
+            "title": document.title,
+            "url": document.url,
+            "kind": document.kind,
+            "summary": document.summary or summarize(document.text),
+        })
+        counts = Counter(tokenize(document.text))
+        for term in tokenize(document.title):
+            counts[term] += TITLE_WEIGHT
+        for term, frequency in counts.items():
+            postings.setdefault(term, []).append((doc_id, frequency))
+
+    encoded = {
+        term: encode_postings(postings[term]) for term in sorted(postings)
+    }
+    prefix = choose_prefix_length({
+        term: len(term) + len(json.dumps(entries)) + 4
+        for term, entries in encoded.items()
+    })
+    shards: Dict[str, Dict[str, List[int]]] = {}
+    for term, entries in encoded.items():
+        shards.setdefault(term[:prefix], {})[term] = entries
+    index = {
+        "version": INDEX_VERSION,
+        "prefix": prefix,
+        "count": len(docs),
+        "shards": sorted(shards),
+        "stopwords": sorted(STOPWORDS),
+        "docs": docs,
+    }
+    return index, shards
+
+
+def write_search_index(
+    directory: Path, documents: Iterable[SearchDocument]
+) -> Dict[str, int]:
+    """
+    Build the index and write it as JSON files into a directory.
+
+    Shard files left over from an earlier index are removed.
+
+    Args:
+        directory: Directory to write ``INDEX_NAME`` and the shards to.
+        documents: Documents to index.
+
+    Returns:
+        Counts of ``documents``, ``terms``, ``shards`` and total
+        ``bytes`` written.
+    """
+    index, shards = build_search_index(documents)
+    directory.mkdir(parents=True, exist_ok=True)
+    files = {INDEX_NAME: index}
+    files.update({f"{key}.json": shard for key, shard in shards.items()})
+    for stale in directory.glob("*.json"):
+        if stale.name not in files:
+            stale.unlink()
+
+    size = 0
+    for name, content in files.items():
+        data = json.dumps(content, separators=(",", ":"), ensure_ascii=False)
+        encoded = data.encode("utf-8")
+        path = directory / name
+        if not path.exists() or path.read_bytes() != encoded:
+            path.write_bytes(encoded)
+        size += len(encoded)
+    return {
+        "documents": index["count"],
+        "terms": sum(len(shard) for shard in shards.values()),
+        "shards": len(shards),
+        "bytes": size,
+    }
+
+
+def shard_keys(index: Dict[str, Any], term: str, partial: bool) -> List[str]:
+    """
+    Get the keys of the shards that can hold a query term.
+
+    Args:
+        index: Index description from ``build_search_index``.
+        term: Query term.
+        partial: Whether the term also matches as a prefix. A partial
+            term shorter than the index's prefix length can match terms
+            in every shard whose key starts with it.
+
+    Returns:
+        Shard keys, some of which may not exist in the index.
+
+    Example:
+        >>> index = {"prefix": 3, "shards": ["co", "cod", "cop", "da"]}
+        >>> shard_keys(index, "co", True)
+        ['co', 'cod', 'cop']
+    """
+    prefix = index["prefix"]
+    if partial and len(term) < prefix:
+        return [key for key in index["shards"] if key.startswith(term)]
+    return [term[:prefix]]
+
+
+def search(
+    index: Dict[str, Any],
+    shards: Dict[str, Dict[str, List[int]]],
+    query: str,
+    limit: int = 10,
+) -> List[Dict[str, str]]:
+    """
+    Run a query against a built index, as the browser does.
+
+    Every query term must match; the last term also matches as a prefix,
+    so results update while a word is being typed. Documents are ranked
+    by the sum of term frequency times inverse document frequency.
+
+    Args:
+        index: Index description from ``build_search_index``.
+        shards: Shards from ``build_search_index``.
+        query: Search text.
+        limit: Maximum number of results.
+
+    Returns:
+        Matching documents, best first.
+    """
+    terms = tokenize(query)
+    if not terms:
+        return []
+
+    count = index["count"]
+    scores: Dict[int, float] = {}
+    for position, term in enumerate(terms):
+        partial = position == len(terms) - 1
+        shard: Dict[str, List[int]] = {}
+        for key in shard_keys(index, term, partial):
+            shard.update(shards.get(key, {}))
+        if partial:
+            matches = [name for name in shard if name.startswith(term)]
+        else:
+            matches = [term] if term in shard else []
+        term_scores: Dict[int, float] = {}
+        for name in matches:
+            entries = decode_postings(shard[name])
+            idf = math.log(1 + count / len(entries))
+            for doc_id, frequency in entries:
+                term_scores[doc_id] = (
+                    term_scores.get(doc_id, 0.0) + frequency * idf
+                )
+        if position == 0:
+            scores = term_scores
+        else:
+            scores = {
+                doc_id: score + term_scores[doc_id]
+                for doc_id, score in scores.items()
+                if doc_id in term_scores
+            }
+
+    ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+    return [index["docs"][doc_id] for doc_id in ranked[:limit]]
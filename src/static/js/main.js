@@ -109,6 +109,210 @@ document.addEventListener('DOMContentLoaded', function() {
         observer.observe(card);
     });
 
+    // Client-side search over the index written by build.py
+    const searchMeta = document.querySelector('meta[name="search-index"]');
+    if (searchMeta && navMenu) {
+        setupSearch(searchMeta.getAttribute('content'));
+    }
+
+    /**
+     * Add a search box to the navigation that queries the prebuilt index.
+     *
+     * The index description is fetched on first use, and then only the
+     * shards holding the query's terms. Every term must match; the last
+     * one also matches as a prefix so results update while typing.
+     *
+     * @param {string} indexUrl - URL of the search index description
+     */
+    function setupSearch(indexUrl) {
+        const shardUrl = indexUrl.slice(0, indexUrl.lastIndexOf('/') + 1);
+        const shards = new Map();
+        const maxResults = 8;
+        let index = null;
+        let latestQuery = '';
+        let timer = null;
+
+        const item = document.createElement('li');
+        item.className = 'nav-item nav-search';
+        const input = document.createElement('input');
+        input.type = 'search';
+        input.className = 'search-input';
+        input.placeholder = 'Search…';
+        input.setAttribute('aria-label', 'Search pages and resources');
+        const results = document.createElement('ul');
+        results.className = 'search-results';
+        results.hidden = true;
+        item.append(input, results);
+        navMenu.insertBefore(item, navMenu.lastElementChild);
+
+        function fetchJson(url) {
+            return fetch(url).then(response => {
+                if (!response.ok) {
+                    throw new Error(`${url}: ${response.status}`);
+                }
+                return response.json();
+            });
+        }
+
+        function loadIndex() {
+            if (!index) {
+                index = fetchJson(indexUrl).then(data => {
+                    data.stopwords = new Set(data.stopwords);
+                    data.shards = new Set(data.shards);
+                    return data;
+                });
+            }
+            return index;
+        }
+
+        function loadShard(data, key) {
+            if (!data.shards.has(key)) {
+                return Promise.resolve({});
+            }
+            if (!shards.has(key)) {
+                shards.set(key, fetchJson(`${shardUrl}${key}.json`));
+            }
+            return shards.get(key);
+        }
+
+        // A last term shorter than the prefix can match in several shards
+        function loadTermShards(data, term, partial) {
+            const keys = partial && term.length < data.prefix
+                ? [...data.shards].filter(key => key.startsWith(term))
+                : [term.slice(0, data.prefix)];
+            return Promise.all(keys.map(key => loadShard(data, key)))
+                .then(loaded => Object.assign({}, ...loaded));
+        }
+
+        function tokenize(text, stopwords) {
+            const tokens = text.normalize('NFKD')
+                .replace(/[\u0300-\u036f]/g, '')
+                .toLowerCase()
+                .match(/[a-z0-9]+/g) || [];
+            return tokens.filter(token => token.length > 1 && !stopwords.has(token));
+        }
+
+        async function search(query) {
+            const data = await loadIndex();
+            const terms = tokenize(query, data.stopwords);
+            if (!terms.length) {
+                return [];
+            }
+            const termShards = await Promise.all(terms.map((term, position) =>
+                loadTermShards(data, term, position === terms.length - 1)));
+
+            let scores = null;
+            terms.forEach((term, position) => {
+                const shard = termShards[position];
+                const names = position === terms.length - 1
+                    ? Object.keys(shard).filter(name => name.startsWith(term))
+                    : Object.keys(shard).filter(name => name === term);
+                const termScores = new Map();
+                names.forEach(name => {
+                    // Postings are [doc gap, frequency, ...] pairs
+                    const postings = shard[name];
+                    const idf = Math.log(1 + data.count / (postings.length / 2));
+                    let doc = 0;
+                    for (let i = 0; i < postings.length; i += 2) {
+                        doc += postings[i];
+                        termScores.set(doc, (termScores.get(doc) || 0) + postings[i + 1] * idf);
+                    }
+                });
+                if (scores === null) {
+                    scores = termScores;
+                } else {
+                    const combined = new Map();
+                    scores.forEach((score, doc) => {
+                        if (termScores.has(doc)) {
+                            combined.set(doc, score + termScores.get(doc));
+                        }
+                    });
+                    scores = combined;
+                }
+            });
+
+            return [...scores.entries()]
+                .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+                .slice(0, maxResults)
+                .map(([doc]) => data.docs[doc]);
+        }
+
+        function showResults(docs) {
+            results.replaceChildren();
+            if (!docs.length) {
+                const empty = document.createElement('li');
+                empty.className = 'search-empty';
+                empty.textContent = 'No results';
+                results.append(empty);
+            }
+            docs.forEach(doc => {
+                const entry = document.createElement('li');
+                const link = document.createElement('a');
+                link.className = 'search-result';
+                link.href = doc.url;
+                if (/^https?:/.test(doc.url)) {
+                    link.target = '_blank';
+                    link.rel = 'noopener';
+                }
+                const title = document.createElement('span');
+                title.className = 'search-result-title';
+                title.textContent = doc.title;
+                const kind = document.createElement('span');
+                kind.className = 'search-result-kind';
+                kind.textContent = doc.kind;
+                const summary = document.createElement('span');
+                summary.className = 'search-result-summary';
+                summary.textContent = doc.summary;
+                link.append(title, kind, summary);
+                entry.append(link);
+                results.append(entry);
+            });
+            results.hidden = false;
+        }
+
+        input.addEventListener('input', function() {
+            clearTimeout(timer);
+            const query = input.value.trim();
+            latestQuery = query;
+            if (!query) {
+                results.hidden = true;
+                return;
+            }
+            timer = setTimeout(async () => {
+                try {
+                    const docs = await search(query);
+                    if (query === latestQuery) {
+                        showResults(docs);
+                    }
+                } catch (err) {
+                    console.error('Search failed:', err);
+                }
+            }, 100);
+        });
+
+        input.addEventListener('keydown', function(event) {
+            if (event.key === 'Escape') {
+                input.value = '';
+                latestQuery = '';
+                results.hidden = true;
+            } else if (event.key === 'Enter') {
+                const first = results.querySelector('a');
+                if (first) {
+                    first.click();
+                }
+            }
+        });
+
+        // Load the index description as soon as the box is used
+        input.addEventListener('focus', () => loadIndex().catch(() => {}), { once: true });
+
+        document.addEventListener('click', function(event) {
+            if (!item.contains(event.target)) {
+                results.hidden = true;
+            }
+        });
+    }
+
     // Console message for developers
     console.log('%c🤖 GitHub Copilot Demo', 'font-size: 20px; font-weight: bold; color: #0969da;');
     console.log('%cThis project was built with GitHub Copilot assistance!', 'font-size: 14px; color: #57606a;');
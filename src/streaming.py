@@ -0,0 +1,91 @@
+"""
+Streamed rendering of large pages.
+
+Pages listed in the ``STREAMED_PAGES`` config are rendered with Jinja's
+generator interface instead of into one string. The ``<head>`` and the
+``<nav>`` of ``base.html`` are sent as soon as they are rendered, so the
+browser can request ``style.css`` while the rest of the page is still
+being produced; after that, output is sent in chunks of about
+``STREAM_CHUNK_SIZE`` characters.
+"""
+
+from typing import Any, Iterable, Iterator, List, Union
+
+from flask import Response, current_app, render_template, request
+from flask import stream_template
+
+# The output rendered so far is flushed with the piece containing this
+# text (the static text of base.html from the nav to the content block)
+FLUSH_AFTER = "</nav>"
+
+# Characters collected before each later chunk is sent
+STREAM_CHUNK_SIZE = 8 * 1024
+
+
+def chunk_output(
+    pieces: Iterable[str],
+    flush_after: str = FLUSH_AFTER,
+    size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Group the small pieces a template generator yields into chunks.
+
+    Args:
+        pieces: Rendered template output.
+        flush_after: Text after which everything so far is sent at once
+            (it must lie within one piece, i.e. in static template text).
+        size: Chunk size in characters once that text has been sent.
+
+    Yields:
+        Chunks of the page.
+    """
+    buffer: List[str] = []
+    buffered = 0
+    waiting = bool(flush_after)
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if waiting:
+            if flush_after not in piece:
+                continue
+            waiting = False
+        elif buffered < size:
+            continue
+        yield "".join(buffer)
+        buffer.clear()
+        buffered = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_page(template_name: str, **context: Any) -> Response:
+    """
+    Render a template as a streamed HTML response.
+
+    Args:
+        template_name: Template to render.
+        **context: Template variables.
+
+    Returns:
+        Response whose body is produced while it is sent.
+    """
+    return Response(
+        chunk_output(stream_template(template_name, **context)),
+        mimetype="text/html",
+    )
+
+
+def render_page(template_name: str, **context: Any) -> Union[str, Response]:
+    """
+    Render a page, streaming it if its endpoint is in ``STREAMED_PAGES``.
+
+    Args:
+        template_name: Template to render.
+        **context: Template variables.
+
+    Returns:
+        The rendered page, or a streamed response.
+    """
+    if request.endpoint in current_app.config.get("STREAMED_PAGES", ()):
+        return stream_page(template_name, **context)
+    return render_template(template_name, **context)
@@ -0,0 +1,412 @@
+"""
+Minimal CSS parsing and selector matching for build-time stylesheet tools.
+
+The parser understands what ``static/css/style.css`` uses: style rules,
+nested block at-rules such as ``@media``/``@supports``, opaque at-rules
+such as ``@keyframes``/``@font-face``, and statement at-rules such as
+``@import``. Selectors are matched against rendered pages with soupsieve
+(installed with beautifulsoup4).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+# At-rules whose block contains further rules
+NESTED_AT_RULES = ("@media", "@supports", "@layer", "@container")
+
+# Pseudo-classes and pseudo-elements that depend on user interaction or
+# generate content; they are dropped before matching against static HTML
+DYNAMIC_PSEUDO = re.compile(
+    r"::?(?:hover|focus|focus-visible|focus-within|active|visited|link"
+    r"|target|checked|disabled|enabled|before|after|placeholder"
+    r"|selection|marker|first-line|first-letter|backdrop"
+    r"|-webkit-[\w-]+|-moz-[\w-]+)(?![\w-])"
+)
+
+# Attributes that scripts set at runtime, e.g. the theme toggle in main.js
+SCRIPT_ATTRIBUTES = ("data-theme", "aria-expanded")
+
+COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+# Functional pseudo-classes such as :not(...) or :nth-child(2n + 1)
+FUNCTIONAL_PSEUDO = re.compile(r":[\w-]+\((?:[^()]|\([^()]*\))*\)")
+
+# Class names manipulated from JavaScript
+SCRIPT_CLASS_CALL = re.compile(
+    r"classList\.(?:add|remove|toggle|replace|contains)\(([^)]*)\)"
+)
+SCRIPT_CLASS_NAME = re.compile(r"""className\s*\+?=\s*['"`]([^'"`]*)['"`]""")
+STRING_LITERAL = re.compile(r"""['"`]([\w-]+)['"`]""")
+
+
+@dataclass
+class CssRule:
+    """
+    A rule in a stylesheet.
+
+    Style rules have ``selectors`` and ``declarations``. At-rules have a
+    ``prelude`` (e.g. ``@media (max-width: 768px)``) and either nested
+    ``children`` or, for opaque at-rules, their raw block in
+    ``declarations``. Statement at-rules have neither.
+
+    Attributes:
+        selectors: Selector list of a style rule.
+        declarations: Declaration block text (without braces).
+        prelude: At-rule prelude, empty for style rules.
+        children: Rules nested in a block at-rule.
+        block: Whether the rule has a ``{...}`` block.
+    """
+
+    selectors: List[str] = field(default_factory=list)
+    declarations: str = ""
+    prelude: str = ""
+    children: List["CssRule"] = field(default_factory=list)
+    block: bool = True
+
+    @property
+    def is_nested(self) -> bool:
+        """Whether this is a block at-rule containing other rules."""
+        return self.prelude.startswith(NESTED_AT_RULES)
+
+
+def split_selectors(text: str) -> List[str]:
+    """
+    Split a selector list on top-level commas.
+
+    Args:
+        text: Selector list, e.g. ``h1, .card:not(.a, .b)``.
+
+    Returns:
+        Individual selectors with surrounding whitespace removed.
+    """
+    selectors: List[str] = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(text):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(text[start:index].strip())
+            start = index + 1
+    selectors.append(text[start:].strip())
+    return [selector for selector in selectors if selector]
+
+
+def _find_block_end(text: str, start: int) -> int:
+    """Find the index of the brace closing the block opened before start."""
+    depth = 1
+    index = start
+    quote: Optional[str] = None
+    while index < len(text):
+        char = text[index]
+        if quote:
+            if char == "\\":
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return index
+        index += 1
+    return len(text)
+
+
+def parse_stylesheet(text: str) -> List[CssRule]:
+    """
+    Parse CSS text into a list of rules.
+
+    Args:
+        text: Stylesheet source.
+
+    Returns:
+        Top-level rules in source order.
+    """
+    text = COMMENT.sub("", text)
+    rules: List[CssRule] = []
+    index = 0
+    while index < len(text):
+        brace = text.find("{", index)
+        semicolon = text.find(";", index)
+        head_end = brace if brace != -1 else len(text)
+        head = text[index:head_end].strip()
+
+        if head.startswith("@") and semicolon != -1 and semicolon < head_end:
+            rules.append(
+                CssRule(prelude=text[index:semicolon].strip(), block=False)
+            )
+            index = semicolon + 1
+            continue
+        if brace == -1:
+            break
+
+        end = _find_block_end(text, brace + 1)
+        body = text[brace + 1:end]
+        if head.startswith(NESTED_AT_RULES):
+            rules.append(
+                CssRule(prelude=head, children=parse_stylesheet(body))
+            )
+        elif head.startswith("@"):
+            rules.append(CssRule(prelude=head, declarations=body.strip()))
+        else:
+            rules.append(
+                CssRule(
+                    selectors=split_selectors(head),
+                    declarations=body.strip(),
+                )
+            )
+        index = end + 1
+    return rules
+
+
+def _compact_declarations(declarations: str) -> str:
+    """Collapse whitespace in a declaration block."""
+    parts = [part.strip() for part in declarations.split(";")]
+    return ";".join(
+        re.sub(r"\s*:\s*", ":", part, count=1) for part in parts if part
+    )
+
+
+def serialize_stylesheet(rules: Iterable[CssRule]) -> str:
+    """
+    Serialize rules back to compact CSS text.
+
+    Args:
+        rules: Rules to serialize.
+
+    Returns:
+        CSS text with one rule per line.
+    """
+    lines: List[str] = []
+    for rule in rules:
+        if not rule.block:
+            lines.append(f"{rule.prelude};")
+        elif rule.is_nested:
+            if rule.children:
+                inner = serialize_stylesheet(rule.children)
+                lines.append(f"{rule.prelude}{{{inner}}}")
+        elif rule.prelude:
+            lines.append(f"{rule.prelude}{{{rule.declarations}}}")
+        else:
+            selectors = ",".join(rule.selectors)
+            body = _compact_declarations(rule.declarations)
+            lines.append(f"{selectors}{{{body}}}")
+    return "\n".join(lines)
+
+
+def static_selector(selector: str) -> str:
+    """
+    Reduce a selector to what can be matched against server-rendered HTML.
+
+    Interaction pseudo-classes, pseudo-elements and attributes that scripts
+    set at runtime are removed, so ``.btn:hover`` is treated as ``.btn``
+    and ``[data-theme="dark"] .card`` as ``.card``.
+
+    Args:
+        selector: A single CSS selector.
+
+    Returns:
+        The reduced selector (``*`` if nothing is left).
+    """
+    # Mark removed parts so a compound selector that loses every part can
+    # be replaced by "*" (it still matches some element)
+    reduced = DYNAMIC_PSEUDO.sub("\0", selector)
+    for attribute in SCRIPT_ATTRIBUTES:
+        reduced = re.sub(
+            rf"\[\s*{re.escape(attribute)}\b[^\]]*\]", "\0", reduced
+        )
+    reduced = re.sub(r"(^|[\s>+~(,])\0+(?=[\s>+~),]|$)", r"\1*", reduced)
+    reduced = reduced.replace("\0", "")
+    return reduced.strip() or "*"
+
+
+class SelectorMatcher:
+    """
+    Match CSS selectors against parsed HTML, caching compiled selectors.
+
+    Selectors that soupsieve cannot compile are treated as matching, so
+    tools built on the matcher err on the side of keeping rules.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty compiled-selector cache."""
+        self._compiled: Dict[str, Optional[soupsieve.SoupSieve]] = {}
+
+    def compile(self, selector: str) -> Optional[soupsieve.SoupSieve]:
+        """
+        Compile a selector after reducing it with ``static_selector``.
+
+        Args:
+            selector: A single CSS selector.
+
+        Returns:
+            The compiled selector, or None if it cannot be compiled.
+        """
+        if selector not in self._compiled:
+            try:
+                compiled: Optional[soupsieve.SoupSieve] = soupsieve.compile(
+                    static_selector(selector)
+                )
+            except (soupsieve.SelectorSyntaxError, NotImplementedError):
+                compiled = None
+            self._compiled[selector] = compiled
+        return self._compiled[selector]
+
+    def matches(self, selector: str, soup: BeautifulSoup) -> List[Tag]:
+        """
+        Find the elements of a document matched by a selector.
+
+        Args:
+            selector: A single CSS selector.
+            soup: Parsed document.
+
+        Returns:
+            Matching elements; the root element if the selector could not
+            be compiled.
+        """
+        compiled = self.compile(selector)
+        if compiled is None:
+            root = soup.find()
+            return [root] if isinstance(root, Tag) else []
+        return list(compiled.select(soup))
+
+
+@dataclass
+class UsedSelectors:
+    """
+    Class names, ids and element names that occur in a set of pages.
+
+    Attributes:
+        classes: Class names used by elements or toggled by scripts.
+        ids: Element ids.
+        tags: Element names (lower case).
+    """
+
+    classes: Set[str] = field(default_factory=set)
+    ids: Set[str] = field(default_factory=set)
+    tags: Set[str] = field(default_factory=set)
+
+    def add_document(self, soup: BeautifulSoup) -> None:
+        """
+        Record every class, id and element name in a parsed document.
+
+        Args:
+            soup: Parsed page.
+        """
+        for tag in soup.find_all(True):
+            self.tags.add(tag.name.lower())
+            self.classes.update(tag.get("class") or ())
+            element_id = tag.get("id")
+            if element_id:
+                self.ids.add(
+                    element_id
+                    if isinstance(element_id, str)
+                    else " ".join(element_id)
+                )
+
+    def add_script(self, source: str) -> None:
+        """
+        Record class names that a script adds or toggles at runtime.
+
+        Recognises ``classList.add/remove/toggle/replace/contains(...)``
+        arguments and literal ``className`` assignments.
+
+        Args:
+            source: JavaScript source.
+        """
+        for arguments in SCRIPT_CLASS_CALL.findall(source):
+            self.classes.update(STRING_LITERAL.findall(arguments))
+        for value in SCRIPT_CLASS_NAME.findall(source):
+            self.classes.update(value.split())
+
+    def can_match(self, selector: str) -> bool:
+        """
+        Check whether a selector could match anything in the pages.
+
+        A selector can match when every class, id and element name it
+        requires is in use. Runtime-only parts (see ``static_selector``)
+        and the contents of ``:not()`` are not required.
+
+        Args:
+            selector: A single CSS selector.
+
+        Returns:
+            False only if the selector can never match.
+        """
+        classes, ids, tags = selector_requirements(selector)
+        return (
+            classes <= self.classes and ids <= self.ids and tags <= self.tags
+        )
+
+
+def selector_requirements(
+    selector: str,
+) -> Tuple[Set[str], Set[str], Set[str]]:
+    """
+    List the classes, ids and element names a selector requires.
+
+    Args:
+        selector: A single CSS selector.
+
+    Returns:
+        A (classes, ids, element names) tuple.
+    """
+    reduced = static_selector(selector)
+    reduced = FUNCTIONAL_PSEUDO.sub("", reduced)
+    reduced = re.sub(r"\[[^\]]*\]", "", reduced)
+    reduced = re.sub(r"::?[\w-]+", "", reduced)
+    classes = set(re.findall(r"\.(-?[_a-zA-Z][\w-]*)", reduced))
+    ids = set(re.findall(r"#(-?[_a-zA-Z][\w-]*)", reduced))
+    tags = {
+        name.lower()
+        for name in re.findall(r"(?:^|[\s>+~])([a-zA-Z][\w-]*)", reduced)
+    }
+    return classes, ids, tags
+
+
+def prune_rules(
+    rules: Sequence[CssRule], used: UsedSelectors
+) -> Tuple[List[CssRule], List[str]]:
+    """
+    Remove selectors that cannot match the pages, and rules left empty.
+
+    At-rules other than block at-rules (``@keyframes``, ``@font-face``,
+    ``@import``) are kept as-is.
+
+    Args:
+        rules: Parsed stylesheet.
+        used: Selectors in use across the pages.
+
+    Returns:
+        A (pruned rules, removed selectors) tuple.
+    """
+    kept: List[CssRule] = []
+    dead: List[str] = []
+    for rule in rules:
+        if rule.is_nested:
+            children, dead_children = prune_rules(rule.children, used)
+            dead.extend(dead_children)
+            if children:
+                kept.append(CssRule(prelude=rule.prelude, children=children))
+        elif rule.prelude:
+            kept.append(rule)
+        else:
+            selectors = [s for s in rule.selectors if used.can_match(s)]
+            dead.extend(s for s in rule.selectors if s not in selectors)
+            if selectors:
+                kept.append(
+                    CssRule(
+                        selectors=selectors, declarations=rule.declarations
+                    )
+                )
+    return kept, dead
@@ -0,0 +1,67 @@
+"""
+Compiled-template caching for the Flask application.
+
+Jinja compiles each template to Python bytecode the first time it is
+rendered, so a fresh worker pays for compiling ``base.html`` and every
+page template during its first requests. A filesystem bytecode cache
+shared by all workers on a host lets them load the compiled code
+instead, and prewarming loads every template while the app is created
+so no request has to wait for it.
+"""
+
+import os
+from typing import List, Optional
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+
+
+def init_bytecode_cache(
+    app: Flask, directory: Optional[str] = None
+) -> FileSystemBytecodeCache:
+    """
+    Store compiled templates in a directory shared between processes.
+
+    Entries are keyed by template name and checked against a checksum of
+    the template source, so edited templates are recompiled. Jinja writes
+    each entry to a temporary file and renames it into place, so
+    concurrent workers never read a partial entry.
+
+    Args:
+        app: Flask application whose Jinja environment has not been
+            created yet.
+        directory: Cache directory, created if missing. Defaults to
+            Jinja's private per-user directory in the system temp
+            directory.
+
+    Returns:
+        The bytecode cache.
+    """
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    cache = FileSystemBytecodeCache(directory)
+    # Passed as an option so the environment is still only created when
+    # the first template is rendered
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": cache}
+    return cache
+
+
+def prewarm_templates(app: Flask) -> List[str]:
+    """
+    Load and compile every template before the first request.
+
+    Templates end up in the Jinja environment's in-memory cache (and in
+    the bytecode cache, if one is set up).
+
+    Args:
+        app: Flask application.
+
+    Returns:
+        Names of the loaded templates.
+    """
+    env = app.jinja_env
+    names = [name for name in env.list_templates() if name.endswith(".html")]
+    for name in names:
+        env.get_template(name)
+    app.logger.debug("Prewarmed %d templates", len(names))
+    return names
@@ -0,0 +1,485 @@
+"""
+File watching and live reload for development builds.
+
+``create_watcher`` returns an inotify watcher on Linux and a polling
+watcher elsewhere; both report the files that changed under a set of
+paths. ``LiveReloadServer`` serves a build output directory over HTTP
+and pushes a ``reload`` server-sent event to every open page whenever
+``notify`` is called.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# URL of the server-sent events stream
+LIVERELOAD_PATH = "/__livereload"
+
+# Injected before </body> of every HTML page served by LiveReloadServer
+LIVERELOAD_SCRIPT = (
+    "<script>new EventSource('" + LIVERELOAD_PATH + "')"
+    ".addEventListener('reload', () => location.reload());</script>"
+)
+
+# Seconds between keep-alive comments on idle event streams
+KEEPALIVE_INTERVAL = 15.0
+
+# inotify event flags (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_ignored(path: Path) -> bool:
+    """
+    Tell whether a changed file is editor or VCS noise.
+
+    Args:
+        path: Changed file.
+
+    Returns:
+        True for hidden files, backups (``~``) and swap files.
+    """
+    name = path.name
+    return (
+        name.startswith(".")
+        or name.endswith("~")
+        or name.endswith((".swp", ".swx", ".tmp"))
+        or name == "__pycache__"
+        or "__pycache__" in path.parts
+    )
+
+
+class PollingWatcher:
+    """
+    Detect file changes by comparing modification times and sizes.
+
+    Args:
+        paths: Files and directories (watched recursively) to watch.
+        interval: Seconds between scans.
+    """
+
+    def __init__(self, paths: Iterable[Path], interval: float = 0.25) -> None:
+        """Take the initial snapshot of the watched paths."""
+        self.paths = [Path(path) for path in paths]
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """Stat every watched file."""
+        snapshot: Dict[Path, Tuple[int, int]] = {}
+        for root in self.paths:
+            files = root.rglob("*") if root.is_dir() else [root]
+            for path in files:
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if not path.is_dir() and not is_ignored(path):
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Wait for changes.
+
+        Args:
+            timeout: Seconds to wait; None waits until something changes.
+
+        Returns:
+            Files that were created, modified or deleted (empty on
+            timeout).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+    def close(self) -> None:
+        """Release resources (nothing to do for polling)."""
+
+
+class InotifyWatcher:
+    """
+    Detect file changes with Linux inotify, through ``ctypes``.
+
+    Directories are watched recursively; directories created later are
+    added as they appear. A watched file is watched through its parent
+    directory.
+
+    Args:
+        paths: Files and directories to watch.
+
+    Raises:
+        OSError: If inotify is not available.
+    """
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        """Create the inotify instance and add the watches."""
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self.paths = [Path(path).resolve() for path in paths]
+        self._dirs: Dict[int, Path] = {}
+        self._files: Dict[Path, Set[str]] = {}
+        for path in self.paths:
+            if path.is_dir():
+                self._watch_tree(path)
+            else:
+                self._files.setdefault(path.parent, set()).add(path.name)
+                self._watch(path.parent)
+
+    def _watch(self, directory: Path) -> None:
+        """Add a watch for one directory."""
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), WATCH_MASK
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._dirs[wd] = directory
+
+    def _watch_tree(self, root: Path) -> None:
+        """Watch a directory and every directory below it."""
+        self._watch(root)
+        for path in root.rglob("*"):
+            if path.is_dir():
+                self._watch(path)
+
+    def _is_watched(self, path: Path) -> bool:
+        """Tell whether a path is one of the watched files or trees."""
+        names = self._files.get(path.parent)
+        if names is not None and path.name in names:
+            return True
+        return any(
+            root.is_dir() and path.is_relative_to(root) for root in self.paths
+        )
+
+    def _events(self, data: bytes) -> Iterator[Tuple[int, int, str]]:
+        """Decode raw inotify events into (wd, mask, name) tuples."""
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            raw = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            yield wd, mask, os.fsdecode(raw)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Wait for changes.
+
+        Args:
+            timeout: Seconds to wait; None waits until something changes.
+
+        Returns:
+            Files that were created, modified or deleted (empty on
+            timeout). If the kernel queue overflowed, the watched paths
+            themselves are returned.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            changed = self._changes(data)
+            if changed:
+                return changed
+
+    def _changes(self, data: bytes) -> Set[Path]:
+        """
+        Find the watched files a batch of raw events touched.
+
+        Args:
+            data: Bytes read from the inotify descriptor.
+
+        Returns:
+            The changed files, or the watched paths themselves if the
+            kernel queue overflowed.
+        """
+        changed: Set[Path] = set()
+        for wd, mask, name in self._events(data):
+            if mask & IN_Q_OVERFLOW:
+                return set(self.paths)
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._dirs[wd]
+                continue
+            path = directory / name if name else directory
+            if mask & IN_ISDIR:
+                changed.update(self._added_tree(path, mask))
+            elif self._is_watched(path) and not is_ignored(path):
+                changed.add(path)
+        return changed
+
+    def _added_tree(self, path: Path, mask: int) -> List[Path]:
+        """Watch a directory that was created or moved in; list its files."""
+        if not (mask & (IN_CREATE | IN_MOVED_TO) and path.is_dir()):
+            return []
+        self._watch_tree(path)
+        return [child for child in path.rglob("*") if child.is_file()]
+
+    def close(self) -> None:
+        """Close the inotify instance."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(
+    paths: Iterable[Path], poll: bool = False
+) -> "InotifyWatcher | PollingWatcher":
+    """
+    Create the best available watcher.
+
+    Args:
+        paths: Files and directories to watch.
+        poll: Always use polling, e.g. for network filesystems where
+            inotify sees no remote changes.
+
+    Returns:
+        An ``InotifyWatcher`` where inotify works, else a
+        ``PollingWatcher``.
+    """
+    paths = list(paths)
+    if not poll:
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths)
+
+
+def wait_for_changes(
+    watcher: "InotifyWatcher | PollingWatcher",
+    debounce: float,
+    timeout: Optional[float] = None,
+) -> Set[Path]:
+    """
+    Wait for a burst of changes to settle.
+
+    After the first change, changes keep being collected until none has
+    arrived for ``debounce`` seconds, so saving several files (or an
+    editor's write-and-rename) triggers a single rebuild.
+
+    Args:
+        watcher: Watcher to read from.
+        debounce: Quiet period in seconds that ends a burst.
+        timeout: Seconds to wait for the first change; None waits forever.
+
+    Returns:
+        All files changed during the burst (empty on timeout).
+    """
+    changed = watcher.wait(timeout)
+    while changed:
+        more = watcher.wait(debounce)
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    """
+    Serve a build output with live reload.
+
+    HTML pages get ``LIVERELOAD_SCRIPT`` injected, ``LIVERELOAD_PATH``
+    is a server-sent events stream, and URLs under the site's base URL
+    map to the output directory.
+    """
+
+    server: "LiveReloadServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep request logging out of the build output."""
+
+    def translate_path(self, path: str) -> str:
+        """Strip the base URL before mapping a URL to a file."""
+        base = self.server.base_url
+        if base != "/" and path.startswith(base):
+            path = "/" + path[len(base):]
+        return super().translate_path(path)
+
+    def do_GET(self) -> None:
+        """Serve the event stream, HTML pages or other files."""
+        path = self.path.split("?", 1)[0]
+        if path == LIVERELOAD_PATH:
+            self.serve_events()
+            return
+        file_path = Path(self.translate_path(path))
+        if file_path.is_dir():
+            file_path = file_path / "index.html"
+        elif not file_path.exists() and file_path.suffix == "":
+            file_path = file_path.with_suffix(".html")
+        if file_path.suffix == ".html" and file_path.is_file():
+            self.serve_page(file_path)
+            return
+        super().do_GET()
+
+    def serve_page(self, file_path: Path) -> None:
+        """Send an HTML page with the live reload script added."""
+        html = file_path.read_text(encoding="utf-8")
+        head, body_end, tail = html.rpartition("</body>")
+        if body_end:
+            html = head + LIVERELOAD_SCRIPT + body_end + tail
+        else:
+            html += LIVERELOAD_SCRIPT
+        data = html.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def serve_events(self) -> None:
+        """Stream a ``reload`` event for every build until disconnect."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        server = self.server
+        generation = server.generation
+        try:
+            self.wfile.write(b"retry: 1000\n\n")
+            self.wfile.flush()
+            while True:
+                with server.changed:
+                    server.changed.wait_for(
+                        lambda: server.generation != generation
+                        or server.closing,
+                        timeout=KEEPALIVE_INTERVAL,
+                    )
+                if server.closing:
+                    break
+                if server.generation != generation:
+                    generation = server.generation
+                    message = f"event: reload\ndata: {generation}\n\n"
+                else:
+                    message = ": keep-alive\n\n"
+                self.wfile.write(message.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class LiveReloadServer(ThreadingHTTPServer):
+    """
+    HTTP server for a build output that can tell pages to reload.
+
+    Args:
+        directory: Output directory to serve.
+        host: Interface to bind.
+        port: Port to bind (0 picks a free port).
+        base_url: Base URL the pages were built for.
+
+    Example:
+        >>> server = LiveReloadServer("docs", port=0)
+        >>> server.start()
+        >>> server.notify()  # every open page reloads
+        >>> server.stop()
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        directory: "str | Path",
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        base_url: str = "/",
+    ) -> None:
+        """Bind the server."""
+        handler = partial(LiveReloadHandler, directory=str(directory))
+        super().__init__((host, port), handler)
+        self.base_url = base_url
+        self.generation = 0
+        self.closing = False
+        self.changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL of the site root."""
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode("ascii")
+        return f"http://{host}:{port}{self.base_url}"
+
+    def start(self) -> None:
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="livereload", daemon=True
+        )
+        self._thread.start()
+
+    def notify(self) -> None:
+        """Send a reload event to every connected page."""
+        with self.changed:
+            self.generation += 1
+            self.changed.notify_all()
+
+    def stop(self) -> None:
+        """Close open event streams and stop serving."""
+        with self.changed:
+            self.closing = True
+            self.changed.notify_all()
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,186 @@
+"""
+Tests for the resource query API.
+
+This module tests filtering, cursor pagination, ETag revalidation and
+error responses of ``/api/resources``, and the index behind it.
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from api import ResourceIndex, decode_cursor, encode_cursor
+from app import create_app
+from catalog import Resource
+from routes import get_learning_resources
+
+
+def synthetic_entries(count):
+    """Make entries that cycle through categories, platforms and levels."""
+    platforms = ('Coursera', 'YouTube', None)
+    levels = ('Beginner', 'Intermediate', None)
+    return [
+        (
+            ('courses', 'videos')[n % 2],
+            Resource(
+                title=f'Resource {n}',
+                description='Synthetic entry',
+                url=f'https://example.com/{n}',
+                cost=('Free', 'Paid')[n % 5 == 0],
+                platform=platforms[n % 3],
+                level=levels[n % 7 % 3],
+            ),
+        )
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def app():
+    """Create a test app without the page cache."""
+    return create_app({"TESTING": True, "PAGE_CACHE_SIZE": 0})
+
+
+@pytest.fixture
+def synthetic_app(app):
+    """Serve a synthetic index of 1000 entries."""
+    app.extensions['resource_index'] = ResourceIndex(synthetic_entries(1000))
+    return app
+
+
+def test_lists_the_catalog(app):
+    """Test that an unfiltered query pages through every resource."""
+    data = app.test_client().get('/api/resources').get_json()
+    total = sum(len(entries) for entries in get_learning_resources().values())
+
+    assert data['count'] == total
+    assert data['next_cursor'] is None
+    assert [item['id'] for item in data['results']] == list(range(total))
+    first = data['results'][0]
+    assert first['category'] == 'documentation'
+    assert first['url'].startswith('https://')
+
+
+def test_filters_by_field_case_insensitively(app):
+    """Test filtering on category, platform and level together."""
+    response = app.test_client().get(
+        '/api/resources?category=Courses&platform=coursera&level=beginner'
+    )
+    results = response.get_json()['results']
+
+    assert results
+    for item in results:
+        assert item['category'] == 'courses'
+        assert item['platform'] == 'Coursera'
+        assert item['level'] == 'Beginner'
+
+
+def test_filters_match_a_linear_scan(synthetic_app):
+    """Test index results and counts against filtering every entry."""
+    index = synthetic_app.extensions['resource_index']
+    client = synthetic_app.test_client()
+    query = 'category=videos&level=beginner&level=intermediate&cost=free'
+
+    ids, page = [], f'/api/resources?{query}&limit=37'
+    url = page
+    while url:
+        data = client.get(url).get_json()
+        ids += [item['id'] for item in data['results']]
+        cursor = data['next_cursor']
+        url = f'{page}&cursor={cursor}' if cursor else None
+
+    expected = [
+        n for n in range(len(index))
+        if index.categories[n] == 'videos'
+        and index.resources[n].level in ('Beginner', 'Intermediate')
+        and index.resources[n].cost == 'Free'
+    ]
+    assert ids == expected
+    assert data['count'] == len(expected)
+
+
+def test_etag_revalidation(synthetic_app):
+    """Test that a matching If-None-Match gets an empty 304."""
+    client = synthetic_app.test_client()
+    response = client.get('/api/resources?platform=youtube&limit=5')
+    etag = response.headers['ETag']
+
+    cached = client.get(
+        '/api/resources?platform=youtube&limit=5',
+        headers={'If-None-Match': etag},
+    )
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+    other = client.get(
+        '/api/resources?platform=youtube&limit=6',
+        headers={'If-None-Match': etag},
+    )
+    assert other.status_code == 200
+    assert other.headers['ETag'] != etag
+
+
+def test_page_cache_skips_api_queries():
+    """Test that query results stay out of the page cache."""
+    app = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 8})
+    client = app.test_client()
+    etag = client.get('/api/resources?limit=2').headers['ETag']
+
+    hit = client.get('/api/resources?limit=2', headers={'If-None-Match': etag})
+    assert hit.status_code == 304
+    assert hit.headers['ETag'] == etag
+    assert len(app.extensions['page_cache']) == 0
+
+
+@pytest.mark.parametrize('query, message', [
+    ('limit=0', 'limit'),
+    ('limit=abc', 'limit'),
+    ('limit=%C2%B2', 'limit'),
+    ('colour=red', 'Unknown parameter: colour'),
+    ('cursor=%%%', 'Invalid cursor'),
+])
+def test_invalid_queries_are_rejected(app, query, message):
+    """Test that bad parameters get a JSON 400."""
+    response = app.test_client().get(f'/api/resources?{query}')
+
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
+
+
+def test_cursor_is_tied_to_its_query(synthetic_app):
+    """Test that a cursor cannot be replayed with other filters."""
+    client = synthetic_app.test_client()
+    cursor = client.get(
+        '/api/resources?category=courses&limit=3'
+    ).get_json()['next_cursor']
+
+    response = client.get(f'/api/resources?category=videos&cursor={cursor}')
+    assert response.status_code == 400
+    assert 'does not match' in response.get_json()['error']
+
+
+def test_cursor_round_trip():
+    """Test encoding and decoding a cursor."""
+    assert decode_cursor(encode_cursor(41, 'abc123'), 'abc123') == 41
+
+
+def test_unknown_value_matches_nothing():
+    """Test that a value absent from the index yields an empty page."""
+    index = ResourceIndex(synthetic_entries(50))
+    filters = (('category', ('courses',)), ('platform', ('vimeo',)))
+
+    assert index.query(filters) == ([], None)
+    assert index.count(filters) == 0
+
+
+def test_static_build_skips_api_routes():
+    """Test that the static build does not render API routes."""
+    from build import discover_routes
+
+    routes = [route for route, _ in discover_routes(create_app())]
+    assert '/resources' in routes
+    assert not any(route.startswith('/api/') for route in routes)
@@ -107,6 +107,12 @@ class TestAppCreation:
         assert app.config["TESTING"] is True
         assert app.config["DEBUG"] is False
 
+    def test_create_app_defers_template_loading(self, app: Flask) -> None:
+        """Test that the Jinja environment is created on first render."""
+        assert "jinja_env" not in app.__dict__
+        app.test_client().get("/")
+        assert "jinja_env" in app.__dict__
+
     def test_app_has_routes(self, app: Flask) -> None:
         """Test that application has registered routes."""
         rules = [rule.rule for rule in app.url_map.iter_rules()]
@@ -0,0 +1,188 @@
+"""
+Tests for the ASGI entry point.
+
+This module drives the ASGI adapter with in-memory receive and send
+callables and checks that requests reach the Flask app, that streamed
+pages arrive in several body messages, and that the thread pool bounds
+how many requests run at once.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from asgi import ASGIAdapter, build_environ, create_asgi_app
+
+
+def make_scope(path, method='GET', query=b'', headers=()):
+    """Build an ASGI HTTP scope."""
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': query,
+        'headers': [(name, value) for name, value in headers],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+
+
+async def call(app, scope, body=b''):
+    """Run one request and collect the messages sent."""
+    received = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    messages = []
+
+    async def receive():
+        if received:
+            return received.pop(0)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+def request(app, path, **kwargs):
+    """Run one request and return its status, headers and body messages."""
+    messages = asyncio.run(call(app, make_scope(path, **kwargs)))
+    start, bodies = messages[0], messages[1:]
+    assert start['type'] == 'http.response.start'
+    assert all(m['type'] == 'http.response.body' for m in bodies)
+    assert bodies[-1]['more_body'] is False
+    return start['status'], dict(start['headers']), bodies
+
+
+def test_build_environ():
+    """Test that the scope is translated into a WSGI environment."""
+    scope = make_scope(
+        '/api/resources',
+        method='POST',
+        query=b'page=2',
+        headers=[
+            (b'content-type', b'application/json'),
+            (b'content-length', b'2'),
+            (b'accept', b'text/html'),
+            (b'accept', b'application/json'),
+        ],
+    )
+
+    environ = build_environ(scope, b'{}')
+    assert environ['REQUEST_METHOD'] == 'POST'
+    assert environ['PATH_INFO'] == '/api/resources'
+    assert environ['QUERY_STRING'] == 'page=2'
+    assert environ['CONTENT_TYPE'] == 'application/json'
+    assert environ['CONTENT_LENGTH'] == '2'
+    assert environ['HTTP_ACCEPT'] == 'text/html,application/json'
+    assert environ['wsgi.input'].read() == b'{}'
+
+
+def test_page_is_served():
+    """Test that a page is rendered through the adapter."""
+    app = create_asgi_app({'TESTING': True, 'COMPRESSION': False})
+
+    status, headers, bodies = request(app, '/')
+    body = b''.join(m['body'] for m in bodies)
+    assert status == 200
+    assert headers[b'content-type'].startswith(b'text/html')
+    assert b'</html>' in body
+
+
+def test_api_and_query_string():
+    """Test that query arguments reach the API."""
+    app = create_asgi_app({'TESTING': True, 'COMPRESSION': False})
+
+    status, _, bodies = request(
+        app, '/api/resources', query=b'category=documentation'
+    )
+    data = json.loads(b''.join(m['body'] for m in bodies))
+    assert status == 200
+    assert data['results']
+    assert {r['category'] for r in data['results']} == {'documentation'}
+
+
+def test_not_found():
+    """Test that error responses keep their status."""
+    app = create_asgi_app({'TESTING': True})
+
+    status, _, _ = request(app, '/no-such-page')
+    assert status == 404
+
+
+def test_streamed_page_sends_several_messages():
+    """Test that streamed pages are not buffered by the adapter."""
+    app = create_asgi_app(
+        {'TESTING': True, 'PAGE_CACHE_SIZE': 0, 'COMPRESSION': False}
+    )
+
+    status, headers, bodies = request(app, '/tutorials')
+    assert status == 200
+    assert b'content-length' not in headers
+    assert len([m for m in bodies if m['body']]) > 1
+    assert b'</nav>' in bodies[0]['body']
+
+
+def test_compressed_response():
+    """Test that the compression middleware still applies."""
+    app = create_asgi_app({'TESTING': True})
+
+    status, headers, bodies = request(
+        app, '/', headers=[(b'accept-encoding', b'gzip')]
+    )
+    assert status == 200
+    assert headers[b'content-encoding'] == b'gzip'
+    assert b'</html>' in gzip.decompress(b''.join(m['body'] for m in bodies))
+
+
+def test_threads_bound_concurrency():
+    """Test that no more than max_threads requests run at once."""
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def slow_app(environ, start_response):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'ok']
+
+    app = ASGIAdapter(slow_app, max_threads=2)
+
+    async def main():
+        return await asyncio.gather(
+            *(call(app, make_scope('/')) for _ in range(8))
+        )
+
+    results = asyncio.run(main())
+    assert running[1] == 2
+    assert all(messages[1]['body'] == b'ok' for messages in results)
+
+
+def test_lifespan():
+    """Test that startup and shutdown are acknowledged."""
+    app = ASGIAdapter(lambda environ, start_response: [], max_threads=1)
+    events = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+
+    async def receive():
+        return events.pop(0)
+
+    async def send(message):
+        sent.append(message['type'])
+
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
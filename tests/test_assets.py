@@ -0,0 +1,121 @@
+"""
+Tests for static asset fingerprinting.
+
+This module tests fingerprinted static URLs in the Flask app and the
+fingerprinted copies written by the static build.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from flask import url_for
+
+from app import create_app
+from assets import MANIFEST_NAME, build_asset_manifest, fingerprint_name
+
+
+@pytest.fixture
+def app():
+    """Create a test app with asset fingerprinting enabled."""
+    return create_app({"TESTING": True, "ASSET_FINGERPRINTING": True})
+
+
+def test_fingerprint_name_inserts_digest():
+    """Test that the digest goes before the file extension."""
+    digest = "0123456789abcdef0123"
+
+    assert fingerprint_name("css/style.css", digest) == (
+        "css/style.0123456789ab.css"
+    )
+    assert fingerprint_name("LICENSE", digest) == "LICENSE.0123456789ab"
+
+
+def test_url_for_static_resolves_through_manifest(app):
+    """Test that url_for('static') returns the fingerprinted name."""
+    manifest = build_asset_manifest(Path(app.static_folder))
+
+    with app.test_request_context("/"):
+        url = url_for("static", filename="css/style.css")
+
+    assert url == f"/static/{manifest['css/style.css']}"
+    assert url != "/static/css/style.css"
+
+
+def test_fingerprinted_asset_is_immutable(app):
+    """Test that fingerprinted assets are served with immutable caching."""
+    client = app.test_client()
+    hashed = app.extensions["asset_manifest"]["css/style.css"]
+
+    response = client.get(f"/static/{hashed}")
+
+    assert response.status_code == 200
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age == 31536000
+    original = Path(app.static_folder, "css", "style.css").read_bytes()
+    assert response.data == original
+    response.close()
+
+
+def test_original_asset_name_still_served(app):
+    """Test that the unhashed name keeps working without immutable caching."""
+    response = app.test_client().get("/static/css/style.css")
+
+    assert response.status_code == 200
+    assert not response.cache_control.immutable
+    response.close()
+
+
+def test_manifest_is_built_on_first_use(monkeypatch):
+    """Test that create_app leaves hashing the static files to a request."""
+    import assets
+
+    calls = []
+    build = assets.build_asset_manifest
+    monkeypatch.setattr(
+        assets, "build_asset_manifest",
+        lambda static_dir: calls.append(static_dir) or build(static_dir),
+    )
+    app = create_app({"TESTING": True, "ASSET_FINGERPRINTING": True})
+    assert calls == []
+
+    client = app.test_client()
+    client.get("/")
+    client.get("/about")
+    assert len(calls) == 1
+
+
+def test_fingerprinting_can_be_disabled():
+    """Test that url_for returns plain names when fingerprinting is off."""
+    app = create_app({"TESTING": True, "ASSET_FINGERPRINTING": False})
+
+    with app.test_request_context("/"):
+        assert url_for("static", filename="css/style.css") == (
+            "/static/css/style.css"
+        )
+
+
+def test_build_writes_fingerprinted_assets():
+    """Test that the build output contains every fingerprinted asset."""
+    from build import build_static_site
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = Path(tmpdir) / "site"
+        build_static_site(output_dir=str(output_dir))
+
+        static_dir = output_dir / "static"
+        manifest = json.loads((static_dir / MANIFEST_NAME).read_text())
+        index = (output_dir / "index.html").read_text(encoding="utf-8")
+
+        for name, hashed in manifest.items():
+            assert (static_dir / hashed).read_bytes() == (
+                (static_dir / name).read_bytes()
+            )
+        assert f'href="/static/{manifest["css/style.css"]}"' in index
+        assert f'src="/static/{manifest["js/main.js"]}"' in index
@@ -48,6 +48,93 @@ def test_update_navigation_links():
     assert '/resources.html' in result
 
 
+def test_link_rewriter_covers_new_routes():
+    """Test that routes added to the app are rewritten automatically."""
+    from app import create_app
+    from build import LinkRewriter
+
+    app = create_app()
+    app.add_url_rule('/changelog', 'changelog', lambda: 'changelog')
+
+    rewriter = LinkRewriter.from_app(app, '/gh-copilot-raisa/')
+    html = (
+        '<a href="/changelog">Changes</a>'
+        '<a href="/">Home</a>'
+        '<script src="/static/js/main.js"></script>'
+    )
+
+    result = rewriter.rewrite(html)
+
+    assert 'href="/gh-copilot-raisa/changelog.html"' in result
+    assert 'href="/gh-copilot-raisa/"' in result
+    assert 'src="/gh-copilot-raisa/static/js/main.js"' in result
+
+
+def test_link_rewriter_keeps_fragments_and_external_links():
+    """Test that fragments are kept and unknown links are left alone."""
+    from app import create_app
+    from build import LinkRewriter
+
+    rewriter = LinkRewriter.from_app(create_app(), '/')
+    html = (
+        "<a href='/tutorials#agents'>Agents</a>"
+        '<a href="https://docs.github.com/copilot">Docs</a>'
+        '<a href="/unknown">Unknown</a>'
+    )
+
+    result = rewriter.rewrite(html)
+
+    assert "href='/tutorials.html#agents'" in result
+    assert 'href="https://docs.github.com/copilot"' in result
+    assert 'href="/unknown"' in result
+
+
+def test_link_rewriter_skips_dynamic_routes():
+    """Test that links to routes that are not rendered are left alone."""
+    from app import create_app
+    from build import LinkRewriter
+
+    rewriter = LinkRewriter.from_app(create_app(), '/')
+    html = '<a href="/search">Search</a><a href="/about">About</a>'
+
+    result = rewriter.rewrite(html)
+
+    assert 'href="/search"' in result
+    assert 'href="/about.html"' in result
+
+
+def test_discover_routes_from_url_map():
+    """Test that pages are discovered from the app instead of a list."""
+    from app import create_app
+    from build import discover_routes
+
+    app = create_app()
+    app.add_url_rule('/changelog', 'changelog', lambda: 'changelog')
+
+    routes = dict(discover_routes(app))
+
+    assert routes['/'] == 'index.html'
+    assert routes['/copilot-integration'] == 'copilot-integration.html'
+    assert routes['/changelog'] == 'changelog.html'
+    assert routes['/404'] == '404.html'
+    assert not any(route.startswith('/static') for route in routes)
+
+
+def test_render_view_matches_test_client():
+    """Test that direct view dispatch renders the same text as a request."""
+    from app import create_app
+    from build import discover_routes, render_view
+
+    app = create_app()
+    client = app.test_client()
+
+    for route, _ in discover_routes(app):
+        html, status = render_view(app, route)
+        response = client.get(route)
+        assert status == response.status_code
+        assert html == response.get_data(as_text=True)
+
+
 def test_build_static_site_creates_directory():
     """Test that build creates output directory."""
     from build import build_static_site
@@ -125,3 +212,354 @@ def test_generated_html_has_correct_paths():
         # Check for correct paths
         assert '/static/' in content
         assert '/resources.html' in content
+
+
+def read_tree(root):
+    """Read every file under root into a {relative path: bytes} dict."""
+    root = Path(root)
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob('*')) if path.is_file()
+    }
+
+
+def test_parallel_build_matches_serial_build():
+    """Test that a multi-process build is byte-identical to a serial one."""
+    from build import build_static_site
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        serial_dir = os.path.join(tmpdir, 'serial')
+        parallel_dir = os.path.join(tmpdir, 'parallel')
+
+        assert build_static_site(output_dir=serial_dir) == []
+        assert build_static_site(output_dir=parallel_dir, jobs=3) == []
+
+        assert read_tree(serial_dir) == read_tree(parallel_dir)
+
+
+def test_route_errors_are_collected(monkeypatch):
+    """Test that a failing route is reported without stopping the build."""
+    import build
+
+    original = build.LinkRewriter.rewrite
+
+    def failing_rewrite(self, html):
+        if '<title>Learning Resources' in html:
+            raise RuntimeError('boom')
+        return original(self, html)
+
+    monkeypatch.setattr(build.LinkRewriter, 'rewrite', failing_rewrite)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        errors = build.build_static_site(output_dir=output_dir)
+
+        assert [error.route for error in errors] == ['/resources']
+        assert 'boom' in errors[0].message
+        assert os.path.exists(os.path.join(output_dir, 'index.html'))
+        assert not os.path.exists(os.path.join(output_dir, 'resources.html'))
+
+
+def test_incremental_build_skips_unchanged_routes(monkeypatch):
+    """Test that an incremental rebuild with no changes renders nothing."""
+    import build
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        build.build_static_site(output_dir=output_dir)
+        before = read_tree(output_dir)
+
+        rendered = []
+        original = build.render_routes
+
+        def recording_render(routes, base_url, app=None, profiler=None):
+            rendered.extend(route for route, _ in routes)
+            return original(routes, base_url, app=app, profiler=profiler)
+
+        monkeypatch.setattr(build, 'render_routes', recording_render)
+        build.build_static_site(output_dir=output_dir, incremental=True)
+
+        assert rendered == []
+        assert read_tree(output_dir) == before
+
+
+def test_incremental_plan_follows_template_graph():
+    """Test that template edits only select the routes that use them."""
+    import copy
+    import build
+    from app import create_app
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        build.build_static_site(output_dir=output_dir)
+        output_path = Path(output_dir)
+        manifest = build.load_manifest(output_path)
+        app = create_app()
+        routes = build.discover_routes(app)
+        inputs = build.collect_route_inputs(app, routes)
+
+        edited = copy.deepcopy(inputs)
+        edited['/resources']['template:resources.html'] = 'changed'
+        plan = build.plan_routes(routes, edited, manifest, output_path)
+        assert plan == [('/resources', 'resources.html')]
+
+        edited = copy.deepcopy(inputs)
+        for route_inputs in edited.values():
+            route_inputs['template:base.html'] = 'changed'
+        plan = build.plan_routes(routes, edited, manifest, output_path)
+        assert plan == routes
+
+
+def test_unusable_manifest_forces_full_build(tmp_path):
+    """Test that manifests that are not a current JSON object are ignored."""
+    import build
+
+    manifest_file = tmp_path / build.MANIFEST_NAME
+    for content in ('[]', '{"version": 0}', 'not json'):
+        manifest_file.write_text(content)
+        assert build.load_manifest(tmp_path) is None
+
+
+def test_incremental_plan_tracks_route_data():
+    """Test that route data sources are recorded only for their views."""
+    import build
+    from app import create_app
+
+    app = create_app()
+    inputs = build.collect_route_inputs(app, build.discover_routes(app))
+
+    assert 'data:get_learning_resources' in inputs['/resources']
+    assert 'data:get_copilot_examples' in inputs['/examples']
+    assert not any(key.startswith('data:') for key in inputs['/about'])
+    assert 'template:404.html' in inputs['/404']
+    # Every app module counts, including ones added after the list
+    assert 'source:src/streaming.py' in inputs['/about']
+    assert 'source:src/catalog.py' in inputs['/about']
+
+
+def test_precompress_writes_sidecars():
+    """Test that text outputs get gzip and brotli sidecars."""
+    import gzip
+    from build import build_static_site, precompress_outputs
+    from content_encoding import available_encodings
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        build_static_site(output_dir=output_dir, precompress=True)
+        output_path = Path(output_dir)
+
+        index = output_path / 'index.html'
+        sidecar = output_path / 'index.html.gz'
+        assert gzip.decompress(sidecar.read_bytes()) == index.read_bytes()
+        if 'br' in available_encodings():
+            import brotli
+            br_sidecar = output_path / 'index.html.br'
+            assert brotli.decompress(br_sidecar.read_bytes()) == (
+                index.read_bytes()
+            )
+
+        # Files below the threshold are skipped and stale sidecars removed
+        results = precompress_outputs(output_path, threshold=10 ** 9)
+        assert results == []
+        assert not sidecar.exists()
+
+
+def test_critical_css_is_inlined():
+    """Test that pages inline above-the-fold CSS and defer the stylesheet."""
+    from build import build_static_site
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        build_static_site(output_dir=output_dir, critical_css=True)
+
+        with open(os.path.join(output_dir, 'index.html')) as f:
+            content = f.read()
+
+        head = content.split('</head>')[0]
+        critical = head.split('<style>')[1].split('</style>')[0]
+        assert '.navbar{' in critical
+        assert '.hero{' in critical
+        # The footer is below the fold
+        assert '.footer-links' not in critical
+        assert 'rel="preload"' in head
+        assert "this.rel='stylesheet'" in head
+        assert '<noscript><link rel="stylesheet"' in head
+
+
+def test_prune_css_removes_dead_selectors():
+    """Test that pages link to a pruned stylesheet listing dead rules."""
+    import json
+    from build import PRUNE_REPORT_NAME, build_static_site
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        build_static_site(output_dir=output_dir, prune_css=True)
+        output_path = Path(output_dir)
+
+        report = json.loads((output_path / PRUNE_REPORT_NAME).read_text())
+        entry = report['static/css/style.css']
+        pruned = (output_path / entry['file']).read_text()
+        index = (output_path / 'index.html').read_text()
+
+        assert f'href="/{entry["file"]}"' in index
+        assert '.resource-category' in entry['dead_selectors']
+        assert '.resource-category{' not in pruned
+        # Classes toggled from main.js are kept
+        assert '.nav-menu.active{' in pruned
+        assert '.copy-btn.copied{' in pruned
+        # The full stylesheet stays available
+        full = (output_path / 'static' / 'css' / 'style.css').read_text()
+        assert '.resource-category' in full
+
+
+def test_minify_pages_keeps_code_blocks():
+    """Test that minified pages are smaller and keep <pre> blocks intact."""
+    import re
+    from build import build_static_site
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        plain_dir = os.path.join(tmpdir, 'plain')
+        minified_dir = os.path.join(tmpdir, 'minified')
+        build_static_site(output_dir=plain_dir)
+        build_static_site(output_dir=minified_dir, minify=True)
+
+        plain = Path(plain_dir, 'tutorials.html').read_text()
+        minified = Path(minified_dir, 'tutorials.html').read_text()
+
+        assert len(minified) < len(plain)
+        for block in re.findall(r'<pre.*?</pre>', plain, re.DOTALL):
+            assert block in minified
+
+
+def test_sync_static_tree_writes_only_changed_files():
+    """Test that a static sync skips unchanged files and removes stale ones."""
+    from build import sync_static_tree
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = Path(tmpdir, 'src')
+        dest = Path(tmpdir, 'dest')
+        (src / 'css').mkdir(parents=True)
+        (src / 'css' / 'style.css').write_text('body{}')
+        (src / 'old.js').write_text('old()')
+
+        records, stats = sync_static_tree(src, dest)
+        assert (stats.copied, stats.unchanged) == (2, 0)
+        assert read_tree(dest) == read_tree(src)
+
+        # Build outputs that belong to a source file are kept
+        (dest / 'css' / 'style.0123456789ab.css').write_text('body{}')
+        (dest / 'css' / 'style.css.gz').write_bytes(b'gz')
+        unchanged = (dest / 'css' / 'style.css').stat().st_ino
+
+        (src / 'old.js').unlink()
+        (src / 'new.js').write_text('new()')
+        records, stats = sync_static_tree(src, dest, previous=records)
+
+        assert (stats.copied, stats.unchanged, stats.removed) == (1, 1, 1)
+        assert sorted(records) == ['css/style.css', 'new.js']
+        assert (dest / 'css' / 'style.css').stat().st_ino == unchanged
+        assert (dest / 'css' / 'style.0123456789ab.css').exists()
+        assert (dest / 'css' / 'style.css.gz').exists()
+        assert not (dest / 'old.js').exists()
+        assert (dest / 'new.js').read_text() == 'new()'
+
+
+def test_sync_static_tree_hardlinks_without_writing_through():
+    """Test that linked outputs are replaced, never modified in place."""
+    from build import copy_file, sync_static_tree
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = Path(tmpdir, 'src')
+        dest = Path(tmpdir, 'dest')
+        src.mkdir()
+        (src / 'app.js').write_text('one()')
+
+        _, stats = sync_static_tree(src, dest, link=True)
+        assert stats.linked == 1
+        assert (dest / 'app.js').samefile(src / 'app.js')
+
+        other = Path(tmpdir, 'other.js')
+        other.write_text('two()')
+        copy_file(other, dest / 'app.js')
+
+        assert (src / 'app.js').read_text() == 'one()'
+        assert (dest / 'app.js').read_text() == 'two()'
+
+
+def test_sync_build_keeps_unchanged_static_files():
+    """Test that a --sync rebuild leaves static files alone."""
+    from build import build_static_site
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        fresh_dir = os.path.join(tmpdir, 'fresh')
+        build_static_site(output_dir=output_dir, sync=True)
+        style = Path(output_dir, 'static', 'css', 'style.css')
+        before = style.stat().st_ino
+
+        build_static_site(output_dir=output_dir, sync=True)
+        build_static_site(output_dir=fresh_dir)
+
+        assert style.stat().st_ino == before
+        assert read_tree(output_dir) == read_tree(fresh_dir)
+
+
+def test_build_profiler_records_routes_and_stages(monkeypatch):
+    """Test that a profiled build times every route and stage."""
+    from build import build_static_site, discover_routes
+    from app import create_app
+    from profiling import BuildProfiler
+
+    # Templates loaded from the bytecode cache are not compiled
+    monkeypatch.setenv('TEMPLATE_BYTECODE_CACHE', 'false')
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        profiler = BuildProfiler()
+        build_static_site(
+            output_dir=output_dir, jobs=2, search_index=False,
+            profiler=profiler,
+        )
+
+        routes = [route for route, _ in discover_routes(create_app())]
+        assert sorted(profiler.routes) == sorted(routes)
+        index = profiler.routes['/']
+        assert index.bytes == Path(output_dir, 'index.html').stat().st_size
+        assert index.render > 0 and index.write > 0
+        assert 'base.html' in profiler.templates
+        assert {'app', 'plan', 'render', 'write', 'static'} <= set(
+            profiler.stages
+        )
+        assert profiler.total >= sum(profiler.stages.values()) * 0.99
+
+
+def test_search_index_covers_pages_and_resources():
+    """Test that the build writes a search index and links pages to it."""
+    import json
+    from build import build_static_site
+    from routes import get_learning_resources
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_dir = os.path.join(tmpdir, 'test_output')
+        build_static_site(output_dir=output_dir, base_url='/site/')
+
+        index = json.loads(
+            Path(output_dir, 'search', 'index.json').read_text()
+        )
+        urls = {doc['url'] for doc in index['docs']}
+        assert {'/site/', '/site/resources.html'} <= urls
+        assert '/site/404.html' not in urls
+        resources = [
+            entry.url
+            for entries in get_learning_resources().values()
+            for entry in entries
+        ]
+        assert set(resources) <= urls
+        for key in index['shards']:
+            assert Path(output_dir, 'search', f'{key}.json').exists()
+
+        page = Path(output_dir, 'about.html').read_text()
+        assert (
+            '<meta name="search-index" content="/site/search/index.json">'
+            in page
+        )
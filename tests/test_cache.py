@@ -0,0 +1,166 @@
+"""
+Tests for the rendered-page cache.
+
+This module tests cache hits that bypass Jinja, ETag/Last-Modified
+validation, LRU eviction, request variants and invalidation.
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from flask import template_rendered
+
+from app import create_app
+from cache import CachedPage, PageCache, invalidate_page_cache
+
+
+@pytest.fixture
+def app():
+    """Create a test app with the page cache enabled."""
+    return create_app({"TESTING": True, "PAGE_CACHE_SIZE": 8})
+
+
+@pytest.fixture
+def renders(app):
+    """Record the templates rendered by the app."""
+    rendered = []
+
+    def record(sender, template, context, **extra):
+        rendered.append(template.name)
+
+    template_rendered.connect(record, app)
+    yield rendered
+    template_rendered.disconnect(record, app)
+
+
+def test_hit_does_not_render(app, renders):
+    """Test that a repeated request is served without touching Jinja."""
+    client = app.test_client()
+    first = client.get('/resources')
+    assert renders == ['resources.html']
+
+    # Any template access on a hit would fail
+    app.jinja_env.get_template = None
+    second = client.get('/resources')
+
+    assert renders == ['resources.html']
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert app.extensions['page_cache'].hits == 1
+
+
+def test_conditional_requests_get_304(app, renders):
+    """Test If-None-Match and If-Modified-Since handling."""
+    client = app.test_client()
+    response = client.get('/about')
+    etag = response.headers['ETag']
+    assert not etag.startswith('W/')
+    assert 'Last-Modified' in response.headers
+
+    not_modified = client.get('/about', headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b''
+    assert not_modified.headers['ETag'] == etag
+
+    since = client.get(
+        '/about',
+        headers={'If-Modified-Since': response.headers['Last-Modified']},
+    )
+    assert since.status_code == 304
+
+    changed = client.get('/about', headers={'If-None-Match': '"other"'})
+    assert changed.status_code == 200
+    assert renders == ['about.html']
+
+
+def test_first_response_honours_if_none_match(app):
+    """Test that a miss still answers 304 when the ETag matches."""
+    etag = app.test_client().get('/examples').headers['ETag']
+    invalidate_page_cache(app)
+
+    response = app.test_client().get(
+        '/examples', headers={'If-None-Match': etag}
+    )
+    assert response.status_code == 304
+
+
+def test_invalidation_renders_again(app, renders):
+    """Test that invalidated pages are rendered on the next request."""
+    client = app.test_client()
+    client.get('/')
+    client.get('/about')
+
+    assert invalidate_page_cache(app, '/about') == 1
+    client.get('/')
+    client.get('/about')
+    assert renders == ['home.html', 'about.html', 'about.html']
+
+    assert invalidate_page_cache(app) == 2
+    client.get('/')
+    assert renders[-1] == 'home.html'
+
+
+def test_errors_and_non_get_requests_are_not_cached(app, renders):
+    """Test that only successful GET/HEAD responses are stored."""
+    client = app.test_client()
+    client.get('/missing')
+    client.get('/missing')
+    client.post('/')
+    assert renders == ['404.html', '404.html']
+    assert len(app.extensions['page_cache']) == 0
+
+
+def test_variants_are_cached_separately():
+    """Test that PAGE_CACHE_VARY headers select separate entries."""
+    app = create_app({
+        "TESTING": True, "PAGE_CACHE_SIZE": 8,
+        "PAGE_CACHE_VARY": ("Accept-Language",),
+    })
+    client = app.test_client()
+    response = client.get('/', headers={'Accept-Language': 'en'})
+    client.get('/', headers={'Accept-Language': 'fr'})
+    client.get('/', headers={'Accept-Language': 'en'})
+
+    assert 'Accept-Language' in response.headers['Vary']
+    cache = app.extensions['page_cache']
+    assert (len(cache), cache.hits) == (2, 1)
+
+
+def test_cache_stores_minified_output():
+    """Test that hits replay the output of later after_request filters."""
+    app = create_app({
+        "TESTING": True, "PAGE_CACHE_SIZE": 8, "MINIFY_HTML": True,
+    })
+    client = app.test_client()
+    first = client.get('/about').data
+    assert client.get('/about').data == first
+    assert app.extensions['page_cache'].hits == 1
+
+    unminified = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 0})
+    assert len(first) < len(unminified.test_client().get('/about').data)
+
+
+def test_lru_evicts_least_recently_used():
+    """Test that the oldest unused entry is dropped when full."""
+    cache = PageCache(max_entries=2)
+    page = CachedPage(b'x', 200, ())
+    a, b, c = [(path, '', ()) for path in ('/a', '/b', '/c')]
+    cache.put(a, page)
+    cache.put(b, page)
+    cache.get(a)
+    cache.put(c, page)
+
+    assert cache.get(b) is None
+    assert cache.get(a) is page and cache.get(c) is page
+
+
+def test_cache_disabled_by_size_zero():
+    """Test that PAGE_CACHE_SIZE=0 leaves the app uncached."""
+    app = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 0})
+    assert 'page_cache' not in app.extensions
+    assert 'ETag' not in app.test_client().get('/').headers
@@ -0,0 +1,68 @@
+"""
+Tests for the resource and example catalog.
+
+This module tests that the catalog is built once, cannot be modified and
+keeps the attributes the templates use.
+"""
+
+import dataclasses
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from catalog import Example, Resource, build_resources, load_catalog
+from routes import get_copilot_examples, get_learning_resources
+
+
+def test_catalog_is_built_once():
+    """Test that every call returns the same objects."""
+    assert load_catalog() is load_catalog()
+    assert get_learning_resources() is get_learning_resources()
+    assert get_copilot_examples() is load_catalog().examples
+
+
+def test_catalog_is_immutable():
+    """Test that records and collections reject changes."""
+    resources = get_learning_resources()
+    resource = resources['documentation'][0]
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        resource.title = 'Changed'
+    with pytest.raises(TypeError):
+        resources['documentation'] = ()
+    assert isinstance(resources['documentation'], tuple)
+    assert isinstance(get_copilot_examples()[0].features, tuple)
+
+
+def test_records_are_slotted():
+    """Test that records carry no per-instance __dict__."""
+    resource = get_learning_resources()['courses'][0]
+    example = get_copilot_examples()[0]
+
+    assert not hasattr(resource, '__dict__')
+    assert not hasattr(example, '__dict__')
+    assert isinstance(resource, Resource) and isinstance(example, Example)
+
+
+def test_records_keep_template_attributes():
+    """Test the attributes read by resources.html and examples.html."""
+    courses = get_learning_resources()['courses']
+    videos = get_learning_resources()['videos']
+
+    assert all(course.platform and course.level for course in courses)
+    assert all(video.level is None for video in videos)
+    assert {'title', 'description', 'url', 'cost'} <= {
+        field.name for field in dataclasses.fields(Resource)
+    }
+    example = get_copilot_examples()[0]
+    assert example.title == 'Code Completion'
+    assert len(example.features) == 3
+
+
+def test_build_resources_matches_catalog():
+    """Test that a fresh build equals the cached catalog."""
+    assert build_resources() == load_catalog().resources
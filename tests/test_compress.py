@@ -0,0 +1,243 @@
+"""
+Tests for runtime response compression.
+
+This module tests encoding negotiation, compressed responses and their
+validators, the compressed body cache, and the responses that are left
+uncompressed.
+"""
+
+import gzip
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from werkzeug.datastructures import Headers
+
+from app import create_app
+from compress import (
+    CompressedBodyCache,
+    CompressionMiddleware,
+    call_app,
+    choose_encoding,
+    is_compressible,
+)
+
+
+@pytest.fixture
+def app():
+    """Create a test app with the page cache."""
+    return create_app({"TESTING": True, "PAGE_CACHE_SIZE": 8})
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip;q=1.0, br;q=0.5', 'gzip'),
+    ('br;q=0, gzip', 'gzip'),
+    ('*;q=0.1', 'br'),
+    ('deflate', None),
+    ('', None),
+])
+def test_choose_encoding(header, expected):
+    """Test negotiation by quality value with brotli preferred on ties."""
+    assert choose_encoding(header, ('br', 'gzip')) == expected
+
+
+def test_gzip_response(app):
+    """Test that a page is gzipped with a weak ETag and Vary."""
+    client = app.test_client()
+    plain = client.get('/about')
+    response = client.get('/about', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert gzip.decompress(response.data) == plain.data
+    assert response.headers['ETag'] == 'W/' + plain.headers['ETag']
+    assert 'Content-Encoding' not in plain.headers
+
+
+def test_brotli_response(app):
+    """Test that brotli is used when the client prefers it."""
+    brotli = pytest.importorskip('brotli')
+    client = app.test_client()
+    response = client.get(
+        '/static/css/style.css', headers={'Accept-Encoding': 'gzip, br'}
+    )
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == (
+        client.get('/static/css/style.css').data
+    )
+
+
+def test_compressed_bodies_are_reused(app):
+    """Test that the same bytes are compressed only once."""
+    client = app.test_client()
+    headers = {'Accept-Encoding': 'gzip'}
+    first = client.get('/static/css/style.css', headers=headers)
+    second = client.get('/static/css/style.css', headers=headers)
+    cache = app.extensions['compression_cache']
+
+    assert first.data == second.data
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_conditional_requests_match_weak_etags(app):
+    """Test 304s from the page cache and the API for compressed pages."""
+    client = app.test_client()
+    headers = {'Accept-Encoding': 'gzip'}
+    for url in ('/about', '/api/resources?limit=20'):
+        etag = client.get(url, headers=headers).headers['ETag']
+        assert etag.startswith('W/')
+        response = client.get(
+            url, headers={**headers, 'If-None-Match': etag}
+        )
+        assert response.status_code == 304
+
+
+def test_streamed_pages_are_compressed_progressively():
+    """Test that streamed pages are compressed chunk by chunk."""
+    app = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 0})
+    client = app.test_client()
+    plain = client.get('/tutorials').data
+    response = client.get(
+        '/tutorials', headers={'Accept-Encoding': 'gzip'}, buffered=False
+    )
+    chunks = list(response.response)
+
+    assert 'Content-Length' not in response.headers
+    assert len(chunks) > 2
+    assert gzip.decompress(b''.join(chunks)) == plain
+
+
+def test_small_responses_are_not_compressed():
+    """Test that bodies under COMPRESSION_MIN_SIZE are sent as they are."""
+    app = create_app({"TESTING": True, "COMPRESSION_MIN_SIZE": 100_000})
+    response = app.test_client().get(
+        '/about', headers={'Accept-Encoding': 'gzip'}
+    )
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+
+def test_exports_are_not_compressed_twice(app):
+    """Test that responses with a Content-Encoding are left alone."""
+    response = app.test_client().get(
+        '/api/export/examples.ndjson', headers={'Accept-Encoding': 'br, gzip'}
+    )
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data).startswith(b'{"title"')
+
+
+@pytest.mark.parametrize('content_type, expected', [
+    ('text/html; charset=utf-8', True),
+    ('application/json', True),
+    ('image/png', False),
+    ('application/gzip', False),
+])
+def test_is_compressible(content_type, expected):
+    """Test that only text types are compressed."""
+    headers = Headers({'Content-Type': content_type})
+
+    assert is_compressible('200 OK', headers) is expected
+    assert not is_compressible('206 Partial Content', headers)
+
+
+def test_cache_is_bounded_by_size():
+    """Test that the least recently used bodies are dropped."""
+    cache = CompressedBodyCache(max_bytes=100)
+    for n in range(10):
+        cache.compress(os.urandom(40), 'gzip', 6)
+
+    assert cache.size <= 100
+    assert len(cache) < 10
+
+
+def test_compression_can_be_disabled():
+    """Test the COMPRESSION switch."""
+    app = create_app({"TESTING": True, "COMPRESSION": False})
+    response = app.test_client().get(
+        '/about', headers={'Accept-Encoding': 'gzip'}
+    )
+
+    assert 'Content-Encoding' not in response.headers
+    assert 'Vary' not in response.headers
+
+
+def test_not_modified_keeps_weak_etag(app):
+    """Test that a 304 repeats the validator of the compressed 200."""
+    client = app.test_client()
+    headers = {'Accept-Encoding': 'gzip'}
+    response = client.get('/about', headers=headers)
+    etag = response.headers['ETag']
+
+    revalidated = client.get(
+        '/about', headers={**headers, 'If-None-Match': etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+    assert revalidated.headers['Vary'] == 'Accept-Encoding'
+
+    plain = client.get('/about', headers={'If-None-Match': etag})
+    assert plain.status_code == 304
+    assert not plain.headers['ETag'].startswith('W/')
+
+
+def test_not_modified_image_keeps_strong_etag():
+    """Test that 304s for types that are never compressed are untouched."""
+    def image(environ, start_response):
+        start_response('304 Not Modified', [('ETag', '"abc"')])
+        return []
+
+    middleware = CompressionMiddleware(image, CompressedBodyCache(), {})
+    statuses = []
+    middleware(
+        {'PATH_INFO': '/static/logo.png', 'HTTP_ACCEPT_ENCODING': 'gzip'},
+        lambda status, headers: statuses.append(dict(headers)),
+    )
+    assert statuses[0]['ETag'] == '"abc"'
+
+
+def test_streamed_body_is_closed_when_abandoned():
+    """Test that closing a compressed stream closes the app's iterable."""
+    closed = []
+
+    class Body:
+        def __iter__(self):
+            yield b'x' * 1000
+            yield b'y' * 1000
+
+        def close(self):
+            closed.append(True)
+
+    def streamed(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/html')])
+        return Body()
+
+    middleware = CompressionMiddleware(
+        streamed, CompressedBodyCache(), {'gzip': 6, 'br': 5}
+    )
+    body = middleware(
+        {'HTTP_ACCEPT_ENCODING': 'gzip'}, lambda status, headers: None
+    )
+    next(iter(body))
+    body.close()
+    assert closed == [True]
+
+
+def test_call_app_keeps_written_data():
+    """Test that data passed to write() precedes the returned body."""
+    def legacy(environ, start_response):
+        write = start_response('200 OK', [('Content-Type', 'text/plain')])
+        write(b'head ')
+        return [b'body']
+
+    body, status, headers = call_app(legacy, {})
+    assert status == '200 OK'
+    assert headers['Content-Type'] == 'text/plain'
+    assert b''.join(body) == b'head body'
@@ -0,0 +1,183 @@
+"""
+Tests for the streaming NDJSON export.
+
+This module tests the export records, offsets, gzip streaming, memory
+use, the ``/api/export`` routes and the command line interface.
+"""
+
+import gzip
+import json
+import os
+import sys
+import tracemalloc
+import zlib
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from app import create_app
+from catalog import Resource
+from export import (
+    export_stream, gzip_chunks, iter_examples, iter_resources, main,
+    ndjson_lines,
+)
+from routes import get_copilot_examples, get_learning_resources
+
+
+def synthetic_resources(count):
+    """Make a catalog with ``count`` resources in one category."""
+    return {'courses': [
+        Resource(
+            title=f'Resource {n}',
+            description='Synthetic entry for the export tests',
+            url=f'https://example.com/{n}',
+            cost='Free',
+            level='Beginner',
+        )
+        for n in range(count)
+    ]}
+
+
+def read_lines(data):
+    """Parse NDJSON bytes."""
+    return [json.loads(line) for line in data.splitlines()]
+
+
+@pytest.fixture
+def client():
+    """Create a test client."""
+    return create_app({"TESTING": True}).test_client()
+
+
+def test_records_cover_the_catalog():
+    """Test that every resource and example is exported once."""
+    resources = list(iter_resources())
+    total = sum(len(entries) for entries in get_learning_resources().values())
+
+    assert len(resources) == total
+    assert resources[0]['category'] == 'documentation'
+    assert set(resources[0]) == {
+        'category', 'title', 'description', 'url', 'cost', 'platform',
+        'level',
+    }
+    examples = list(iter_examples())
+    assert [example['title'] for example in examples] == [
+        example.title for example in get_copilot_examples()
+    ]
+
+
+def test_offset_resumes_the_export():
+    """Test that an offset skips exactly that many records."""
+    resources = synthetic_resources(100)
+    full = b''.join(ndjson_lines(iter_resources(resources)))
+    rest = b''.join(ndjson_lines(iter_resources(resources), offset=37))
+
+    assert full.splitlines()[37:] == rest.splitlines()
+    assert b''.join(ndjson_lines(iter_resources(resources), 500)) == b''
+
+
+def test_gzip_stream_is_decodable_when_cut_off():
+    """Test that the data up to a sync flush survives a cut connection."""
+    lines = ndjson_lines(iter_resources(synthetic_resources(1000)))
+    chunks = list(gzip_chunks(lines, flush_every=100))
+    partial = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(
+        b''.join(chunks[:3])
+    )
+
+    assert len(chunks) > 3
+    assert partial.endswith(b'\n')
+    assert len(read_lines(partial)) % 100 == 0
+    assert len(read_lines(gzip.decompress(b''.join(chunks)))) == 1000
+
+
+def test_memory_stays_flat():
+    """Test that streaming does not hold the export in memory."""
+    resources = synthetic_resources(20000)
+    tracemalloc.start()
+    try:
+        size = sum(map(len, export_stream(iter_resources(resources))))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert size > 3_000_000
+    assert peak < 100_000
+
+
+def test_export_route(client):
+    """Test the uncompressed export and its headers."""
+    response = client.get('/api/export/resources.ndjson?offset=2')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'application/x-ndjson'
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+    records = read_lines(response.data)
+    assert records == list(iter_resources())[2:]
+
+
+def test_export_route_gzip(client):
+    """Test that clients accepting gzip get a compressed stream."""
+    response = client.get(
+        '/api/export/examples.ndjson',
+        headers={'Accept-Encoding': 'gzip, deflate'},
+    )
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    expected = json.loads(json.dumps(list(iter_examples())))
+    assert read_lines(gzip.decompress(response.data)) == expected
+
+
+@pytest.mark.parametrize('url, status', [
+    ('/api/export/authors.ndjson', 404),
+    ('/api/export/examples.ndjson?offset=-1', 400),
+    ('/api/export/examples.ndjson?offset=x', 400),
+])
+def test_export_errors(client, url, status):
+    """Test that bad exports and offsets get a JSON error."""
+    response = client.get(url)
+
+    assert response.status_code == status
+    assert 'error' in response.get_json()
+
+
+def test_non_ascii_digit_offset_is_rejected(client):
+    """Test that digits int() cannot parse get the usual message."""
+    response = client.get('/api/export/examples.ndjson?offset=%C2%B2')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == (
+        'offset must be a non-negative integer'
+    )
+
+
+def test_cli_resume(tmp_path):
+    """Test that --resume drops a partial line and appends the rest."""
+    output = tmp_path / 'examples.ndjson'
+    assert main(['examples', '-o', str(output)]) == 0
+    complete = output.read_bytes()
+    lines = complete.splitlines(keepends=True)
+    output.write_bytes(b''.join(lines[:2]) + lines[2][:10])
+
+    assert main(['examples', '-o', str(output), '--resume']) == 0
+    assert output.read_bytes() == complete
+
+
+def test_cli_gzip(tmp_path):
+    """Test writing a compressed export."""
+    output = tmp_path / 'resources.ndjson.gz'
+    main(['resources', '-o', str(output), '--gzip', '--offset', '1'])
+
+    with gzip.open(output) as stream:
+        assert read_lines(stream.read()) == list(iter_resources())[1:]
+
+
+@pytest.mark.parametrize('offset', ['-1', 'two', '²'])
+def test_cli_rejects_bad_offset(offset, capsys):
+    """Test that the CLI checks --offset like the route does."""
+    with pytest.raises(SystemExit):
+        main(['examples', '--offset', offset])
+    assert 'non-negative integer' in capsys.readouterr().err
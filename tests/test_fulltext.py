@@ -0,0 +1,193 @@
+"""
+Tests for the full-text search endpoint.
+
+This module tests BM25 ranking, snippet highlighting, markdown splitting,
+incremental re-indexing and the ``/search`` route.
+"""
+
+import os
+import subprocess
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from app import create_app
+from fulltext import (
+    FullTextIndex, SiteSearch, highlight, markdown_documents, slugify,
+)
+from search import SearchDocument
+
+
+def document(title, text):
+    """Make a search document."""
+    return SearchDocument(title=title, url=f'/{title}', text=text, kind='Test')
+
+
+@pytest.fixture
+def app():
+    """Create a test app without the page cache."""
+    return create_app({"TESTING": True, "PAGE_CACHE_SIZE": 0})
+
+
+def test_bm25_prefers_rare_terms_and_titles():
+    """Test that rare terms and title matches score higher."""
+    index = FullTextIndex()
+    common = index.add(document('Editors', 'copilot in the editor'))
+    rare = index.add(document('Agents', 'copilot agents'))
+    titled = index.add(document('Prompts', 'writing prompts with copilot'))
+    for n in range(5):
+        index.add(document(f'Filler {n}', 'copilot suggestions'))
+
+    assert index.rank(['agents'])[0][0] == rare
+    assert index.rank(['prompts'])[0][0] == titled
+    ranked = [doc_id for doc_id, _ in index.rank(['copilot', 'editor'])]
+    assert ranked[0] == common
+
+
+def test_remove_drops_postings():
+    """Test that removed documents no longer match."""
+    index = FullTextIndex()
+    doc_id = index.add(document('Only', 'unique words here'))
+    index.add(document('Other', 'other words'))
+
+    index.remove(doc_id)
+    assert index.rank(['unique']) == []
+    assert 'unique' not in index.postings
+    assert len(index) == 1
+
+
+def test_highlight_marks_matches_and_escapes():
+    """Test that snippets mark query terms and escape markup."""
+    text = 'Intro text. ' * 40 + 'Use <b>agents</b> with Agents mode.'
+    snippet = highlight(text, ['agents'])
+
+    assert '&lt;b&gt;<mark>agents</mark>&lt;/b&gt;' in snippet
+    assert '<mark>Agents</mark>' in snippet
+    assert snippet.startswith('…')
+    assert highlight('No match here', ['agents']) == 'No match here'
+
+
+def test_markdown_is_split_into_sections(tmp_path):
+    """Test front matter removal, section titles and anchors."""
+    path = tmp_path / 'guide.md'
+    path.write_text(
+        '---\ndescription: hidden\n---\n# Guide\nIntro\n\n'
+        '## Step 2: Setup\nRun `pip install` [docs](https://x.test)\n'
+        '```\n## not a heading\n```\n',
+        encoding='utf-8',
+    )
+    documents = markdown_documents(path, tmp_path)
+
+    assert [doc.title for doc in documents] == [
+        'Guide', 'Guide › Step 2: Setup',
+    ]
+    assert documents[1].url.endswith('guide.md#step-2-setup')
+    assert 'pip install docs' in documents[1].text
+    assert 'not a heading' in documents[1].text
+    assert 'hidden' not in documents[0].text
+    assert slugify('📖 Topics Covered') == '-topics-covered'
+
+
+def test_changed_files_are_reindexed(app, tmp_path):
+    """Test that only new, changed and deleted sources are re-indexed."""
+    folder = tmp_path / '.github' / 'prompts'
+    folder.mkdir(parents=True)
+    first = folder / 'first.md'
+    first.write_text('# First\nAlpha content\n', encoding='utf-8')
+    (folder / 'second.md').write_text('# Second\nBeta\n', encoding='utf-8')
+    site_search = SiteSearch(app, root=tmp_path, refresh_interval=0)
+
+    assert site_search.refresh() == 4
+    assert site_search.refresh() == 0
+    assert site_search.search('alpha')[0].title == 'First'
+
+    first.write_text('# First\nGamma content\n', encoding='utf-8')
+    os.utime(first, ns=(0, 1))
+    assert site_search.refresh() == 1
+    assert site_search.search('alpha') == []
+    assert site_search.search('gamma')[0].title == 'First'
+
+    first.unlink()
+    assert site_search.search('gamma') == []
+    assert site_search.refresh() == 0
+
+
+def test_search_page(app):
+    """Test the HTML results page."""
+    response = app.test_client().get('/search?q=custom+instructions')
+
+    assert response.status_code == 200
+    assert b'<mark>' in response.data
+    assert b'/tutorials#instructions' in response.data
+
+
+def test_search_json(app):
+    """Test JSON results and the result limit."""
+    data = app.test_client().get(
+        '/search?q=copilot&format=json&limit=3'
+    ).get_json()
+
+    assert data['query'] == 'copilot'
+    assert len(data['results']) == 3
+    scores = [result['score'] for result in data['results']]
+    assert scores == sorted(scores, reverse=True)
+    assert {'title', 'url', 'kind', 'snippet'} <= set(data['results'][0])
+
+
+def test_empty_query_has_no_results(app):
+    """Test that a blank query renders the form only."""
+    response = app.test_client().get('/search?q=+')
+
+    assert response.status_code == 200
+    assert b'result' not in response.data.split(b'<main')[1].lower()
+
+
+def test_static_build_skips_search():
+    """Test that the static build does not render /search."""
+    from build import discover_routes
+
+    routes = [route for route, _ in discover_routes(create_app())]
+    assert '/search' not in routes
+
+
+def test_results_are_not_page_cached():
+    """Test that search results bypass the page cache."""
+    app = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 8})
+    client = app.test_client()
+    client.get('/search?q=agents')
+    response = client.get('/search?q=agents')
+
+    assert 'private' in response.headers['Cache-Control']
+    assert len(app.extensions['page_cache']) == 0
+
+
+def test_file_removed_after_listing_is_skipped(app, tmp_path, monkeypatch):
+    """Test that a source deleted between glob and stat is dropped."""
+    folder = tmp_path / '.github' / 'prompts'
+    folder.mkdir(parents=True)
+    gone = folder / 'gone.md'
+    gone.write_text('# Gone\nDelta content\n', encoding='utf-8')
+    site_search = SiteSearch(app, root=tmp_path, refresh_interval=0)
+    assert site_search.search('delta')[0].title == 'Gone'
+
+    listed = site_search.sources()
+    monkeypatch.setattr(site_search, 'sources', lambda: listed)
+    gone.unlink()
+    assert site_search.search('delta') == []
+
+
+def test_create_app_does_not_import_bs4():
+    """Test that BeautifulSoup is only imported once pages are indexed."""
+    src = os.path.join(os.path.dirname(__file__), '..', 'src')
+    code = (
+        'import sys; from app import create_app; create_app(); '
+        'print("bs4" in sys.modules)'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=src, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == 'False'
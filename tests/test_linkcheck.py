@@ -0,0 +1,189 @@
+"""
+Tests for the catalog link checker.
+
+The checker runs against a local stand-in HTTP server, so no network
+access is needed.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+import linkcheck
+from linkcheck import (
+    LinkCache, LinkChecker, LinkResult, catalog_urls, check_links, main,
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer each path with a canned response."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        """Keep test output quiet."""
+
+    def respond(self):
+        """Send the response for the requested path."""
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        path = self.path.split('?', 1)[0]
+        try:
+            time.sleep(server.delay)
+            if path == '/ok':
+                self.send_response(200)
+            elif path == '/missing':
+                self.send_response(404)
+            elif path == '/moved':
+                self.send_response(301)
+                self.send_header('Location', '/ok')
+            elif path == '/loop':
+                self.send_response(302)
+                self.send_header('Location', '/loop')
+            elif path == '/no-head' and self.command == 'HEAD':
+                self.send_response(405)
+            elif path == '/no-head':
+                self.send_response(200)
+            elif path == '/slow':
+                time.sleep(1)
+                self.send_response(200)
+            else:
+                self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    do_HEAD = respond
+    do_GET = respond
+
+
+@pytest.fixture
+def stub_server():
+    """Run the stand-in server on a free local port."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.active = 0
+    server.peak = 0
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_check_links_reports_each_outcome(stub_server):
+    """Test working, broken, redirected and HEAD-refusing URLs."""
+    base = stub_server.url
+    checker = LinkChecker(timeout=0.5)
+    results = check_links(
+        [f'{base}/ok', f'{base}/missing', f'{base}/moved',
+         f'{base}/no-head', f'{base}/loop', f'{base}/slow',
+         'http://127.0.0.1:1/closed'],
+        checker=checker,
+    )
+    by_path = {result.url.rsplit('/', 1)[1]: result for result in results}
+
+    assert by_path['ok'].ok and by_path['ok'].status == 200
+    assert not by_path['missing'].ok and by_path['missing'].error == 'HTTP 404'
+    assert by_path['moved'].ok and by_path['moved'].final_url == f'{base}/ok'
+    assert by_path['no-head'].ok
+    assert ('GET', '/no-head') in stub_server.requests
+    assert 'redirects' in by_path['loop'].error
+    assert 'timed out' in by_path['slow'].error
+    assert not by_path['closed'].ok and by_path['closed'].status == 0
+
+
+def test_per_host_limit_caps_concurrency(stub_server):
+    """Test that no more than max_per_host requests reach one host."""
+    stub_server.delay = 0.05
+    urls = [f'{stub_server.url}/ok?page={n}' for n in range(8)]
+    results = check_links(urls, checker=LinkChecker(max_per_host=2))
+
+    assert all(result.ok for result in results)
+    assert stub_server.peak == 2
+
+
+def test_busy_host_does_not_block_others(monkeypatch):
+    """Test that requests waiting for one host leave slots to others."""
+    finished = []
+
+    async def fake_fetch(url, method, timeout, ssl_context):
+        await asyncio.sleep(0.05 if 'busy' in url else 0)
+        finished.append(url)
+        return 200, {}
+
+    monkeypatch.setattr(linkcheck, 'fetch_status', fake_fetch)
+    urls = [f'http://busy.test/{n}' for n in range(4)]
+    urls.append('http://idle.test/')
+    checker = LinkChecker(max_connections=2, max_per_host=1)
+    results = check_links(urls, checker=checker)
+
+    assert all(result.ok for result in results)
+    assert finished.index('http://idle.test/') < 2
+
+
+def test_cache_skips_fresh_results(stub_server, tmp_path):
+    """Test that cached results are reused until they expire."""
+    cache_file = tmp_path / 'cache.json'
+    urls = [f'{stub_server.url}/ok', f'{stub_server.url}/missing']
+
+    check_links(urls, cache=LinkCache(cache_file))
+    assert len(stub_server.requests) == 2
+
+    # A second run within the TTL sends no requests
+    results = check_links(urls, cache=LinkCache(cache_file))
+    assert len(stub_server.requests) == 2
+    assert [result.ok for result in results] == [True, False]
+
+    # Broken links expire sooner than working ones
+    check_links(urls, cache=LinkCache(cache_file, error_ttl=0))
+    assert stub_server.requests[2:] == [('HEAD', '/missing')]
+
+
+def test_cache_expiry():
+    """Test the TTL arithmetic of cache lookups."""
+    cache = LinkCache('/nonexistent/cache.json', ttl=100, error_ttl=10)
+    cache.put(LinkResult('https://a.example', ok=True, checked_at=1000))
+    cache.put(LinkResult('https://b.example', ok=False, checked_at=1000))
+
+    assert cache.get('https://a.example', now=1050) is not None
+    assert cache.get('https://a.example', now=1100) is None
+    assert cache.get('https://b.example', now=1005) is not None
+    assert cache.get('https://b.example', now=1011) is None
+    assert cache.get('https://c.example', now=1000) is None
+
+
+def test_main_exits_nonzero_on_broken_links(stub_server, tmp_path, capsys):
+    """Test the command line entry point."""
+    args = ['--cache', str(tmp_path / 'cache.json')]
+    assert main(args + [f'{stub_server.url}/ok']) == 0
+    assert main(args + [f'{stub_server.url}/missing']) == 1
+    assert '1 broken' in capsys.readouterr().out
+
+
+def test_catalog_urls_cover_every_resource():
+    """Test that the catalog URLs come from get_learning_resources."""
+    from routes import get_learning_resources
+
+    urls = catalog_urls()
+    assert len(urls) == sum(
+        len(entries) for entries in get_learning_resources().values()
+    )
+    assert all(url.startswith('https://') for url in urls)
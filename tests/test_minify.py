@@ -0,0 +1,125 @@
+"""
+Tests for the streaming HTML minifier.
+
+This module tests minification of whole documents and chunked streams,
+and the opt-in after_request filter in the Flask app.
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from flask import stream_with_context
+
+from app import create_app
+from minify import HTMLMinifier, minify_html, minify_stream
+
+DOCUMENT = """<!DOCTYPE html>
+<html>
+    <!-- navigation -->
+    <body>
+        <p class="lead">
+            Hello   there
+        </p>
+        <pre><code>def f():
+    return  1   # keep
+</code></pre>
+        <!--[if IE]><p>old</p><![endif]-->
+        <script>if (a  <  b) { x = "  y  "; }</script>
+        <p>Café <code>a  b</code> <span title="a > b">z</span></p>
+    </body>
+</html>
+"""
+
+
+class TestMinifyHTML:
+    """Tests for minify_html."""
+
+    def test_removes_comments_and_indentation(self):
+        """Test that comments go and whitespace runs are collapsed."""
+        result = minify_html(DOCUMENT)
+
+        assert '<!-- navigation -->' not in result
+        assert '        ' not in result.split('<pre>')[0]
+        assert '<p class="lead">\nHello there\n</p>' in result
+
+    def test_keeps_preformatted_and_script_content(self):
+        """Test that pre, code and script contents are untouched."""
+        result = minify_html(DOCUMENT)
+
+        assert 'def f():\n    return  1   # keep\n' in result
+        assert '<code>a  b</code>' in result
+        assert 'if (a  <  b) { x = "  y  "; }' in result
+        assert '<span title="a > b">z</span>' in result
+
+    def test_keeps_conditional_comments(self):
+        """Test that conditional comments are preserved."""
+        assert '<!--[if IE]><p>old</p><![endif]-->' in minify_html(DOCUMENT)
+
+    @pytest.mark.parametrize('size', [1, 2, 3, 7, 64])
+    def test_chunked_output_matches_whole_document(self, size):
+        """Test that any chunking gives the same output."""
+        minifier = HTMLMinifier()
+        chunks = [
+            minifier.feed(DOCUMENT[i:i + size])
+            for i in range(0, len(DOCUMENT), size)
+        ]
+        chunks.append(minifier.close())
+
+        assert ''.join(chunks) == minify_html(DOCUMENT)
+        assert minifier.bytes_saved == (
+            len(DOCUMENT.encode('utf-8'))
+            - len(minify_html(DOCUMENT).encode('utf-8'))
+        )
+
+    def test_minify_stream_handles_split_utf8(self):
+        """Test that bytes chunks split inside a character decode correctly."""
+        data = DOCUMENT.encode('utf-8')
+        chunks = [data[i:i + 5] for i in range(0, len(data), 5)]
+
+        result = b''.join(minify_stream(chunks)).decode('utf-8')
+
+        assert result == minify_html(DOCUMENT)
+
+
+class TestMinifyFilter:
+    """Tests for the MINIFY_HTML after_request filter."""
+
+    def test_disabled_by_default(self):
+        """Test that responses are untouched unless enabled."""
+        app = create_app({"TESTING": True})
+        response = app.test_client().get("/")
+
+        assert b"    <" in response.data
+
+    def test_minifies_html_responses(self):
+        """Test that enabled apps serve smaller, equivalent pages."""
+        plain = create_app({"TESTING": True}).test_client().get("/tutorials")
+        app = create_app({"TESTING": True, "MINIFY_HTML": True})
+        response = app.test_client().get("/tutorials")
+
+        assert response.status_code == 200
+        assert len(response.data) < len(plain.data)
+        assert response.get_data(as_text=True) == minify_html(
+            plain.get_data(as_text=True)
+        )
+
+    def test_minifies_streamed_responses(self):
+        """Test that streamed responses are minified chunk by chunk."""
+        app = create_app({"TESTING": True, "MINIFY_HTML": True})
+
+        @app.route("/streamed")
+        def streamed():
+            def generate():
+                yield "<div>\n    <p>  one"
+                yield "  two  </p>\n</div>"
+            return app.response_class(
+                stream_with_context(generate()), mimetype="text/html"
+            )
+
+        response = app.test_client().get("/streamed")
+
+        assert response.data == b"<div>\n<p> one two </p>\n</div>"
@@ -0,0 +1,221 @@
+"""
+Tests for the prefork launcher.
+
+This module tests the memory figures read from ``/proc``, the request
+counting that triggers worker recycling, warming and freezing the app,
+and a launcher run that recycles its workers and stops on SIGTERM.
+"""
+
+import gc
+import os
+import signal
+import subprocess
+import sys
+import urllib.request
+
+import pytest
+from werkzeug.test import Client
+from werkzeug.wsgi import ClosingIterator
+from werkzeug.wrappers import Response
+
+# Add src to path for imports
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC)
+
+from app import create_app
+import prefork
+from prefork import (
+    Arbiter,
+    MemoryUsage,
+    RequestTracker,
+    RESPONSE_KEY,
+    Worker,
+    WorkerRequestHandler,
+    main,
+    parse_smaps_rollup,
+    preload_app,
+    read_memory,
+    warm_app,
+)
+
+SMAPS_ROLLUP = """\
+00400000-7ffd3e7f2000 ---p 00000000 00:00 0    [rollup]
+Rss:               40960 kB
+Pss:               20480 kB
+Shared_Clean:      20000 kB
+Shared_Dirty:       4000 kB
+Private_Clean:      1000 kB
+Private_Dirty:     15960 kB
+Swap:                  0 kB
+"""
+
+needs_proc = pytest.mark.skipif(
+    not os.path.exists(f'/proc/{os.getpid()}/smaps_rollup'),
+    reason='needs /proc/<pid>/smaps_rollup',
+)
+
+
+def test_parse_smaps_rollup():
+    """Test that shared and private pages are summed in bytes."""
+    usage = parse_smaps_rollup(SMAPS_ROLLUP)
+    assert usage == MemoryUsage(
+        rss=40960 * 1024,
+        pss=20480 * 1024,
+        shared=24000 * 1024,
+        private=16960 * 1024,
+    )
+    assert str(usage) == (
+        'rss 40.0 MB, shared 23.4 MB, private 16.6 MB, pss 20.0 MB'
+    )
+
+
+@needs_proc
+def test_read_memory():
+    """Test that the current process's memory can be read."""
+    usage = read_memory(os.getpid())
+    assert usage is not None
+    assert usage.rss > 0
+    assert usage.shared + usage.private == usage.rss
+
+
+def test_read_memory_of_missing_process():
+    """Test that an unknown process has no memory figures."""
+    assert read_memory(2 ** 30) is None
+
+
+def test_request_tracker_counts_requests():
+    """Test that the limit callback runs once and requests are tracked."""
+    reached = []
+    tracker = RequestTracker(
+        create_app({'TESTING': True}),
+        max_requests=2,
+        on_limit=lambda: reached.append(tracker.served),
+    )
+    client = Client(tracker, Response)
+
+    for _ in range(3):
+        response = client.get('/about')
+        assert response.status_code == 200
+        response.close()
+    assert tracker.served == 3
+    assert reached == [2]
+    assert tracker.active == 0
+    assert tracker.wait_idle(0)
+
+
+def test_request_tracker_waits_for_streamed_responses():
+    """Test that a response counts as active until it is closed."""
+    tracker = RequestTracker(
+        create_app({'TESTING': True, 'PAGE_CACHE_SIZE': 0})
+    )
+    client = Client(tracker, Response)
+
+    response = client.get('/tutorials', buffered=False)
+    assert tracker.active == 1
+    assert not tracker.wait_idle(0)
+    response.close()
+    assert tracker.active == 0
+
+
+def test_dropped_connection_finishes_request():
+    """Test that a request whose client left is no longer in flight."""
+    closed = []
+
+    def app(environ, start_response):
+        start_response('200 OK', [])
+        body = iter([b'ok'])
+        return ClosingIterator(body, lambda: closed.append(True))
+
+    tracker = RequestTracker(app)
+    environ = {}
+    tracker(environ, lambda status, headers: None)
+    assert tracker.active == 1
+
+    # Werkzeug reports the drop instead of closing the response
+    handler = WorkerRequestHandler.__new__(WorkerRequestHandler)
+    handler.connection_dropped(ConnectionResetError(), environ)
+    environ[RESPONSE_KEY].close()
+    assert tracker.active == 0
+    assert closed == [True]
+
+
+def test_warm_app_fills_page_cache():
+    """Test that warming requests every page without URL arguments."""
+    app = create_app({'TESTING': True})
+
+    paths = warm_app(app)
+    assert '/' in paths and '/tutorials' in paths
+    assert not any('<' in path for path in paths)
+    assert len(app.extensions['page_cache']) >= 6
+
+
+def test_preload_app_freezes_objects():
+    """Test that preloading leaves the app's objects frozen."""
+    try:
+        app = preload_app({'TESTING': True})
+        assert gc.get_freeze_count() > 0
+        assert not gc.isenabled()
+        assert app.jinja_env.cache
+    finally:
+        gc.unfreeze()
+        gc.enable()
+
+
+def test_failed_worker_restart_is_scheduled(monkeypatch):
+    """Test that a worker failing right away is restarted on a later poll."""
+    exits = [(123, 1 << 8), (0, 0)]
+    monkeypatch.setattr(prefork.os, 'waitpid', lambda pid, flags: exits.pop(0))
+    arbiter = Arbiter(None, None, workers=1)
+    spawned = []
+    monkeypatch.setattr(arbiter, 'spawn', spawned.append)
+    arbiter.workers[123] = Worker(0, 123, prefork.time.monotonic())
+
+    arbiter.reap()
+    assert spawned == []
+    assert list(arbiter.restarts) == [0]
+
+    arbiter.spawn_due()
+    assert spawned == []
+    arbiter.restarts[0] = 0.0
+    arbiter.spawn_due()
+    assert spawned == [0]
+    assert arbiter.restarts == {}
+
+
+@pytest.mark.parametrize('workers', ['0', '-2'])
+def test_workers_must_be_positive(workers, capsys):
+    """Test that the launcher refuses to start without workers."""
+    with pytest.raises(SystemExit):
+        main(['--workers', workers])
+    assert 'expected a positive integer' in capsys.readouterr().err
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_launcher_recycles_workers_and_stops():
+    """Test a launcher run with worker recycling and a graceful stop."""
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SRC, 'prefork.py'), '--port', '0',
+         '--workers', '2', '--max-requests', '2'],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        log = []
+        while 'Listening on' not in ''.join(log):
+            line = process.stderr.readline()
+            assert line, ''.join(log)
+            log.append(line)
+        url = log[-1].split('Listening on ')[1].strip()
+
+        for _ in range(6):
+            with urllib.request.urlopen(url + '/about', timeout=10) as reply:
+                assert reply.status == 200
+        process.send_signal(signal.SIGTERM)
+        output = process.communicate(timeout=30)[1]
+    finally:
+        process.kill()
+
+    assert process.returncode == 0
+    assert 'exited with status 0' in output
+    assert output.count('Started worker') >= 3
+    assert 'Stopping' in output
@@ -0,0 +1,118 @@
+"""
+Tests for build profiling.
+
+This module tests stage and template timing, the JSON report and text
+summary, and the comparison against a baseline.
+"""
+
+import json
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+from profiling import BuildProfiler, find_regressions, load_report
+
+
+def test_stages_accumulate():
+    """Test that a repeated stage adds up and keeps its first position."""
+    profiler = BuildProfiler()
+    with profiler.stage('render'):
+        pass
+    with profiler.stage('write'):
+        pass
+    first = profiler.stages['render']
+    with profiler.stage('render'):
+        pass
+
+    assert list(profiler.stages) == ['render', 'write']
+    assert profiler.stages['render'] > first
+
+
+def test_instrument_templates_records_compile_time():
+    """Test that each template is timed once, when it is compiled."""
+    env = Environment(loader=DictLoader({
+        'base.html': '<b>{% block body %}{% endblock %}</b>',
+        'page.html': (
+            '{% extends "base.html" %}{% block body %}x{% endblock %}'
+        ),
+    }))
+    profiler = BuildProfiler()
+    profiler.instrument_templates(env)
+
+    assert env.get_template('page.html').render() == '<b>x</b>'
+    env.get_template('page.html').render()
+
+    assert sorted(profiler.templates) == ['base.html', 'page.html']
+    assert profiler.compile_time > 0
+    assert sorted(profiler.loads) == ['base.html', 'page.html']
+    assert profiler.load_time >= profiler.compile_time
+
+
+def test_bytecode_cache_hits_count_as_load_time(tmp_path):
+    """Test that templates from the bytecode cache are loaded, not compiled."""
+    def make_env():
+        return Environment(
+            loader=DictLoader({'page.html': '<p>{{ 1 + 1 }}</p>'}),
+            bytecode_cache=FileSystemBytecodeCache(str(tmp_path)),
+        )
+
+    make_env().get_template('page.html')
+    env = make_env()
+    profiler = BuildProfiler()
+    profiler.instrument_templates(env)
+
+    assert env.get_template('page.html').render() == '<p>2</p>'
+    assert profiler.templates == {}
+    assert list(profiler.loads) == ['page.html']
+    assert profiler.load_time > 0
+
+
+def test_report_round_trip_and_summary(tmp_path):
+    """Test the JSON report and the flame-style summary."""
+    profiler = BuildProfiler(total=0.1, stages={'render': 0.08, 'write': 0.01})
+    timing = profiler.route('/resources')
+    timing.render, timing.rewrite, timing.write = 0.05, 0.01, 0.002
+    timing.bytes = 25000
+
+    report_file = profiler.write_report(tmp_path / 'profile.json')
+    report = load_report(report_file)
+    assert report['routes']['/resources']['bytes'] == 25000
+    assert report['stages'] == {'render': 0.08, 'write': 0.01}
+
+    lines = profiler.summary().splitlines()
+    assert lines[0].startswith('build')
+    assert lines[1].lstrip().startswith('render')
+    assert lines[2].lstrip().startswith('/resources (25,000 B)')
+    assert lines[-1].lstrip().startswith('write')
+
+
+def test_load_report_rejects_other_files(tmp_path):
+    """Test that a file that is not a report is refused."""
+    other = tmp_path / 'other.json'
+    other.write_text(json.dumps({'routes': {}}))
+    with pytest.raises(ValueError):
+        load_report(other)
+
+
+def test_find_regressions():
+    """Test that only stages past the limit and above the noise floor fail."""
+    baseline = {
+        'total': 1.0,
+        'stages': {'render': 0.5, 'static': 0.2, 'manifest': 0.001},
+    }
+    report = {
+        'total': 1.05,
+        'stages': {'render': 0.6, 'static': 0.21, 'manifest': 0.01,
+                   'minify': 0.3},
+    }
+
+    regressions = find_regressions(report, baseline, max_regression=10)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith('stage render: 500.0 ms -> 600.0 ms')
+    assert find_regressions(report, baseline, max_regression=25) == []
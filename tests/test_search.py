@@ -0,0 +1,103 @@
+"""
+Tests for the client-side search index.
+
+This module tests tokenizing, posting list encoding, prefix sharding and
+querying the index the way the browser does.
+"""
+
+import json
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+import search as search_module
+from search import (
+    INDEX_NAME, SearchDocument, build_search_index, choose_prefix_length,
+    decode_postings, encode_postings, search, tokenize, write_search_index,
+)
+
+DOCUMENTS = [
+    SearchDocument('Copilot Chat', '/chat.html',
+                   'Ask Copilot questions', 'Page'),
+    SearchDocument('Code Review', '/review.html',
+                   'Review code with chat', 'Page'),
+    SearchDocument('CLI Guide', 'https://example.com/cli',
+                   'Use Copilot in the command line', 'Documentation'),
+]
+
+
+def test_tokenize_folds_case_and_accents():
+    """Test that terms are lowercased, unaccented and filtered."""
+    assert tokenize('The Café: a CLI for Copilot!') == [
+        'cafe', 'cli', 'copilot',
+    ]
+
+
+def test_postings_round_trip():
+    """Test that delta-encoded postings decode to the original list."""
+    postings = [(0, 2), (5, 1), (6, 3), (40, 1)]
+    encoded = encode_postings(postings)
+    assert encoded == [0, 2, 5, 1, 1, 3, 34, 1]
+    assert decode_postings(encoded) == postings
+
+
+def test_shards_hold_terms_by_prefix():
+    """Test that each term is stored in the shard named by its prefix."""
+    index, shards = build_search_index(DOCUMENTS)
+
+    assert index['count'] == 3
+    assert index['shards'] == sorted(shards)
+    for key, shard in shards.items():
+        assert all(term[:index['prefix']] == key for term in shard)
+    # Title words are weighted above body words
+    assert decode_postings(shards['c']['copilot']) == [(0, 4), (2, 1)]
+
+
+def test_prefix_length_grows_with_shard_size():
+    """Test that big indexes get longer prefixes and smaller shards."""
+    sizes = {'apple': 10, 'avocado': 10, 'banana': 10}
+    assert choose_prefix_length(sizes, max_bytes=20) == 1
+    assert choose_prefix_length(sizes, max_bytes=15) == 2
+
+
+def test_search_matches_all_terms_and_last_prefix():
+    """Test AND semantics with prefix matching of the last term."""
+    index, shards = build_search_index(DOCUMENTS)
+
+    assert [doc['title'] for doc in search(index, shards, 'copilot')] == [
+        'Copilot Chat', 'CLI Guide',
+    ]
+    assert [doc['title'] for doc in search(index, shards, 'review ch')] == [
+        'Code Review',
+    ]
+    assert search(index, shards, 'copilot review') == []
+    assert search(index, shards, 'the') == []
+
+
+def test_short_last_term_matches_across_shards(monkeypatch):
+    """Test that a last term shorter than the prefix loads every shard."""
+    monkeypatch.setattr(
+        search_module, 'choose_prefix_length', lambda sizes: 3
+    )
+    index, shards = build_search_index(DOCUMENTS)
+
+    assert index['prefix'] == 3
+    titles = {doc['title'] for doc in search(index, shards, 'co')}
+    assert titles == {'Copilot Chat', 'Code Review', 'CLI Guide'}
+
+
+def test_write_search_index_removes_stale_shards(tmp_path):
+    """Test that shards of a previous index are deleted."""
+    (tmp_path / 'zz.json').write_text('{}')
+    stats = write_search_index(tmp_path, DOCUMENTS)
+
+    index = json.loads((tmp_path / INDEX_NAME).read_text())
+    assert not (tmp_path / 'zz.json').exists()
+    assert sorted(path.stem for path in tmp_path.glob('*.json')) == sorted(
+        index['shards'] + ['index']
+    )
+    assert stats['documents'] == 3
@@ -0,0 +1,103 @@
+"""
+Tests for streamed page rendering.
+
+This module tests that pages in ``STREAMED_PAGES`` are sent in chunks
+with the head and navigation first, render the same HTML as buffered
+pages, and still end up in the page cache.
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app import create_app
+from streaming import chunk_output
+
+
+def is_streamed(response):
+    """Tell a streamed response by its missing Content-Length."""
+    return 'Content-Length' not in response.headers
+
+
+def test_chunk_output_flushes_after_marker():
+    """Test that the marker ends the first chunk and later ones are sized."""
+    pieces = ['<head>', '</head><nav>', '</nav>'] + ['x' * 10] * 10
+
+    chunks = list(chunk_output(pieces, size=25))
+    assert chunks[0] == '<head></head><nav></nav>'
+    assert chunks[1:] == ['x' * 30, 'x' * 30, 'x' * 30, 'x' * 10]
+
+
+def test_large_pages_are_streamed():
+    """Test that the default streamed pages flush the navigation first."""
+    app = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 0})
+    client = app.test_client()
+
+    for route in ('/tutorials', '/copilot-integration'):
+        response = client.get(route)
+        chunks = list(response.response)
+
+        assert is_streamed(response)
+        assert response.mimetype == 'text/html'
+        assert len(chunks) > 2
+        assert b'rel="stylesheet"' in chunks[0]
+        assert b'</nav>' in chunks[0]
+        assert b'<h1' not in chunks[0]
+    assert not is_streamed(client.get('/about'))
+
+
+def test_streamed_html_matches_buffered():
+    """Test that streaming does not change the page."""
+    streamed = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 0})
+    buffered = create_app({
+        "TESTING": True, "PAGE_CACHE_SIZE": 0, "STREAMED_PAGES": (),
+    })
+
+    for route in ('/tutorials', '/copilot-integration'):
+        response = buffered.test_client().get(route)
+        assert not is_streamed(response)
+        assert streamed.test_client().get(route).data == response.data
+
+
+def test_streaming_is_configured_per_route():
+    """Test that STREAMED_PAGES selects the streamed endpoints."""
+    app = create_app({
+        "TESTING": True, "PAGE_CACHE_SIZE": 0, "STREAMED_PAGES": ('about',),
+    })
+    client = app.test_client()
+
+    assert is_streamed(client.get('/about'))
+    assert not is_streamed(client.get('/tutorials'))
+
+
+def test_streamed_pages_are_cached_once_sent():
+    """Test that the page cache stores a completely sent page."""
+    app = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 8})
+    client = app.test_client()
+    cache = app.extensions['page_cache']
+
+    first = client.get('/tutorials')
+    assert is_streamed(first)
+    assert len(cache) == 0
+    first.get_data()
+    assert len(cache) == 1
+
+    second = client.get('/tutorials')
+    assert cache.hits == 1
+    assert second.data == first.data
+    revalidated = client.get(
+        '/tutorials', headers={'If-None-Match': second.headers['ETag']}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_interrupted_stream_is_not_cached():
+    """Test that a page is not cached if the client stops reading."""
+    app = create_app({"TESTING": True, "PAGE_CACHE_SIZE": 8})
+    response = app.test_client().get('/tutorials', buffered=False)
+
+    next(iter(response.response))
+    response.close()
+    assert len(app.extensions['page_cache']) == 0
@@ -0,0 +1,129 @@
+"""
+Tests for the build-time stylesheet helpers.
+
+This module tests CSS parsing, serialization and selector matching.
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from bs4 import BeautifulSoup
+
+from stylesheet import (
+    SelectorMatcher,
+    UsedSelectors,
+    parse_stylesheet,
+    prune_rules,
+    serialize_stylesheet,
+    split_selectors,
+    static_selector,
+)
+
+CSS = """
+/* comment */
+@charset "utf-8";
+.card, .panel:not(.a, .b) { color: red; }
+@media (max-width: 768px) {
+    .card { display: none; }
+}
+@keyframes fade { from { opacity: 0; } to { opacity: 1; } }
+"""
+
+
+class TestParseStylesheet:
+    """Tests for parse_stylesheet and serialize_stylesheet."""
+
+    def test_parses_rule_kinds(self):
+        """Test that style rules and each kind of at-rule are recognised."""
+        rules = parse_stylesheet(CSS)
+
+        assert [rule.prelude for rule in rules] == [
+            '@charset "utf-8"',
+            '',
+            '@media (max-width: 768px)',
+            '@keyframes fade',
+        ]
+        assert rules[1].selectors == ['.card', '.panel:not(.a, .b)']
+        assert rules[2].children[0].selectors == ['.card']
+        assert 'opacity: 1' in rules[3].declarations
+
+    def test_serialize_round_trip(self):
+        """Test that serialized CSS parses back to equivalent rules."""
+        compact = serialize_stylesheet(parse_stylesheet(CSS))
+
+        assert serialize_stylesheet(parse_stylesheet(compact)) == compact
+        assert '.card,.panel:not(.a, .b){color:red}' in compact
+
+    def test_parses_project_stylesheet(self):
+        """Test that the site's stylesheet parses without losing rules."""
+        path = os.path.join(
+            os.path.dirname(__file__), '..', 'src', 'static', 'css',
+            'style.css',
+        )
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+
+        rules = parse_stylesheet(source)
+
+        assert any('.navbar' in rule.selectors for rule in rules)
+        assert any(rule.prelude.startswith('@media') for rule in rules)
+
+
+class TestSelectors:
+    """Tests for selector helpers."""
+
+    def test_split_selectors_ignores_nested_commas(self):
+        """Test that commas inside :not() do not split the selector."""
+        assert split_selectors('h1, .a:not(.b, .c) > p') == [
+            'h1', '.a:not(.b, .c) > p',
+        ]
+
+    @pytest.mark.parametrize('selector, expected', [
+        ('.btn:hover', '.btn'),
+        ('a::before', 'a'),
+        ('[data-theme="dark"] .card', '* .card'),
+        ('[data-theme="dark"]', '*'),
+        ('.x > .y:focus', '.x > .y'),
+        ('.tab-btn:hover:not(.active)', '.tab-btn:not(.active)'),
+    ])
+    def test_static_selector(self, selector, expected):
+        """Test that runtime-only parts of selectors are removed."""
+        assert static_selector(selector) == expected
+
+    def test_matcher_finds_elements(self):
+        """Test that the matcher returns matching elements."""
+        soup = BeautifulSoup(
+            '<div class="card"><a href="#">x</a></div>', 'html.parser'
+        )
+        matcher = SelectorMatcher()
+
+        assert len(matcher.matches('.card a:hover', soup)) == 1
+        assert matcher.matches('.missing', soup) == []
+
+
+class TestPruning:
+    """Tests for unused selector pruning."""
+
+    def test_prune_rules_keeps_used_and_script_classes(self):
+        """Test that selectors are kept only if all they need is in use."""
+        used = UsedSelectors()
+        used.add_document(BeautifulSoup(
+            '<ul id="menu" class="nav-menu"><li>x</li></ul>', 'html.parser'
+        ))
+        used.add_script("menu.classList.toggle('active');")
+        rules = parse_stylesheet(
+            '.nav-menu.active li, .gone { color: red; }'
+            '#menu:hover { color: blue; }'
+            '@media (max-width: 1px) { .gone { display: none; } }'
+        )
+
+        kept, dead = prune_rules(rules, used)
+
+        assert serialize_stylesheet(kept) == (
+            '.nav-menu.active li{color:red}\n#menu:hover{color:blue}'
+        )
+        assert dead == ['.gone', '.gone']
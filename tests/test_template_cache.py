@@ -0,0 +1,65 @@
+"""
+Tests for the template bytecode cache and prewarming.
+
+This module tests that compiled templates are shared through the cache
+directory and that prewarming loads every template up front.
+"""
+
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app import create_app
+
+
+def make_app(cache_dir, **config):
+    """Create a test app that caches compiled templates in cache_dir."""
+    return create_app({
+        "TESTING": True,
+        "TEMPLATE_BYTECODE_CACHE": True,
+        "TEMPLATE_BYTECODE_CACHE_DIR": str(cache_dir),
+        **config,
+    })
+
+
+def test_compiled_templates_are_shared(tmp_path):
+    """Test that a second app loads bytecode instead of compiling."""
+    cache_dir = tmp_path / 'jinja'
+    make_app(cache_dir).test_client().get('/about')
+    entries = sorted(os.listdir(cache_dir))
+    assert len(entries) >= 2  # about.html and base.html
+
+    app = make_app(cache_dir)
+    compiled = []
+    compile_source = app.jinja_env.compile
+
+    def record(source, name=None, *args, **kwargs):
+        compiled.append(name)
+        return compile_source(source, name, *args, **kwargs)
+
+    app.jinja_env.compile = record
+    response = app.test_client().get('/about')
+
+    assert response.status_code == 200
+    assert compiled == []
+    assert sorted(os.listdir(cache_dir)) == entries
+
+
+def test_prewarm_loads_every_template(tmp_path):
+    """Test that PREWARM_TEMPLATES compiles all templates in create_app."""
+    app = make_app(tmp_path / 'jinja', PREWARM_TEMPLATES=True)
+    names = {name for name in app.jinja_env.list_templates()
+             if name.endswith('.html')}
+
+    cached = {template.name for template in app.jinja_env.cache.values()}
+    assert names <= cached
+    assert {'base.html', 'resources.html', '404.html'} <= names
+    assert len(os.listdir(tmp_path / 'jinja')) == len(names)
+
+
+def test_bytecode_cache_can_be_disabled():
+    """Test that TEMPLATE_BYTECODE_CACHE=False leaves Jinja uncached."""
+    app = create_app({"TESTING": True, "TEMPLATE_BYTECODE_CACHE": False})
+    assert app.jinja_env.bytecode_cache is None
@@ -0,0 +1,128 @@
+"""
+Tests for file watching and live reload.
+
+This module tests the inotify and polling watchers, the debounce
+window, the live reload server and the build script's watch loop.
+"""
+
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from watch import (
+    LIVERELOAD_PATH, LIVERELOAD_SCRIPT, InotifyWatcher, LiveReloadServer,
+    PollingWatcher, create_watcher, wait_for_changes,
+)
+
+
+def make_watcher(kind, paths):
+    """Create a watcher of the given kind, skipping if unsupported."""
+    if kind == 'poll':
+        return PollingWatcher(paths, interval=0.02)
+    try:
+        return InotifyWatcher(paths)
+    except OSError:
+        pytest.skip('inotify is not available')
+
+
+@pytest.mark.parametrize('kind', ['inotify', 'poll'])
+def test_watcher_reports_changed_files(tmp_path, kind):
+    """Test that edits, new files and watched single files are reported."""
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    page = templates / 'page.html'
+    page.write_text('one')
+    routes = tmp_path / 'routes.py'
+    routes.write_text('x = 1')
+    (tmp_path / 'other.py').write_text('')
+
+    watcher = make_watcher(kind, [templates, routes])
+    try:
+        assert watcher.wait(0.05) == set()
+
+        time.sleep(0.01)
+        page.write_text('two')
+        (tmp_path / 'other.py').write_text('ignored')
+        changed = wait_for_changes(watcher, debounce=0.1, timeout=2)
+        assert {path.resolve() for path in changed} == {page.resolve()}
+
+        (templates / 'partials').mkdir()
+        time.sleep(0.05)
+        (templates / 'partials' / 'nav.html').write_text('nav')
+        routes.write_text('x = 2')
+        changed = wait_for_changes(watcher, debounce=0.2, timeout=2)
+        assert {path.resolve() for path in changed} >= {
+            (templates / 'partials' / 'nav.html').resolve(),
+            routes.resolve(),
+        }
+    finally:
+        watcher.close()
+
+
+def test_create_watcher_can_force_polling(tmp_path):
+    """Test that poll=True always gives a polling watcher."""
+    watcher = create_watcher([tmp_path], poll=True)
+    assert isinstance(watcher, PollingWatcher)
+
+
+def test_live_reload_server_injects_script_and_pushes_events(tmp_path):
+    """Test that pages get the reload script and streams get events."""
+    (tmp_path / 'index.html').write_text('<html><body>Hi</body></html>')
+    server = LiveReloadServer(tmp_path, port=0, base_url='/site/')
+    server.start()
+    try:
+        page = urllib.request.urlopen(server.url, timeout=5).read().decode()
+        assert page == (
+            '<html><body>Hi' + LIVERELOAD_SCRIPT + '</body></html>'
+        )
+
+        host, port = server.server_address[:2]
+        stream = urllib.request.urlopen(
+            f'http://{host}:{port}{LIVERELOAD_PATH}', timeout=5
+        )
+        assert stream.readline() == b'retry: 1000\n'
+        assert stream.readline() == b'\n'
+        server.notify()
+        assert stream.readline() == b'event: reload\n'
+        stream.close()
+    finally:
+        server.stop()
+
+
+def test_watch_site_rebuilds_on_change(tmp_path, monkeypatch, capsys):
+    """Test that a change triggers one incremental rebuild and a reload."""
+    import build
+
+    watched = tmp_path / 'watched'
+    watched.mkdir()
+    monkeypatch.setattr(build, 'WATCH_PATHS', (str(watched),))
+
+    builds = []
+    monkeypatch.setattr(
+        build, 'build_static_site',
+        lambda **options: builds.append(options) or [],
+    )
+
+    thread = threading.Thread(
+        target=build.watch_site,
+        args=({'output_dir': str(tmp_path / 'out')},),
+        kwargs={'port': 0, 'poll': True, 'max_rebuilds': 1},
+    )
+    thread.start()
+    deadline = time.monotonic() + 5
+    while len(builds) < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.3)
+    (watched / 'page.html').write_text('changed')
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert [options.get('incremental') for options in builds] == [None, True]
+    assert 'Rebuilt in' in capsys.readouterr().out